@@ -0,0 +1,365 @@
+"""Zestaw benchmarków symulatora: generowanie, kolejki każdej fazy, eksport, raporty i widoki GUI.
+
+Każdy przypadek ma osobne przygotowanie (niemierzone), rozgrzewkę i serię
+powtórzeń; wynikiem są percentyle czasów zapisywane w JSON, a tryb compare
+porównuje dwa takie pliki (np. z kolejnych commitów) i zgłasza regresje.
+
+Przykłady:
+    python -m benchmark run --out bench.json
+    python -m benchmark run --scales 16 256 --repeats 20 --filter simulate
+    python -m benchmark compare bazowy.json bench.json --threshold 0.15
+"""
+import argparse
+import contextlib
+import gc
+import importlib.util
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from models import Tournament, TournamentFormat, PlayerStatsReporter
+from exporters import write_npz, write_table
+
+# Wersja formatu pliku wyników
+SCHEMA_VERSION = 1
+
+# Liczby drużyn w skalowanych turniejach (4 drużyny w grupie, po 2 awansują)
+SCALES = (16, 256, 1024, 4096)
+
+# Ziarno wszystkich turniejów benchmarku, więc kolejne uruchomienia mierzą tę samą pracę
+BENCH_SEED = 2024
+
+# Percentyle zapisywane dla każdego przypadku
+PERCENTILES = (50, 90, 95, 99)
+
+# Domyślny próg regresji w trybie compare (względny wzrost mediany)
+DEFAULT_THRESHOLD = 0.10
+
+
+def group_format(num_teams):
+    """Format z grupami po 4 drużyny i dwoma awansującymi (dla 16 drużyn domyślny)."""
+    return TournamentFormat(num_teams, max(1, num_teams // 4), 2)
+
+
+def swiss_format(num_teams):
+    """System szwajcarski z log2(n) + 1 rundami i ośmioma drużynami w drabince."""
+    return TournamentFormat(num_teams, 1, 8, swiss_rounds=num_teams.bit_length())
+
+
+def percentile(sorted_samples, q):
+    """Percentyl q (0-100) posortowanej próbki z interpolacją liniową."""
+    if len(sorted_samples) == 1:
+        return sorted_samples[0]
+    position = (len(sorted_samples) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_samples) - 1)
+    return sorted_samples[lower] + (sorted_samples[upper] - sorted_samples[lower]) * (position - lower)
+
+
+def summarize(samples):
+    """Statystyki czasów (w sekundach): min, średnia, odchylenie, percentyle i max."""
+    ordered = sorted(samples)
+    n = len(ordered)
+    mean = sum(ordered) / n
+    stats = {
+        "repeats": n,
+        "min": ordered[0],
+        "mean": mean,
+        "stdev": (sum((x - mean) ** 2 for x in ordered) / (n - 1)) ** 0.5 if n > 1 else 0.0,
+        "max": ordered[-1],
+    }
+    for q in PERCENTILES:
+        stats[f"p{q}"] = percentile(ordered, q)
+    stats["median"] = stats["p50"]
+    stats["samples"] = list(samples)
+    return stats
+
+
+def time_case(setup, run, warmup=1, repeats=5):
+    """Mierzy run(context) po każdorazowym setup(); zwraca listę czasów powtórzeń.
+
+    Jak w timeit, odśmiecacz jest wyłączony na czas pomiaru, żeby jego
+    przypadkowe przebiegi nie zaburzały pojedynczych próbek.
+    """
+    samples = []
+    for i in range(warmup + repeats):
+        context = setup()
+        gc.collect()
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            run(context)
+            elapsed = time.perf_counter() - start
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        if i >= warmup:
+            samples.append(elapsed)
+    return samples
+
+
+class ScaleFixtures:
+    """Zapisane stany turniejów jednej skali, z których przypadki odtwarzają świeże kopie.
+
+    Stany są liczone raz (from_dict jest dużo tańsze niż ponowna symulacja),
+    więc każde powtórzenie zaczyna od identycznego punktu.
+    """
+
+    def __init__(self, num_teams):
+        self.num_teams = num_teams
+        self._states = {}
+
+    def state(self, name):
+        if name not in self._states:
+            self._states[name] = self._build(name)
+        return self._states[name]
+
+    def tournament(self, name):
+        return Tournament.from_dict(self.state(name))
+
+    def _build(self, name):
+        fmt = swiss_format(self.num_teams) if name == "swiss" else group_format(self.num_teams)
+        tournament = Tournament(tournament_format=fmt, seed=BENCH_SEED)
+        tournament.generate_random_tournament()
+        if name == "knockout":
+            while tournament.phase == "GROUP_STAGE":
+                tournament.simulate_next_round()
+        elif name == "finished":
+            while not tournament.winner:
+                tournament.simulate_next_round()
+        return tournament.to_dict()
+
+
+def _quiet(function):
+    """Wywołuje function z wyjściem skierowanym do bufora (metody display_* reportera)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        function()
+
+
+def model_cases(fixtures):
+    """Przypadki logiki turnieju i eksportu dla jednej skali."""
+    n = fixtures.num_teams
+
+    def reporter_setup():
+        tournament = fixtures.tournament("finished")
+        return PlayerStatsReporter(tournament.all_players, tournament.leaderboards)
+
+    cases = [
+        ("generate_random_tournament",
+         lambda: Tournament(tournament_format=group_format(n), seed=BENCH_SEED),
+         lambda t: t.generate_random_tournament()),
+        ("schedule_group_stage", lambda: fixtures.tournament("group"), lambda t: t._schedule_group_stage()),
+        ("simulate_next_round.group", lambda: fixtures.tournament("group"), lambda t: t.simulate_next_round()),
+        ("simulate_next_round.swiss", lambda: fixtures.tournament("swiss"), lambda t: t.simulate_next_round()),
+        ("simulate_next_round.knockout", lambda: fixtures.tournament("knockout"),
+         lambda t: t.simulate_next_round()),
+        ("export_teams_to_json", lambda: fixtures.tournament("finished"),
+         lambda t: t.export_teams_to_json(os.devnull)),
+        ("export.players_csv", lambda: fixtures.tournament("finished"),
+         lambda t: write_table(t, "players", os.devnull, "csv")),
+        ("export.events_jsonl", lambda: fixtures.tournament("finished"),
+         lambda t: write_table(t, "events", os.devnull, "jsonl")),
+        ("reporter.get_top_scorers_ranking", reporter_setup, lambda r: r.get_top_scorers_ranking(10)),
+        ("reporter.display_top_scorers", reporter_setup, lambda r: _quiet(r.display_top_scorers)),
+        ("reporter.display_card_offenders", reporter_setup, lambda r: _quiet(r.display_card_offenders)),
+        ("reporter.display_full_stats_table", reporter_setup, lambda r: _quiet(r.display_full_stats_table)),
+    ]
+    if importlib.util.find_spec("numpy") is not None:
+        cases.append(("export.npz", lambda: fixtures.tournament("finished"),
+                      lambda t: write_npz(t, os.devnull, compress=False)))
+    return cases
+
+
+# Aplikacja Qt i okno współdzielone przez wszystkie skale (QApplication musi żyć dłużej niż okno)
+_gui = {}
+
+
+def gui_cases(fixtures):
+    """Przypadki odświeżania widoków GUI (tylko gdy PyQt6 jest dostępny; bez ekranu przez offscreen)."""
+    try:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt6.QtWidgets import QApplication
+        import main
+    except ImportError:
+        return []
+    if not _gui:
+        _gui["app"] = QApplication.instance() or QApplication([])
+        _gui["window"] = main.TournamentApp()
+    window = _gui["window"]
+
+    def window_setup():
+        window.tournament = fixtures.tournament("finished")
+        window.group_models = {}
+        window.sync_group_models()
+        # Puste modele, więc pomiar obejmuje pełne wypełnienie tabel, a nie samo porównanie wierszy
+        for model in (window.scorers_model, window.yellow_cards_model, window.red_cards_model,
+                      window.results_model):
+            model.set_rows([])
+        return window
+
+    def populate_groups(w):
+        for name, model in w.group_models.items():
+            w.populate_group_table(name, model)
+
+    return [
+        ("gui.refresh_all_views", window_setup, lambda w: w.refresh_all_views()),
+        ("gui.populate_group_tables", window_setup, populate_groups),
+        ("gui.populate_player_stats_tables", window_setup, lambda w: w.populate_player_stats_tables()),
+        ("gui.populate_results_table", window_setup, lambda w: w.populate_results_table()),
+        ("gui.populate_knockout_tab", window_setup, lambda w: w.populate_knockout_tab()),
+    ]
+
+
+def run_suite(scales=SCALES, warmup=1, repeats=5, name_filter=None, include_gui=True, progress=None):
+    """Uruchamia przypadki dla podanych skal i zwraca słownik wyników gotowy do zapisu w JSON.
+
+    Klucze wyników mają postać "przypadek[liczba drużyn]"; name_filter
+    ogranicza przebieg do przypadków, których nazwa zawiera ten napis.
+    """
+    results = {}
+    for num_teams in scales:
+        fixtures = ScaleFixtures(num_teams)
+        cases = model_cases(fixtures) + (gui_cases(fixtures) if include_gui else [])
+        for name, setup, run in cases:
+            key = f"{name}[{num_teams}]"
+            if name_filter and name_filter not in key:
+                continue
+            results[key] = summarize(time_case(setup, run, warmup, repeats))
+            if progress is not None:
+                progress(key, results[key])
+    return {
+        "schema": SCHEMA_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "warmup": warmup,
+        "repeats": repeats,
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD, metric="median"):
+    """Porównuje dwa wyniki run_suite; zwraca wiersze (przypadek, przed, po, stosunek, status).
+
+    Status to "regression" / "improvement" przy zmianie metryki o więcej niż
+    threshold (względnie), "ok" w pozostałych przypadkach oraz "new" / "missing"
+    dla przypadków obecnych tylko w jednym z plików.
+    """
+    for result in (baseline, current):
+        if result.get("schema") != SCHEMA_VERSION:
+            raise ValueError("Nieobsługiwana wersja pliku wyników benchmarku.")
+    before, after = baseline["results"], current["results"]
+    rows = []
+    for key in sorted(set(before) | set(after)):
+        if key not in after:
+            rows.append((key, before[key][metric], None, None, "missing"))
+            continue
+        if key not in before:
+            rows.append((key, None, after[key][metric], None, "new"))
+            continue
+        old, new = before[key][metric], after[key][metric]
+        ratio = new / old if old > 0 else float("inf")
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 - threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append((key, old, new, ratio, status))
+    return rows
+
+
+def _git_commit():
+    """Skrót bieżącego commita (None poza repozytorium git)."""
+    try:
+        output = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def _format_time(seconds):
+    if seconds is None:
+        return "-"
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.3f} s"
+
+
+def cmd_run(args):
+    def progress(key, stats):
+        print(f"{key:<50} median {_format_time(stats['median']):>10}   p95 {_format_time(stats['p95']):>10}")
+
+    result = run_suite(args.scales, args.warmup, args.repeats, args.filter, not args.no_gui, progress)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=1)
+        print(f"Zapisano wyniki w '{args.out}'.")
+    return 0
+
+
+def cmd_compare(args):
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(args.current, 'r', encoding='utf-8') as f:
+        current = json.load(f)
+    rows = compare(baseline, current, args.threshold, args.metric)
+    print(f"{'Przypadek':<50} | {'Przed':>10} | {'Po':>10} | {'Zmiana':>8} | Status")
+    for key, old, new, ratio, status in rows:
+        change = f"{ratio - 1:+.1%}" if ratio is not None else "-"
+        print(f"{key:<50} | {_format_time(old):>10} | {_format_time(new):>10} | {change:>8} | {status}")
+    regressions = [row for row in rows if row[4] == "regression"]
+    if regressions:
+        print(f"Regresje: {len(regressions)} (próg {args.threshold:.0%}).")
+        return 1
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m benchmark", description="Benchmarki symulatora turnieju.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Uruchamia benchmarki i opcjonalnie zapisuje wyniki w JSON.")
+    run.add_argument("--scales", type=int, nargs="+", default=list(SCALES), help="Liczby drużyn.")
+    run.add_argument("--warmup", type=int, default=1, help="Liczba niemierzonych przebiegów rozgrzewki.")
+    run.add_argument("--repeats", type=int, default=5, help="Liczba mierzonych powtórzeń.")
+    run.add_argument("--filter", help="Uruchamia tylko przypadki, których nazwa zawiera ten napis.")
+    run.add_argument("--no-gui", action="store_true", help="Pomija przypadki GUI.")
+    run.add_argument("--out", help="Plik JSON z wynikami.")
+    run.set_defaults(func=cmd_run)
+
+    comparison = commands.add_parser("compare", help="Porównuje dwa pliki wyników i zgłasza regresje.")
+    comparison.add_argument("baseline", help="Wyniki bazowe (np. z poprzedniego commita).")
+    comparison.add_argument("current", help="Wyniki bieżące.")
+    comparison.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                            help="Względna zmiana uznawana za regresję (0.10 = 10%%).")
+    comparison.add_argument("--metric", default="median", choices=("min", "median", "mean", "p90", "p95", "p99"),
+                            help="Porównywana statystyka.")
+    comparison.set_defaults(func=cmd_compare)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if getattr(args, "repeats", 1) < 1:
+        print("Błąd: liczba powtórzeń musi być dodatnia.", file=sys.stderr)
+        return 1
+    try:
+        return args.func(args)
+    except (ValueError, OSError) as e:
+        print(f"Błąd: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
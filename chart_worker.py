@@ -0,0 +1,29 @@
+import logging
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from charts import figure_png, render_scorers_chart
+
+
+class ChartWorker(QObject):
+    """Rysuje wykres strzelców poza wątkiem GUI (obiekt przenoszony do QThread).
+
+    Dane wykresu są pobierane w wątku GUI, więc wątek roboczy nie dotyka
+    stanu turnieju; gotowa figura i jej PNG trafiają do GUI sygnałem finished.
+    """
+
+    finished = pyqtSignal(object, object, bytes)  # klucz danych, Figure, PNG
+    failed = pyqtSignal(str)
+
+    def __init__(self, key, rows):
+        super().__init__()
+        self.key = key
+        self.rows = rows
+
+    def run(self):
+        try:
+            figure = render_scorers_chart(self.rows)
+            self.finished.emit(self.key, figure, figure_png(figure))
+        except Exception as e:
+            logging.error(f"Błąd podczas rysowania wykresu: {e}")
+            self.failed.emit(str(e))
@@ -0,0 +1,70 @@
+"""Wykres najlepszych strzelców rysowany obiektowym API matplotlib (bez pyplot i Qt).
+
+Figura nie korzysta z globalnego stanu pyplot, więc może powstawać w wątku
+roboczym GUI; wynikiem jest obiekt Figure i jego obraz PNG w pamięci.
+"""
+import io
+
+# Liczba strzelców na wykresie
+SCORER_CHART_SIZE = 10
+
+
+def scorer_chart_rows(leaderboards, limit=SCORER_CHART_SIZE):
+    """Dane wykresu: (zawodnik, gole) najlepszych strzelców z rankingu turnieju."""
+    return [(player.name, player.goals) for player in leaderboards.goals.top(limit)]
+
+
+def render_scorers_chart(rows):
+    """Rysuje poziomy wykres słupkowy strzelców (najlepszy na górze) i zwraca Figure."""
+    from matplotlib import colormaps
+    from matplotlib.figure import Figure
+
+    names = [name for name, _ in rows]
+    goals = [goals for _, goals in rows]
+    palette = colormaps["viridis"]
+    colors = [palette(i / max(1, len(rows) - 1)) for i in range(len(rows))]
+
+    figure = Figure(figsize=(12, 7))
+    ax = figure.add_subplot()
+    ax.set_axisbelow(True)
+    ax.grid(axis="x", color="#dddddd")
+    ax.barh(range(len(rows)), goals, color=colors)
+    ax.set_yticks(range(len(rows)), names)
+    ax.invert_yaxis()
+    ax.set_xlabel("Liczba goli", fontsize=12)
+    ax.set_ylabel("Zawodnik", fontsize=12)
+    ax.set_title("Najlepsi Strzelcy Turnieju", fontsize=16, weight="bold")
+    figure.tight_layout()
+    return figure
+
+
+def figure_png(figure):
+    """Obraz figury w formacie PNG jako bajty (do QPixmap.loadFromData)."""
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="png")
+    return buffer.getvalue()
+
+
+class ChartCache:
+    """Ostatnio narysowany wykres z kluczem danych (np. wersją rankingu strzelców).
+
+    Dopóki klucz się nie zmienia, widok korzysta z zapamiętanej figury i PNG
+    zamiast rysować wykres ponownie.
+    """
+
+    def __init__(self):
+        self.key = None
+        self.figure = None
+        self.png = None
+
+    def get(self, key):
+        """Zwraca (figure, png) dla klucza albo None, gdy wykres trzeba narysować."""
+        if self.figure is not None and self.key == key:
+            return self.figure, self.png
+        return None
+
+    def store(self, key, figure, png):
+        self.key, self.figure, self.png = key, figure, png
+
+    def clear(self):
+        self.store(None, None, None)
@@ -0,0 +1,240 @@
+"""Bezgłowy interfejs wiersza poleceń symulatora (bez PyQt6 i bibliotek wykresów).
+
+Przykłady:
+    python -m cli generate --out turniej.trn --seed 1
+    python -m cli generate --out duzy.trn --teams 4096 --groups 1024 --advance 2
+    python -m cli simulate --teams 4096 --groups 1 --advance 64 --swiss-rounds 12
+    python -m cli simulate --seed 7 --rng philox --out turniej.trn
+    python -m cli simulate --teams 1024 --groups 256 --stats --profile cprofile
+    python -m cli simulate --state turniej.trn --out turniej.trn --events zdarzenia.jsonl.gz
+    python -m cli simulate --seed 3 --snapshots turniej.snap
+    python -m cli export --state turniej.snap --at-round 4 --table players --out po_4_kolejkach.csv
+    python -m cli export --state turniej.trn --out druzyny.json
+    python -m cli export --state turniej.trn --table events --out zdarzenia.csv.gz
+    python -m cli montecarlo --runs 100000 --workers 8 --seed 1 --out wyniki.json
+    python -m cli odds --state turniej.trn --out szanse.json
+"""
+import argparse
+import contextlib
+import json
+import logging
+import sys
+
+from models import Tournament, TournamentFormat, PlayerStatsReporter
+from rng import RNG_BACKENDS
+from exporters import EXPORT_FORMATS, EXPORT_TABLES, export_tournament
+from snapshots import DEFAULT_CHECKPOINT_EVERY, is_snapshot_log
+from instrumentation import PROFILE_KINDS, ProfileCapture
+from monte_carlo import stage_key
+
+# Nagłówki kolumn etapów w tabeli Monte Carlo; pozostałe etapy opisuje ich klucz
+STAGE_HEADERS = {"quarter_final": "Ćwierćfinał", "semi_final": "Półfinał", "final": "Finał", "title": "Tytuł"}
+
+
+def _tournament_format(args):
+    return TournamentFormat(args.teams, args.groups, args.advance, args.players, args.legs, args.swiss_rounds)
+
+
+def _load_or_generate(args):
+    """Wczytuje turniej z --state albo generuje nowy losowy turniej."""
+    tournament = Tournament(rng_backend=args.rng, seed=args.seed)
+    if args.state and is_snapshot_log(args.state):
+        tournament.load_snapshot(args.state, args.at_round)
+    elif args.state:
+        tournament.load_from_file(args.state)
+    else:
+        tournament.set_format(_tournament_format(args))
+        tournament.generate_random_tournament()
+    return tournament
+
+
+def cmd_generate(args):
+    tournament = Tournament(tournament_format=_tournament_format(args), rng_backend=args.rng, seed=args.seed)
+    tournament.generate_random_tournament()
+    tournament.save_to_file(args.out)
+    print(f"Wygenerowano losowy turniej i zapisano go w '{args.out}'.")
+
+
+def cmd_simulate(args):
+    tournament = _load_or_generate(args)
+    if args.stats or args.stats_json:
+        tournament.enable_instrumentation()
+    sink = None
+    if args.events:
+        from event_log import EventLogWriter
+        sink = EventLogWriter(args.events)
+        tournament.attach_event_sink(sink)
+    if args.snapshots:
+        tournament.start_snapshots(args.snapshots, args.checkpoint_every)
+    capture = ProfileCapture(args.profile) if args.profile else contextlib.nullcontext()
+    try:
+        with capture:
+            rounds = tournament.remaining_rounds() if args.rounds is None else args.rounds
+            for _ in range(rounds):
+                if tournament.winner:
+                    break
+                print(tournament.simulate_next_round())
+    finally:
+        if sink is not None:
+            tournament.detach_event_sink()
+            sink.close()
+        tournament.stop_snapshots()
+
+    if args.stats:
+        print(tournament.instrumentation.format_report())
+    if args.stats_json:
+        with open(args.stats_json, 'w', encoding='utf-8') as f:
+            json.dump(tournament.instrumentation.to_dict(), f, ensure_ascii=False, indent=1)
+    if args.profile:
+        print(capture.report())
+
+    if args.out:
+        tournament.save_to_file(args.out)
+    if args.report and tournament.all_players:
+        reporter = PlayerStatsReporter(tournament.all_players, tournament.leaderboards)
+        reporter.display_top_scorers()
+        reporter.display_card_offenders()
+
+
+def cmd_export(args):
+    tournament = _load_or_generate(args)
+    print(export_tournament(tournament, args.out, args.table, args.format))
+
+
+def cmd_montecarlo(args):
+    tournament = _load_or_generate(args)
+    result = tournament.run_monte_carlo(args.runs, seed=args.seed, workers=args.workers, rng_backend=args.rng,
+                                        store_path=args.store)
+    ranking = sorted(result.team_stats.items(), key=lambda item: item[1]["title"], reverse=True)
+    columns = result.stage_keys[-4:]
+    headers = [STAGE_HEADERS.get(key, key) for key in columns]
+    print(f"{'Drużyna':<25} | " + " | ".join(f"{header:>11}" for header in headers))
+    for name, stats in ranking:
+        print(f"{name:<25} | " + " | ".join(f"{stats[key]:>11.1%}" for key in columns))
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(result.to_dict(), f, ensure_ascii=False)
+
+
+def cmd_odds(args):
+    tournament = _load_or_generate(args)
+    tables = {}
+    for table_name in tournament.table_names():
+        rows = tables[table_name] = tournament.expected_table(table_name)
+        print(f"\n{table_name}")
+        print(f"{'Drużyna':<25} | {'Pkt':>4} | {'Oczek. pkt':>10} | {'Oczek. bilans':>13}")
+        for row in rows:
+            balance = row["expected_goals_for"] - row["expected_goals_against"]
+            print(f"{row['team']:<25} | {row['points']:>4} | {row['expected_points']:>10.2f} | {balance:>+13.2f}")
+    knockout = None
+    if tournament.phase == "KNOCKOUT_STAGE" or tournament.winner is not None:
+        knockout = tournament.knockout_odds()
+        columns = [stage_key(name) for name in tournament.format.knockout_round_names()][-3:] + ["title"]
+        print(f"\n{'Drużyna':<25} | " + " | ".join(f"{STAGE_HEADERS.get(key, key):>11}" for key in columns))
+        for name, stats in sorted(knockout.items(), key=lambda item: item[1]["title"], reverse=True):
+            print(f"{name:<25} | " + " | ".join(f"{stats[key]:>11.1%}" for key in columns))
+    if args.out:
+        upcoming = [m for m in tournament.matches + [m for r in tournament.knockout_matches.values() for m in r]
+                    if not m.is_played]
+        matches = [dict(tournament.match_odds(m).to_dict(), team1=m.team1.name, team2=m.team2.name,
+                        round=m.round, phase=m.phase) for m in upcoming]
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump({"tables": tables, "matches": matches, "knockout": knockout}, f, ensure_ascii=False)
+
+
+def _add_format_arguments(parser):
+    parser.add_argument("--teams", type=int, default=16, help="Liczba drużyn nowego turnieju.")
+    parser.add_argument("--groups", type=int, default=4, help="Liczba grup.")
+    parser.add_argument("--advance", type=int, default=2, help="Liczba drużyn awansujących z każdej grupy.")
+    parser.add_argument("--players", type=int, default=11, help="Liczba zawodników w drużynie.")
+    parser.add_argument("--legs", type=int, default=2, choices=(1, 2), help="2 = mecz i rewanż w grupie.")
+    parser.add_argument("--swiss-rounds", type=int, default=0,
+                        help="Liczba rund systemu szwajcarskiego zamiast grup (wymaga --groups 1).")
+    parser.add_argument("--rng", default="stdlib", choices=RNG_BACKENDS,
+                        help="Generator losowy nowego turnieju (pcg64, philox i batched wymagają NumPy).")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Bezgłowy symulator turnieju piłkarskiego.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Włącza logowanie na poziomie DEBUG.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="Generuje losowy turniej i zapisuje jego stan.")
+    generate.add_argument("--out", required=True, help="Plik stanu (.json lub .trn).")
+    generate.add_argument("--seed", type=int, help="Ziarno generatora losowego.")
+    _add_format_arguments(generate)
+    generate.set_defaults(func=cmd_generate)
+
+    simulate = commands.add_parser("simulate", help="Symuluje kolejki turnieju.")
+    simulate.add_argument("--state", help="Plik stanu do wczytania (domyślnie nowy losowy turniej).")
+    simulate.add_argument("--at-round", type=int,
+                          help="Kolejka odtwarzana z dziennika migawek --state (domyślnie ostatnia).")
+    simulate.add_argument("--seed", type=int, help="Ziarno dla nowego losowego turnieju.")
+    _add_format_arguments(simulate)
+    simulate.add_argument("--rounds", type=int, help="Liczba kolejek (domyślnie do końca turnieju).")
+    simulate.add_argument("--out", help="Plik, do którego zostanie zapisany stan po symulacji.")
+    simulate.add_argument("--events", help="Dziennik zdarzeń JSONL (rozszerzenie .gz włącza kompresję).")
+    simulate.add_argument("--snapshots",
+                          help="Dziennik migawek: obraz bazowy i zmiany po każdej kolejce (.gz włącza kompresję).")
+    simulate.add_argument("--checkpoint-every", type=int, default=DEFAULT_CHECKPOINT_EVERY,
+                          help="Co ile kolejek dziennik migawek zapisuje pełny stan (0 = tylko obraz bazowy).")
+    simulate.add_argument("--report", action="store_true", help="Wypisuje strzelców i kartki po symulacji.")
+    simulate.add_argument("--stats", action="store_true", help="Wypisuje czasy etapów i liczniki silnika.")
+    simulate.add_argument("--stats-json", help="Plik JSON z czasami etapów i licznikami silnika.")
+    simulate.add_argument("--profile", choices=PROFILE_KINDS,
+                          help="Profiluje symulację (cProfile lub tracemalloc) i wypisuje najdroższe miejsca.")
+    simulate.set_defaults(func=cmd_simulate)
+
+    export = commands.add_parser("export", help="Eksportuje drużyny, zawodników, mecze lub zdarzenia.")
+    export.add_argument("--state", help="Plik stanu do wczytania (domyślnie nowy losowy turniej).")
+    export.add_argument("--at-round", type=int,
+                        help="Kolejka odtwarzana z dziennika migawek --state (domyślnie ostatnia).")
+    export.add_argument("--seed", type=int, help="Ziarno dla nowego losowego turnieju.")
+    _add_format_arguments(export)
+    export.add_argument("--out", default="teams_data.json",
+                        help="Plik wynikowy; format wynika z rozszerzenia (.json, .jsonl, .csv, .npz, "
+                             "opcjonalnie z .gz).")
+    export.add_argument("--table", default="teams", choices=EXPORT_TABLES,
+                        help="Tabela do eksportu (pomijana dla .npz, które zawiera wszystkie statystyki).")
+    export.add_argument("--format", choices=EXPORT_FORMATS, help="Format pliku zamiast wynikającego z rozszerzenia.")
+    export.set_defaults(func=cmd_export)
+
+    montecarlo = commands.add_parser("montecarlo", help="Szacuje prawdopodobieństwa metodą Monte Carlo.")
+    montecarlo.add_argument("--state", help="Plik stanu ze składami (domyślnie nowy losowy turniej).")
+    montecarlo.add_argument("--at-round", type=int,
+                            help="Kolejka odtwarzana z dziennika migawek --state (domyślnie ostatnia).")
+    _add_format_arguments(montecarlo)
+    montecarlo.add_argument("--runs", type=int, default=10000, help="Liczba symulowanych turniejów.")
+    montecarlo.add_argument("--seed", type=int, help="Ziarno (wynik nie zależy od liczby procesów).")
+    montecarlo.add_argument("--workers", type=int, default=1, help="Liczba procesów (0 = wszystkie rdzenie).")
+    montecarlo.add_argument("--out", help="Plik JSON z pełnymi wynikami.")
+    montecarlo.add_argument("--store", help="Magazyn wyników, do którego dopisywany jest każdy przebieg (wymaga NumPy).")
+    montecarlo.set_defaults(func=cmd_montecarlo)
+
+    odds = commands.add_parser("odds", help="Liczy dokładne szanse meczów, oczekiwane tabele i szanse w drabince (bez symulacji).")
+    odds.add_argument("--state", help="Plik stanu do wczytania (domyślnie nowy losowy turniej).")
+    odds.add_argument("--at-round", type=int,
+                      help="Kolejka odtwarzana z dziennika migawek --state (domyślnie ostatnia).")
+    odds.add_argument("--seed", type=int, help="Ziarno dla nowego losowego turnieju.")
+    _add_format_arguments(odds)
+    odds.add_argument("--out", help="Plik JSON z oczekiwanymi tabelami, szansami nierozegranych meczów i drabinki.")
+    odds.set_defaults(func=cmd_odds)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING,
+                        format='[%(levelname)s] %(message)s')
+    if getattr(args, "workers", None) == 0:
+        args.workers = None
+    try:
+        args.func(args)
+    except (ValueError, OSError) as e:
+        print(f"Błąd: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
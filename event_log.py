@@ -0,0 +1,107 @@
+import gzip
+import json
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Zwarty zapis JSON wspólny dla dzienników i eksportu
+_COMPACT = {"ensure_ascii": False, "separators": (",", ":")}
+
+
+def _open_text(path, mode, compress=None):
+    """Otwiera plik tekstowy UTF-8, zwykły albo gzip.
+
+    Przy compress=None odczyt rozpoznaje gzip po nagłówku pliku, a zapis
+    włącza kompresję dla ścieżek kończących się na ".gz".
+    """
+    if compress is None:
+        if mode == "r":
+            with open(path, "rb") as f:
+                compress = f.read(2) == GZIP_MAGIC
+        else:
+            compress = str(path).endswith(".gz")
+    if compress:
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def event_record(match, event):
+    """Zamienia zdarzenie meczu na słownik bez odwołań do obiektów Player/Team."""
+    player = event["player"]
+    return {
+        "phase": match.phase,
+        "round": match.round,
+        "team1": match.team1.name,
+        "team2": match.team2.name,
+        "minute": event["minute"],
+        "type": event["type"],
+        "player": player.name if player is not None else None,
+        "team": player.team_name if player is not None else None,
+        "details": event["details"],
+    }
+
+
+class EventLogWriter:
+    """Dopisuje zdarzenia meczów (GOAL/YELLOW_CARD/RED_CARD/INFO) do pliku JSONL.
+
+    Plik jest otwierany w trybie dopisywania, a linie trafiają na dysk paczkami
+    po buffer_size zdarzeń, więc zużycie pamięci nie rośnie z długością
+    rozgrywek. Przy compress=None kompresja gzip jest włączana dla ścieżek
+    kończących się na ".gz".
+    """
+
+    def __init__(self, path, compress=None, buffer_size=1000):
+        self.path = path
+        self.compress = str(path).endswith(".gz") if compress is None else compress
+        self.buffer_size = buffer_size
+        self._buffer = []
+        self._file = _open_text(path, "a", self.compress)
+        self.events_written = 0
+
+    def write(self, match, event):
+        self._buffer.append(json.dumps(event_record(match, event), **_COMPACT))
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self.events_written += len(self._buffer)
+            self._buffer = []
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def read_events(path, event_type=None, team=None, player=None, phase=None):
+    """Generator zdarzeń z dziennika JSONL (zwykłego lub gzip), czytanego linia po linii.
+
+    Filtry są opcjonalne: event_type (nazwa lub zbiór nazw), team (drużyna
+    biorąca udział w meczu), player (imię i nazwisko zawodnika), phase.
+    """
+    if isinstance(event_type, str):
+        event_type = {event_type}
+
+    with _open_text(path, "r") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if event_type is not None and record["type"] not in event_type:
+                continue
+            if team is not None and team not in (record["team1"], record["team2"]):
+                continue
+            if player is not None and record["player"] != player:
+                continue
+            if phase is not None and record["phase"] != phase:
+                continue
+            yield record
@@ -0,0 +1,216 @@
+"""Strumieniowy eksport drużyn, zawodników, meczów i zdarzeń (JSON, JSONL, CSV, NumPy .npz).
+
+Wiersze są tworzone generatorami i zapisywane kolejno, więc pamięć nie rośnie
+z wielkością turnieju; przy compress=None kompresja gzip jest włączana dla
+ścieżek kończących się na ".gz". Format .npz zapisuje statystyki kolumnami.
+"""
+import csv
+import gzip
+import json
+from itertools import chain
+
+from event_log import _COMPACT, event_record
+
+np = None  # NumPy (zależność opcjonalna) jest importowany dopiero przez eksport .npz
+
+# Obsługiwane formaty (rozpoznawane też z rozszerzenia pliku, np. "gracze.csv.gz")
+EXPORT_FORMATS = ("json", "jsonl", "csv", "npz")
+
+# Kolumny eksportowanych tabel
+TEAM_COLUMNS = ("team", "group", "points", "matches_played", "wins", "draws", "losses", "goals_for", "goals_against")
+PLAYER_COLUMNS = ("player_id", "team", "first_name", "last_name", "attack", "defense", "aggression",
+                  "goals", "yellow_cards", "red_cards")
+MATCH_COLUMNS = ("phase", "round", "index", "team1", "team2", "score1", "score2", "winner")
+EVENT_COLUMNS = ("phase", "round", "team1", "team2", "minute", "type", "player", "team", "details")
+
+# Poziom kompresji gzip: 6 jest kilkukrotnie szybszy od domyślnego 9 przy niewiele większym pliku
+GZIP_LEVEL = 6
+
+
+def team_rows(tournament):
+    for team in tournament.teams:
+        yield (team.name, team.group, team.points, team.matches_played, team.wins, team.draws, team.losses,
+               team.goals_for, team.goals_against)
+
+
+def player_rows(tournament):
+    for team in tournament.teams:
+        for p in team.players:
+            yield (p.player_id, team.name, p.first_name, p.last_name, p.attack, p.defense, p.aggression,
+                   p.goals, p.yellow_cards, p.red_cards)
+
+
+def all_matches(tournament):
+    """Mecze fazy grupowej (lub szwajcarskiej), a po nich rundy pucharowe."""
+    return chain(tournament.matches, *tournament.knockout_matches.values())
+
+
+def match_rows(tournament):
+    for m in all_matches(tournament):
+        yield (m.phase, m.round, m.index, m.team1.name, m.team2.name, m.score1, m.score2,
+               m.winner.name if m.winner is not None else None)
+
+
+def event_rows(tournament):
+    for m in all_matches(tournament):
+        for event in m.events:
+            record = event_record(m, event)
+            yield tuple(record[column] for column in EVENT_COLUMNS)
+
+
+# Tabela -> (kolumny, generator wierszy)
+EXPORT_TABLES = {
+    "teams": (TEAM_COLUMNS, team_rows),
+    "players": (PLAYER_COLUMNS, player_rows),
+    "matches": (MATCH_COLUMNS, match_rows),
+    "events": (EVENT_COLUMNS, event_rows),
+}
+
+
+def detect_format(path):
+    """Format z rozszerzenia pliku (z pominięciem ".gz") albo None."""
+    name = str(path).lower()
+    if name.endswith(".gz"):
+        name = name[:-3]
+    suffix = name.rsplit(".", 1)[-1]
+    return suffix if suffix in EXPORT_FORMATS else None
+
+
+def open_output(path, compress=None):
+    """Otwiera plik tekstowy do zapisu, przez gzip dla compress=True lub ścieżki ".gz"."""
+    if compress is None:
+        compress = str(path).endswith(".gz")
+    if compress:
+        return gzip.open(path, "wt", compresslevel=GZIP_LEVEL, encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def write_teams_json(teams, path, compress=None):
+    """Zapisuje drużyny z zawodnikami (Team.to_dict) jako zwartą tablicę JSON, drużyna po drużynie."""
+    with open_output(path, compress) as f:
+        f.write("[")
+        for i, team in enumerate(teams):
+            if i:
+                f.write(",\n")
+            f.write(json.dumps(team.to_dict(), **_COMPACT))
+        f.write("]\n")
+
+
+def write_table(tournament, table, path, fmt=None, compress=None):
+    """Zapisuje tabelę (jedna z EXPORT_TABLES) w formacie json, jsonl lub csv; zwraca liczbę wierszy.
+
+    JSON to tablica obiektów, JSONL jeden obiekt w linii, a CSV wiersz
+    nagłówka z nazwami kolumn (brak wartości to pusta komórka).
+    """
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"Nieznana tabela '{table}'. Dostępne: {', '.join(EXPORT_TABLES)}.")
+    fmt = fmt or detect_format(path) or "jsonl"
+    columns, rows = EXPORT_TABLES[table]
+    count = 0
+    with open_output(path, compress) as f:
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for row in rows(tournament):
+                writer.writerow(row)
+                count += 1
+        elif fmt == "jsonl":
+            for row in rows(tournament):
+                f.write(json.dumps(dict(zip(columns, row)), **_COMPACT) + "\n")
+                count += 1
+        elif fmt == "json":
+            f.write("[")
+            for row in rows(tournament):
+                if count:
+                    f.write(",\n")
+                f.write(json.dumps(dict(zip(columns, row)), **_COMPACT))
+                count += 1
+            f.write("]\n")
+        else:
+            raise ValueError(f"Format '{fmt}' nie obsługuje tabeli; dostępne: json, jsonl, csv.")
+    return count
+
+
+def _int_column(values, count):
+    return np.fromiter(values, dtype=np.int32, count=count)
+
+
+def _str_column(values):
+    return np.array(list(values), dtype=str)
+
+
+def write_npz(tournament, path, compress=True):
+    """Zapisuje statystyki drużyn, zawodników i meczów kolumnami do archiwum NumPy .npz.
+
+    Klucze mają postać "tabela/kolumna", np. "players/goals"; brak wyniku
+    meczu to -1, a brak zwycięzcy pusty napis. Przy włączonym magazynie
+    kolumnowym (player_store) statystyki zawodników są kopiowane z jego tablic.
+    """
+    _numpy()
+    arrays = {}
+    teams = tournament.teams
+    n_teams = len(teams)
+    arrays["teams/team"] = _str_column(team.name for team in teams)
+    arrays["teams/group"] = _str_column(team.group or "" for team in teams)
+    for column in TEAM_COLUMNS[2:]:
+        arrays[f"teams/{column}"] = _int_column((getattr(team, column) for team in teams), n_teams)
+
+    players = [p for team in teams for p in team.players]
+    store = tournament.player_store
+    arrays["players/player_id"] = _int_column((-1 if p.player_id is None else p.player_id for p in players),
+                                              len(players))
+    arrays["players/team"] = _str_column(p.team_name for p in players)
+    arrays["players/first_name"] = _str_column(p.first_name for p in players)
+    arrays["players/last_name"] = _str_column(p.last_name for p in players)
+    store_order = store is not None and [getattr(p, "store_id", None) for p in players] == list(range(store.size))
+    for column in PLAYER_COLUMNS[4:]:
+        if store_order:
+            arrays[f"players/{column}"] = store.columns[column][:store.size].copy()
+        else:
+            arrays[f"players/{column}"] = _int_column((getattr(p, column) for p in players), len(players))
+
+    matches = list(all_matches(tournament))
+    n_matches = len(matches)
+    arrays["matches/phase"] = _str_column(m.phase for m in matches)
+    arrays["matches/round"] = _int_column((m.round for m in matches), n_matches)
+    arrays["matches/index"] = _int_column((m.index for m in matches), n_matches)
+    arrays["matches/team1"] = _str_column(m.team1.name for m in matches)
+    arrays["matches/team2"] = _str_column(m.team2.name for m in matches)
+    arrays["matches/score1"] = _int_column((-1 if m.score1 is None else m.score1 for m in matches), n_matches)
+    arrays["matches/score2"] = _int_column((-1 if m.score2 is None else m.score2 for m in matches), n_matches)
+    arrays["matches/winner"] = _str_column("" if m.winner is None else m.winner.name for m in matches)
+
+    save = np.savez_compressed if compress else np.savez
+    with open(path, "wb") as f:
+        save(f, **arrays)
+
+
+def _numpy():
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("Eksport .npz wymaga biblioteki NumPy (pip install numpy).") from None
+        np = numpy
+    return np
+
+
+def export_tournament(tournament, path, table="teams", fmt=None, compress=None):
+    """Eksportuje dane turnieju do pliku; format wynika z fmt lub rozszerzenia ścieżki.
+
+    "npz" zapisuje wszystkie tabele statystyk naraz (table jest pomijane),
+    a JSON tabeli "teams" to drużyny z zagnieżdżonymi zawodnikami, jak
+    w Tournament.export_teams_to_json. Zwraca komunikat dla użytkownika.
+    """
+    fmt = fmt or detect_format(path) or "json"
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Nieznany format eksportu '{fmt}'. Dostępne: {', '.join(EXPORT_FORMATS)}.")
+    if fmt == "npz":
+        write_npz(tournament, path, compress=True if compress is None else compress)
+        return f"Statystyki turnieju zostały wyeksportowane do pliku '{path}'"
+    if fmt == "json" and table == "teams":
+        write_teams_json(tournament.teams, path, compress)
+        return f"Dane drużyn zostały pomyślnie wyeksportowane do pliku '{path}'"
+    count = write_table(tournament, table, path, fmt, compress)
+    return f"Wyeksportowano {count} wierszy tabeli '{table}' do pliku '{path}'"
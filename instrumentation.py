@@ -0,0 +1,187 @@
+"""Opcjonalny pomiar pracy silnika turnieju: stopery, liczniki i profilowanie wycinka kodu.
+
+Turniej mierzy się tylko po Tournament.enable_instrumentation(); bez tego
+metody silnika sprawdzają jedynie, że tournament.instrumentation jest None.
+"""
+import functools
+import io
+import time
+
+
+class Instrumentation:
+    """Zbiera czasy nazwanych etapów i liczniki zdarzeń silnika.
+
+    Stopery są włączne: czas "round.group" obejmuje też "match.events" itd.
+    Nazwy mają postać "obszar.etap", np. "schedule.group_stage".
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.timers = {}  # nazwa -> [liczba wywołań, łączny czas w sekundach]
+        self.counters = {}
+
+    def add_time(self, name, seconds):
+        timer = self.timers.get(name)
+        if timer is None:
+            self.timers[name] = [1, seconds]
+        else:
+            timer[0] += 1
+            timer[1] += seconds
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def timer(self, name):
+        """Kontekst mierzący czas bloku: with instrumentation.timer("bracket.create"): ..."""
+        return _Timer(self, name)
+
+    def to_dict(self):
+        """Stan pomiarów jako słownik (zapis do JSON, CLI i GUI)."""
+        return {
+            "timers": {name: {"calls": calls, "total": total, "mean": total / calls}
+                       for name, (calls, total) in sorted(self.timers.items())},
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def format_report(self):
+        """Tabela tekstowa stoperów (od najdłuższych) i liczników."""
+        lines = [f"{'Etap':<28} {'Wywołania':>10} {'Łącznie [ms]':>14} {'Średnio [µs]':>14}"]
+        for name, (calls, total) in sorted(self.timers.items(), key=lambda item: item[1][1], reverse=True):
+            lines.append(f"{name:<28} {calls:>10} {total * 1e3:>14.2f} {total / calls * 1e6:>14.1f}")
+        if self.counters:
+            lines.append("")
+            lines.append(f"{'Licznik':<28} {'Wartość':>10}")
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"{name:<28} {value:>10}")
+        return "\n".join(lines)
+
+
+class _Timer:
+    __slots__ = ("instrumentation", "name", "start")
+
+    def __init__(self, instrumentation, name):
+        self.instrumentation = instrumentation
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.instrumentation.add_time(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def timed(name):
+    """Dekorator metody Tournament: mierzy jej czas, gdy pomiar jest włączony."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            instrumentation = self.instrumentation
+            if instrumentation is None:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                instrumentation.add_time(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+class CountingRandom:
+    """Generator losowy (rng.py), który zlicza pojedyncze losowania w liczniku "rng.draws"."""
+
+    def __init__(self, rng, instrumentation):
+        self._rng = rng
+        self._counters = instrumentation.counters
+
+    def _count(self, amount=1):
+        self._counters["rng.draws"] = self._counters.get("rng.draws", 0) + amount
+
+    def random(self):
+        self._count()
+        return self._rng.random()
+
+    def gauss(self, mu=0.0, sigma=1.0):
+        self._count()
+        return self._rng.gauss(mu, sigma)
+
+    def randint(self, a, b):
+        self._count()
+        return self._rng.randint(a, b)
+
+    def choice(self, seq):
+        self._count()
+        return self._rng.choice(seq)
+
+    def choices(self, population, weights=None, *, cum_weights=None, k=1):
+        self._count(k)
+        return self._rng.choices(population, weights, cum_weights=cum_weights, k=k)
+
+    def __getattr__(self, name):
+        # Pozostałe metody (shuffle, sample, generator, ...) bez zliczania
+        return getattr(self._rng, name)
+
+
+# Rodzaje profilowania obsługiwane przez ProfileCapture
+PROFILE_KINDS = ("cprofile", "tracemalloc")
+
+
+class ProfileCapture:
+    """Kontekst profilujący dowolny wycinek kodu przez cProfile albo tracemalloc.
+
+        with ProfileCapture("cprofile") as capture:
+            tournament.simulate_next_round()
+        print(capture.report())
+
+    Po wyjściu z bloku capture.stats to pstats.Stats (cprofile), a
+    capture.snapshot to tracemalloc.Snapshot (tracemalloc).
+    """
+
+    def __init__(self, kind="cprofile"):
+        if kind not in PROFILE_KINDS:
+            raise ValueError(f"Nieznany rodzaj profilowania '{kind}'. Dostępne: {', '.join(PROFILE_KINDS)}.")
+        self.kind = kind
+        self.stats = None
+        self.snapshot = None
+        self._profiler = None
+        self._started_tracemalloc = False
+
+    def __enter__(self):
+        if self.kind == "cprofile":
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            import tracemalloc
+            self._started_tracemalloc = not tracemalloc.is_tracing()
+            if self._started_tracemalloc:
+                tracemalloc.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.kind == "cprofile":
+            import pstats
+            self._profiler.disable()
+            self.stats = pstats.Stats(self._profiler, stream=io.StringIO())
+        else:
+            import tracemalloc
+            self.snapshot = tracemalloc.take_snapshot()
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+        return False
+
+    def report(self, limit=20):
+        """Najbardziej kosztowne funkcje (cprofile, wg czasu łącznego) lub miejsca alokacji (tracemalloc)."""
+        if self.stats is not None:
+            stream = io.StringIO()
+            self.stats.stream = stream
+            self.stats.sort_stats("cumulative").print_stats(limit)
+            return stream.getvalue()
+        if self.snapshot is not None:
+            lines = [str(stat) for stat in self.snapshot.statistics("lineno")[:limit]]
+            return "\n".join(lines)
+        return ""
@@ -0,0 +1,152 @@
+from bisect import bisect_left, insort
+from heapq import heappop, heappush, heapify
+from itertools import count
+
+# Wspólny licznik wersji rankingów: nowy ranking i każda zmiana dostają wartość nieużytą wcześniej
+_versions = count(1)
+
+
+class Leaderboard:
+    """Ranking zawodników według jednej wartości (np. liczby goli), aktualizowany przyrostowo.
+
+    Zawodnicy z dodatnią wartością leżą w kubełkach według tej wartości,
+    a kubełek to kopiec numerów zawodników (kolejność all_players), więc remisy
+    są rozstrzygane tak jak stabilne sortowanie listy. Zmiana wartości zawodnika
+    to wstawienie do kopca nowego kubełka w O(log m) dla kubełka m zawodników;
+    wpis w starym kubełku jest usuwany leniwie (pomijany, gdy zapamiętana
+    wartość zawodnika już się nie zgadza), a kubełek z przewagą nieaktualnych
+    wpisów jest przebudowywany, co w sumie daje O(1) na zmianę. Zapytanie
+    o pierwszych k zawodników przegląda tylko najwyższe kubełki w O(k log k).
+    Lista wartości niepustych kubełków jest krótka (co najwyżej tyle, ile
+    różnych wartości, np. liczb goli), więc wystarcza jej bisect.
+    version rośnie przy każdej zmianie rankingu, więc może być kluczem pamięci
+    podręcznej widoków (np. wykresu strzelców).
+    """
+
+    def __init__(self, key, players=()):
+        self.key = key  # Funkcja zawodnik -> wartość, np. lambda p: p.goals
+        self._players = []
+        self._index = {}  # id(zawodnika) -> numer
+        self._values = []  # Wartość zapamiętana w rankingu (0 = poza rankingiem)
+        self._buckets = {}  # wartość -> kopiec numerów zawodników (także nieaktualnych)
+        self._sizes = {}  # wartość -> liczba zawodników, którzy naprawdę mają tę wartość
+        self._levels = []  # Wartości niepustych kubełków, rosnąco
+        self.version = next(_versions)
+        for player in players:
+            self.add_player(player)
+
+    def add_player(self, player):
+        """Rejestruje zawodnika (remisy przegrywa z wcześniej zarejestrowanymi)."""
+        self._index[id(player)] = len(self._players)
+        self._players.append(player)
+        self._values.append(0)
+        self.update(player)
+
+    def update(self, player):
+        """Przenosi zawodnika do kubełka odpowiadającego jego bieżącej wartości."""
+        index = self._index.get(id(player))
+        if index is None:
+            return
+        new = self.key(player)
+        old = self._values[index]
+        if new == old:
+            return
+        self._values[index] = new
+        if old > 0:
+            self._sizes[old] -= 1
+            if not self._sizes[old]:
+                del self._buckets[old], self._sizes[old]
+                del self._levels[bisect_left(self._levels, old)]
+            elif len(self._buckets[old]) > 2 * self._sizes[old] + 8:
+                self._compact(old)
+        if new > 0:
+            bucket = self._buckets.get(new)
+            if bucket is None:
+                bucket = self._buckets[new] = []
+                self._sizes[new] = 0
+                insort(self._levels, new)
+            heappush(bucket, index)
+            self._sizes[new] += 1
+        self.version = next(_versions)
+
+    def _compact(self, value):
+        """Usuwa z kubełka nieaktualne i powtórzone wpisy."""
+        bucket = sorted({index for index in self._buckets[value] if self._values[index] == value})
+        heapify(bucket)
+        self._buckets[value] = bucket
+
+    def _members(self, value):
+        """Numery zawodników kubełka rosnąco, bez kopiowania kopca (przegląd drzewa od korzenia)."""
+        bucket = self._buckets[value]
+        frontier = [(bucket[0], 0)]
+        previous = None
+        while frontier:
+            index, position = heappop(frontier)
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < len(bucket):
+                    heappush(frontier, (bucket[child], child))
+            # Zawodnik, który wrócił do kubełka, może mieć w nim dwa wpisy
+            if index != previous and self._values[index] == value:
+                previous = index
+                yield index
+
+    def top(self, k=None):
+        """Zwraca do k zawodników z najwyższą wartością (wszystkich z wartością > 0 przy k=None)."""
+        result = []
+        for level in reversed(self._levels):
+            for index in self._members(level):
+                if k is not None and len(result) >= k:
+                    return result
+                result.append(self._players[index])
+        return result
+
+    def leaders(self):
+        """Wszyscy zawodnicy z najwyższą (dodatnią) wartością."""
+        if not self._levels:
+            return []
+        return [self._players[index] for index in self._members(self._levels[-1])]
+
+    @property
+    def max_value(self):
+        return self._levels[-1] if self._levels else 0
+
+    def __len__(self):
+        return sum(self._sizes.values())
+
+
+# Rankingi, na które wpływa dane zdarzenie meczu
+EVENT_BOARDS = {
+    "GOAL": ("goals",),
+    "YELLOW_CARD": ("yellow_cards", "card_points"),
+    "RED_CARD": ("red_cards", "card_points"),
+}
+
+
+class PlayerLeaderboards:
+    """Komplet rankingów turnieju: strzelcy, żółte i czerwone kartki oraz punkty karne.
+
+    Punkty karne (3 za czerwoną, 1 za żółtą kartkę) porządkują listę
+    najczęściej karanych zawodników w PlayerStatsReporter.
+    """
+
+    def __init__(self, players=()):
+        self.rebuild(players)
+
+    def rebuild(self, players):
+        """Buduje rankingi od nowa (po starcie, wczytaniu stanu lub podmianie obiektów zawodników)."""
+        players = list(players)
+        self.goals = Leaderboard(lambda p: p.goals, players)
+        self.yellow_cards = Leaderboard(lambda p: p.yellow_cards, players)
+        self.red_cards = Leaderboard(lambda p: p.red_cards, players)
+        self.card_points = Leaderboard(lambda p: p.red_cards * 3 + p.yellow_cards, players)
+        self._boards_for_event = {
+            event_type: tuple(getattr(self, name) for name in names) for event_type, names in EVENT_BOARDS.items()
+        }
+
+    def record_event(self, event):
+        """Uwzględnia zdarzenie meczu; statystyka zawodnika musi być już zaktualizowana."""
+        player = event["player"]
+        if player is None:
+            return
+        for board in self._boards_for_event.get(event["type"], ()):
+            board.update(player)
@@ -1,21 +1,24 @@
 import sys
 import logging
+import threading
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QTableWidget, QTableWidgetItem, QHeaderView, QListWidget,
+    QPushButton, QTableView, QHeaderView, QListWidget, QListWidgetItem,
     QMessageBox, QLabel, QTabWidget, QTextBrowser, QInputDialog, QDialog,
-    QFormLayout, QLineEdit, QDialogButtonBox, QSplitter,QFileDialog
+    QFormLayout, QLineEdit, QDialogButtonBox, QSplitter,QFileDialog, QProgressBar,
+    QComboBox, QSpinBox, QCheckBox, QSlider
 )
 from PyQt6.QtGui import QFont ,QPalette, QColor, QPixmap
-from PyQt6.QtCore import Qt
-from models import Tournament, PlayerStatsReporter
+from PyQt6.QtCore import Qt, QThread
+from models import Tournament, TournamentFormat
+from table_models import RowTableModel
+from simulation_worker import SimulationWorker
+from chart_worker import ChartWorker
+from charts import ChartCache, scorer_chart_rows
 
-import shutil
-import matplotlib.pyplot as plt
-import seaborn as sns
 
-# Konfiguracja debugowania
-logging.basicConfig(level=logging.DEBUG, format='[%(levelname)s] %(message)s')
+# Liczba wierszy w tabelach strzelców i kartek (pierwsze miejsca rankingów)
+STATS_TABLE_ROWS = 200
 
 
 class AddPlayerDialog(QDialog):
@@ -38,6 +41,42 @@ class AddPlayerDialog(QDialog):
         return self.first_name_input.text().strip(), self.last_name_input.text().strip()
 
 
+class FormatDialog(QDialog):
+    def __init__(self, tournament_format, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Format turnieju")
+        self.teams_input = self._spin_box(2, 4096, tournament_format.num_teams)
+        self.groups_input = self._spin_box(1, 2048, tournament_format.num_groups)
+        self.advance_input = self._spin_box(1, 4096, tournament_format.advance_per_group)
+        self.players_input = self._spin_box(1, 50, tournament_format.players_per_team)
+        self.legs_input = self._spin_box(1, 2, tournament_format.legs)
+        self.swiss_input = self._spin_box(0, 4095, tournament_format.swiss_rounds)
+
+        form_layout = QFormLayout(self)
+        form_layout.addRow("Liczba drużyn:", self.teams_input)
+        form_layout.addRow("Liczba grup:", self.groups_input)
+        form_layout.addRow("Awansujących z grupy:", self.advance_input)
+        form_layout.addRow("Zawodników w drużynie:", self.players_input)
+        form_layout.addRow("Rundy fazy grupowej (1 lub 2):", self.legs_input)
+        form_layout.addRow("Rundy systemu szwajcarskiego (0 = grupy):", self.swiss_input)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        form_layout.addWidget(buttons)
+
+    def _spin_box(self, minimum, maximum, value):
+        spin_box = QSpinBox(self)
+        spin_box.setRange(minimum, maximum)
+        spin_box.setValue(value)
+        return spin_box
+
+    def get_format(self):
+        """Zwraca TournamentFormat z wartości okna (ValueError przy niespójnych danych)."""
+        return TournamentFormat(self.teams_input.value(), self.groups_input.value(), self.advance_input.value(),
+                                self.players_input.value(), self.legs_input.value(), self.swiss_input.value())
+
+
 class TournamentApp(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -49,6 +88,15 @@ class TournamentApp(QMainWindow):
         self.setCentralWidget(self.central_widget)
         self.main_layout = QVBoxLayout(self.central_widget)
 
+        # Widoki wymagające odświeżenia: "group:<nazwa>", "knockout", "stats", "results", "roster"
+        self.dirty_views = set()
+        self.pending_result_matches = []
+
+        # Symulacja w tle: wątek roboczy i blokada chroniąca stan turnieju
+        self.tournament_lock = threading.RLock()
+        self.sim_thread = None
+        self.sim_worker = None
+
         self.create_top_panel()
         self.create_main_content_tabs()
         self.refresh_all_views()
@@ -59,9 +107,32 @@ class TournamentApp(QMainWindow):
         self.simulate_btn.clicked.connect(self.run_simulation)
         self.simulate_btn.setFont(QFont("Arial", 12, QFont.Weight.Bold))
 
+        self.simulate_n_btn = QPushButton("Symuluj N kolejek")
+        self.simulate_n_btn.clicked.connect(self.run_simulation_n_rounds)
+        self.simulate_all_btn = QPushButton("Symuluj do końca")
+        self.simulate_all_btn.clicked.connect(self.run_simulation_to_end)
+        self.cancel_sim_btn = QPushButton("Przerwij")
+        self.cancel_sim_btn.clicked.connect(self.cancel_simulation)
+        self.cancel_sim_btn.setEnabled(False)
+        self.sim_progress = QProgressBar()
+        self.sim_progress.setVisible(False)
+
         self.reset_btn = QPushButton("Resetuj Turniej do Konfiguracji")
         self.reset_btn.clicked.connect(self.reset_tournament)
 
+        # Powtórka: przewijanie rozegranych kolejek (Tournament.replay)
+        self.replay_back_btn = QPushButton("◀")
+        self.replay_back_btn.setToolTip("Cofnij o jedną kolejkę")
+        self.replay_back_btn.clicked.connect(self.replay_step_back)
+        self.replay_slider = QSlider(Qt.Orientation.Horizontal)
+        self.replay_slider.setTracking(False)  # Przewijanie dopiero po puszczeniu suwaka
+        self.replay_slider.setMinimumWidth(150)
+        self.replay_slider.valueChanged.connect(self.replay_seek)
+        self.replay_forward_btn = QPushButton("▶")
+        self.replay_forward_btn.setToolTip("Następna kolejka (z historii albo nowa)")
+        self.replay_forward_btn.clicked.connect(self.replay_step_forward)
+        self.replay_label = QLabel()
+
         self.status_label = QLabel()
         self.status_label.setFont(QFont("Arial", 12, QFont.Weight.Bold))
 
@@ -73,7 +144,15 @@ class TournamentApp(QMainWindow):
         top_panel_layout.addWidget(self.save_btn)
         top_panel_layout.addWidget(self.load_btn)
         top_panel_layout.addWidget(self.simulate_btn)
+        top_panel_layout.addWidget(self.simulate_n_btn)
+        top_panel_layout.addWidget(self.simulate_all_btn)
+        top_panel_layout.addWidget(self.cancel_sim_btn)
+        top_panel_layout.addWidget(self.sim_progress)
         top_panel_layout.addWidget(self.reset_btn)
+        top_panel_layout.addWidget(self.replay_back_btn)
+        top_panel_layout.addWidget(self.replay_slider)
+        top_panel_layout.addWidget(self.replay_forward_btn)
+        top_panel_layout.addWidget(self.replay_label)
         top_panel_layout.addStretch()
         top_panel_layout.addWidget(self.status_label)
         self.main_layout.addLayout(top_panel_layout)
@@ -88,6 +167,7 @@ class TournamentApp(QMainWindow):
         results_widget = self.create_results_widget()
 
         visualization_widget = self.create_visualization_widget()
+        engine_stats_widget = self.create_engine_stats_widget()
 
         self.main_tabs.addTab(management_widget, "Zarządzanie Turniejem")
 
@@ -95,6 +175,7 @@ class TournamentApp(QMainWindow):
         self.main_tabs.addTab(stats_widget, "Statystyki Graczy")
         self.main_tabs.addTab(results_widget, "Wyniki Meczów")
         self.main_tabs.addTab(visualization_widget, "Wizualizacje Danych")
+        self.main_tabs.addTab(engine_stats_widget, "Wydajność Silnika")
 
         self.main_layout.addWidget(self.main_tabs)
 
@@ -145,6 +226,9 @@ class TournamentApp(QMainWindow):
         self.start_tournament_btn.clicked.connect(self.start_tournament)
         self.generate_random_btn = QPushButton("Wygeneruj Losowy Turniej")
         self.generate_random_btn.clicked.connect(self.generate_random)
+        self.format_btn = QPushButton("Format turnieju...")
+        self.format_btn.clicked.connect(self.change_format)
+        start_panel_layout.addWidget(self.format_btn)
         start_panel_layout.addWidget(self.generate_random_btn)
         start_panel_layout.addWidget(self.start_tournament_btn)
         main_layout.addLayout(start_panel_layout)
@@ -155,11 +239,17 @@ class TournamentApp(QMainWindow):
         widget = QWidget()
         layout = QVBoxLayout(widget)
         self.tabs_groups = QTabWidget()
-        self.group_tables = {}
-        for group_name in ["Grupa A", "Grupa B", "Grupa C", "Grupa D"]:
-            table = QTableWidget()
-            self.group_tables[group_name] = table
-            self.tabs_groups.addTab(table, group_name)
+        # Grupy zależą od formatu, więc zamiast zakładki na grupę jest jeden widok
+        # tabeli i lista wyboru; modele tworzy sync_group_models
+        self.group_models = {}
+        groups_widget = QWidget()
+        groups_layout = QVBoxLayout(groups_widget)
+        self.group_selector = QComboBox()
+        self.group_selector.currentTextChanged.connect(self.show_group)
+        groups_layout.addWidget(self.group_selector)
+        self.group_view = self.create_table_view(None)
+        groups_layout.addWidget(self.group_view)
+        self.tabs_groups.addTab(groups_widget, "Grupy")
         self.knockout_tab = QTextBrowser()
         self.knockout_tab.setFont(QFont("Courier New", 10))
         self.tabs_groups.addTab(self.knockout_tab, "Drabinka Pucharowa")
@@ -171,16 +261,16 @@ class TournamentApp(QMainWindow):
         layout = QHBoxLayout(widget)
         scorers_layout = QVBoxLayout()
         scorers_layout.addWidget(QLabel("<h3>Najlepsi Strzelcy</h3>"))
-        self.scorers_table = QTableWidget()
-        scorers_layout.addWidget(self.scorers_table)
+        self.scorers_model = RowTableModel(["Gracz", "Drużyna", "Gole"], self)
+        scorers_layout.addWidget(self.create_table_view(self.scorers_model))
 
         cards_layout = QVBoxLayout()
         cards_layout.addWidget(QLabel("<h3>Żółte Kartki</h3>"))
-        self.yellow_cards_table = QTableWidget()
-        cards_layout.addWidget(self.yellow_cards_table)
+        self.yellow_cards_model = RowTableModel(["Gracz", "Drużyna", "ŻK"], self)
+        cards_layout.addWidget(self.create_table_view(self.yellow_cards_model))
         cards_layout.addWidget(QLabel("<h3>Czerwone Kartki</h3>"))
-        self.red_cards_table = QTableWidget()
-        cards_layout.addWidget(self.red_cards_table)
+        self.red_cards_model = RowTableModel(["Gracz", "Drużyna", "CZK"], self)
+        cards_layout.addWidget(self.create_table_view(self.red_cards_model))
 
         layout.addLayout(scorers_layout, 2)
         layout.addLayout(cards_layout, 1)
@@ -190,10 +280,63 @@ class TournamentApp(QMainWindow):
         widget = QWidget()
         layout = QVBoxLayout(widget)
         layout.addWidget(QLabel("<h2>Szczegółowe wyniki meczów</h2>"))
-        self.results_table = QTableWidget()
+        self.results_model = RowTableModel(["Mecz", "Wynik", "Strzelcy goli"], self)
+        self.results_table = self.create_table_view(self.results_model)
+        self.results_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        self.results_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
         layout.addWidget(self.results_table)
         return widget
 
+    def create_engine_stats_widget(self):
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+        layout.addWidget(QLabel("<h2>Czasy etapów i liczniki silnika</h2>"))
+        controls_layout = QHBoxLayout()
+        self.instrumentation_checkbox = QCheckBox("Mierz czasy i liczniki")
+        self.instrumentation_checkbox.toggled.connect(self.toggle_instrumentation)
+        self.refresh_engine_stats_btn = QPushButton("Odśwież")
+        self.refresh_engine_stats_btn.clicked.connect(self.populate_engine_stats)
+        self.reset_engine_stats_btn = QPushButton("Wyzeruj")
+        self.reset_engine_stats_btn.clicked.connect(self.reset_engine_stats)
+        controls_layout.addWidget(self.instrumentation_checkbox)
+        controls_layout.addWidget(self.refresh_engine_stats_btn)
+        controls_layout.addWidget(self.reset_engine_stats_btn)
+        controls_layout.addStretch()
+        layout.addLayout(controls_layout)
+        self.engine_stats_view = QTextBrowser()
+        self.engine_stats_view.setFont(QFont("Courier New", 10))
+        layout.addWidget(self.engine_stats_view)
+        self.populate_engine_stats()
+        return widget
+
+    def toggle_instrumentation(self, enabled):
+        with self.tournament_lock:
+            if enabled:
+                self.tournament.enable_instrumentation()
+            else:
+                self.tournament.disable_instrumentation()
+        self.populate_engine_stats()
+
+    def reset_engine_stats(self):
+        with self.tournament_lock:
+            if self.tournament.instrumentation is not None:
+                self.tournament.instrumentation.reset()
+        self.populate_engine_stats()
+
+    def populate_engine_stats(self):
+        with self.tournament_lock:
+            instrumentation = self.tournament.instrumentation
+            text = (instrumentation.format_report() if instrumentation is not None
+                    else "Pomiar jest wyłączony. Zaznacz 'Mierz czasy i liczniki' i rozegraj kolejki.")
+        self.engine_stats_view.setPlainText(text)
+
+    def create_table_view(self, model):
+        view = QTableView()
+        view.setModel(model)
+        view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        view.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        return view
+
     def add_team(self):
         name, ok = QInputDialog.getText(self, "Dodaj drużynę", "Nazwa drużyny:")
         if ok and name.strip():
@@ -226,7 +369,7 @@ class TournamentApp(QMainWindow):
             QMessageBox.warning(self, "Błąd", "Najpierw zaznacz drużynę, do której chcesz dodać zawodnika.")
             return
         team_name = selected_teams[0].text()
-        team = next((t for t in self.tournament.teams if t.name == team_name), None)
+        team = self.tournament.find_team(team_name)
         if team:
             dialog = AddPlayerDialog(self)
             if dialog.exec():
@@ -248,13 +391,14 @@ class TournamentApp(QMainWindow):
 
         team_name = selected_teams[0].text()
         player_name = selected_players[0].text()
-        team = next(t for t in self.tournament.teams if t.name == team_name)
+        team = self.tournament.find_team(team_name)
+        player_id = selected_players[0].data(Qt.ItemDataRole.UserRole)
 
         reply = QMessageBox.question(self, "Potwierdzenie", f"Czy na pewno chcesz usunąć zawodnika '{player_name}'?",
                                      QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
             try:
-                team.remove_player(player_name)
+                team.remove_player_by_id(player_id)
                 logging.debug(f"Usunięto zawodnika: {player_name}")
                 self.update_player_list()
             except ValueError as e:
@@ -264,15 +408,25 @@ class TournamentApp(QMainWindow):
         try:
             self.tournament.start_tournament()
             logging.info("Turniej został rozpoczęty.")
-            filename = f"teams_snapshot_round0.json"
-            message = self.tournament.export_teams_to_json(filename)
-            logging.info(message)
+            self.tournament.start_snapshots("snapshots_round0.snap")
+            self.tournament.start_replay()
+            logging.info("Dziennik migawek turnieju: snapshots_round0.snap")
             QMessageBox.information(self, "Start", "Turniej został rozpoczęty!")
             self.refresh_all_views()
             self.main_tabs.setCurrentIndex(1)
         except ValueError as e:
             QMessageBox.critical(self, "Błąd startu", str(e))
 
+    def change_format(self):
+        dialog = FormatDialog(self.tournament.format, self)
+        if dialog.exec():
+            try:
+                self.tournament.set_format(dialog.get_format())
+                logging.info(f"Zmieniono format turnieju: {self.tournament.format}")
+                self.refresh_all_views()
+            except ValueError as e:
+                QMessageBox.critical(self, "Błąd formatu", str(e))
+
     def generate_random(self):
         reply = QMessageBox.question(self, "Potwierdzenie",
                                      "Spowoduje to usunięcie wszystkich obecnych drużyn i rozpoczęcie nowego, losowego turnieju. Kontynuować?",
@@ -280,47 +434,114 @@ class TournamentApp(QMainWindow):
         if reply == QMessageBox.StandardButton.Yes:
             self.tournament.generate_random_tournament()
             logging.info("Wygenerowano losowy turniej.")
-            filename = f"teams_snapshot_random.json"
-            message = self.tournament.export_teams_to_json(filename)
-            logging.info(message)
+            self.tournament.start_snapshots("snapshots_random.snap")
+            self.tournament.start_replay()
+            logging.info("Dziennik migawek turnieju: snapshots_random.snap")
             QMessageBox.information(self, "Sukces", "Wygenerowano i rozpoczęto losowy turniej.")
             self.refresh_all_views()
             self.main_tabs.setCurrentIndex(1)
 
     def run_simulation(self):
-        message = self.tournament.simulate_next_round()
-        logging.info(f"Symulacja: {message}")
+        self.start_simulation(1)
 
-        self.refresh_all_views()
-        QMessageBox.information(self, "Wynik symulacji", message)
+    def run_simulation_n_rounds(self):
+        remaining = self.tournament.remaining_rounds()
+        rounds, ok = QInputDialog.getInt(self, "Symulacja", "Liczba kolejek do zasymulowania:", 1, 1, remaining)
+        if ok:
+            self.start_simulation(rounds)
 
-        if self.tournament.winner:
-            QMessageBox.information(self, "Koniec Turnieju",
-                                    "Turniej zakończony! Generuję podsumowanie w konsoli...")
+    def run_simulation_to_end(self):
+        self.start_simulation(None)
 
+    def start_simulation(self, rounds):
+        """Uruchamia symulację podanej liczby kolejek (None = do końca) w wątku roboczym."""
+        if self.sim_thread is not None:
+            return
+        self.sim_thread = QThread()
+        self.sim_worker = SimulationWorker(self.tournament, self.tournament_lock, rounds)
+        self.sim_worker.moveToThread(self.sim_thread)
+        self.sim_thread.started.connect(self.sim_worker.run)
+        self.sim_worker.progress.connect(self.on_simulation_progress)
+        self.sim_worker.batch_ready.connect(self.on_simulation_batch)
+        self.sim_worker.failed.connect(self.on_simulation_failed)
+        self.sim_worker.finished.connect(self.on_simulation_finished)
+
+        self.sim_progress.setValue(0)
+        self.sim_progress.setVisible(True)
+        self.cancel_sim_btn.setEnabled(True)
+        self.update_ui_state()
+        self.sim_thread.start()
 
-            QApplication.processEvents()
+    def cancel_simulation(self):
+        if self.sim_worker is not None:
+            self.sim_worker.cancel()
+            self.cancel_sim_btn.setEnabled(False)
 
-            print("\n" + "=" * 25)
-            print("TURNIEJ ZAKOŃCZONY! GENEROWANIE PODSUMOWANIA W KONSOLI...")
-            print("=" * 25)
+    def on_simulation_progress(self, done, total, message):
+        logging.info(f"Symulacja: {message}")
+        self.sim_progress.setMaximum(total)
+        self.sim_progress.setValue(done)
+
+    def on_simulation_batch(self, matches, phase_changed):
+        self.mark_matches_dirty(matches, phase_changed)
+        self.refresh_dirty_views()
+
+    def on_simulation_failed(self, error):
+        QMessageBox.critical(self, "Błąd symulacji", error)
+
+    def on_simulation_finished(self, messages, cancelled):
+        self.sim_thread.quit()
+        self.sim_thread.wait()
+        self.sim_thread = None
+        self.sim_worker = None
+        self.sim_progress.setVisible(False)
+        self.cancel_sim_btn.setEnabled(False)
+        self.refresh_dirty_views()
+
+        if cancelled:
+            QMessageBox.information(self, "Symulacja przerwana",
+                                    f"Przerwano po {len(messages)} kolejkach.")
+        elif messages:
+            QMessageBox.information(self, "Wynik symulacji", messages[-1])
+
+        if messages and self.tournament.winner:
+            QMessageBox.information(self, "Koniec Turnieju",
+                                    "Turniej zakończony! Podsumowanie zostało wypisane w konsoli.")
 
-            try:
-                if self.tournament.all_players:
-                    reporter = PlayerStatsReporter(self.tournament.all_players)
-                    reporter.display_full_stats_table()
-                    reporter.display_top_scorers()
-                    reporter.display_card_offenders()
-                else:
-                    print("Brak zawodników do wygenerowania raportu.")
-
-                print("\nPodsumowanie dostępne w konsoli, w której uruchomiono aplikację.")
-                print("=" * 25 + "\n")
-            except Exception as e:
-                print(f"Wystąpił nieoczekiwany błąd podczas generowania raportu: {e}")
-                logging.error(f"Błąd w raporcie konsolowym: {e}")
+    def replay_seek(self, round_index):
+        replay = self.tournament.replay
+        if replay is None or self.sim_thread is not None or round_index == replay.position:
+            return
+        with self.tournament_lock:
+            replay.seek(round_index)
+        self.refresh_all_views()
 
+    def replay_step_back(self):
+        self.replay_seek(self.tournament.replay.position - 1)
 
+    def replay_step_forward(self):
+        replay = self.tournament.replay
+        if replay.position < replay.latest:
+            self.replay_seek(replay.position + 1)
+        else:
+            self.run_simulation()
+
+    def update_replay_controls(self):
+        replay = self.tournament.replay
+        is_simulating = self.sim_thread is not None
+        self.replay_slider.blockSignals(True)
+        if replay is None:
+            self.replay_slider.setRange(0, 0)
+            self.replay_label.setText("")
+        else:
+            self.replay_slider.setRange(0, replay.latest)
+            self.replay_slider.setValue(replay.position)
+            self.replay_label.setText(f"Kolejka {replay.position}/{replay.latest}")
+        self.replay_slider.blockSignals(False)
+        self.replay_slider.setEnabled(replay is not None and replay.latest > 0 and not is_simulating)
+        self.replay_back_btn.setEnabled(replay is not None and replay.position > 0 and not is_simulating)
+        self.replay_forward_btn.setEnabled(replay is not None and not is_simulating and (
+            replay.position < replay.latest or self.tournament.winner is None))
 
     def reset_tournament(self):
         self.tournament.reset_to_setup()
@@ -329,14 +550,67 @@ class TournamentApp(QMainWindow):
         QMessageBox.information(self, "Reset", "Turniej został zresetowany do fazy konfiguracji.")
 
     def refresh_all_views(self):
+        """Odświeża wszystkie widoki (po resecie, wczytaniu lub starcie turnieju)."""
+        self.sync_group_models()
+        self.dirty_views.update(f"group:{name}" for name in self.group_models)
+        self.dirty_views.update(["knockout", "stats", "results", "roster"])
+        self.refresh_dirty_views()
+
+    def sync_group_models(self):
+        """Tworzy modele tabel dla grup bieżącego turnieju, jeśli zmienił się ich skład."""
+        table_names = self.tournament.table_names()
+        if list(self.group_models) == table_names:
+            return
+        self.group_models = {
+            name: RowTableModel(['#', 'Drużyna', 'M', 'Pkt', 'Z', 'R', 'P', 'B+', 'B-', '+/-'], self)
+            for name in table_names
+        }
+        self.group_selector.blockSignals(True)
+        self.group_selector.clear()
+        self.group_selector.addItems(list(self.group_models))
+        self.group_selector.blockSignals(False)
+        self.show_group(self.group_selector.currentText())
+
+    def show_group(self, group_name):
+        self.group_view.setModel(self.group_models.get(group_name))
+
+    def mark_matches_dirty(self, matches, phase_changed):
+        """Oznacza do odświeżenia tylko widoki, których dotyczyły rozegrane mecze."""
+        self.dirty_views.update(f"group:{m.team1.group}" for m in matches if m.phase in ("GROUP", "SWISS"))
+        if phase_changed or any(m.phase == "KNOCKOUT" for m in matches):
+            self.dirty_views.add("knockout")
+        if matches:
+            self.dirty_views.add("stats")
+            self.pending_result_matches.extend(matches)
+
+    def refresh_dirty_views(self):
+        with self.tournament_lock:
+            self._refresh_dirty_views()
+
+    def _refresh_dirty_views(self):
         self.update_ui_state()
-        self.update_management_lists()
         self.update_status_label()
-        if self.tournament.phase != "SETUP":
-            for group_name, table in self.group_tables.items(): self.populate_group_table(group_name, table)
+        if self.tournament.instrumentation is not None:
+            self.populate_engine_stats()
+        dirty, self.dirty_views = self.dirty_views, set()
+        pending, self.pending_result_matches = self.pending_result_matches, []
+        if self.tournament.phase == "SETUP":
+            if "roster" in dirty:
+                self.update_management_lists()
+            return
+        if "roster" in dirty:  # Listy zarządzania są niedostępne poza konfiguracją: odbudowa po powrocie
+            self.dirty_views.add("roster")
+        for group_name, model in self.group_models.items():
+            if f"group:{group_name}" in dirty:
+                self.populate_group_table(group_name, model)
+        if "knockout" in dirty:
             self.populate_knockout_tab()
+        if "stats" in dirty:
             self.populate_player_stats_tables()
+        if "results" in dirty:
             self.populate_results_table()
+        elif pending:
+            self.results_model.append_rows(self.result_rows(pending))
 
     def update_ui_state(self):
         is_setup_phase = self.tournament.phase == "SETUP"
@@ -348,16 +622,27 @@ class TournamentApp(QMainWindow):
         self.main_tabs.setTabEnabled(2, not is_setup_phase)  # Statystyki
         self.main_tabs.setTabEnabled(3, not is_setup_phase)  # Wyniki
 
-        # Przyciski
-        self.simulate_btn.setEnabled(not is_setup_phase and not is_finished)
-        self.start_tournament_btn.setEnabled(is_setup_phase and len(self.tournament.teams) == 16 and all(
-            len(t.players) == 11 for t in self.tournament.teams))
+        # Przyciski (w trakcie symulacji w tle stan turnieju może zmieniać tylko wątek roboczy)
+        is_simulating = self.sim_thread is not None
+        can_simulate = not is_setup_phase and not is_finished and not is_simulating
+        self.simulate_btn.setEnabled(can_simulate)
+        self.simulate_n_btn.setEnabled(can_simulate)
+        self.simulate_all_btn.setEnabled(can_simulate)
+        for button in (self.reset_btn, self.save_btn, self.load_btn):
+            button.setEnabled(not is_simulating)
+        self.format_btn.setEnabled(is_setup_phase)
+        self.update_replay_controls()
+        tournament_format = self.tournament.format
+        self.start_tournament_btn.setEnabled(
+            is_setup_phase and len(self.tournament.teams) == tournament_format.num_teams and all(
+                len(t.players) == tournament_format.players_per_team for t in self.tournament.teams))
 
     def update_management_lists(self):
         # Lista drużyn
         self.teams_list_widget.clear()
         self.teams_list_widget.addItems([team.name for team in self.tournament.teams])
-        self.teams_list_widget.parent().findChild(QLabel).setText(f"<h3>Drużyny ({len(self.tournament.teams)}/16)</h3>")
+        self.teams_list_widget.parent().findChild(QLabel).setText(
+            f"<h3>Drużyny ({len(self.tournament.teams)}/{self.tournament.format.num_teams})</h3>")
 
         # Lista zawodników
         self.update_player_list()
@@ -367,10 +652,15 @@ class TournamentApp(QMainWindow):
         selected_items = self.teams_list_widget.selectedItems()
         if selected_items:
             team_name = selected_items[0].text()
-            team = next((t for t in self.tournament.teams if t.name == team_name), None)
+            team = self.tournament.find_team(team_name)
             if team:
-                self.players_list_widget.addItems([player.name for player in team.players])
-                self.players_label.setText(f"<h3>Zawodnicy w {team_name} ({len(team.players)}/11)</h3>")
+                for player in team.players:
+                    # Numer zawodnika odróżnia osoby o tym samym imieniu i nazwisku
+                    item = QListWidgetItem(player.name)
+                    item.setData(Qt.ItemDataRole.UserRole, player.player_id)
+                    self.players_list_widget.addItem(item)
+                self.players_label.setText(f"<h3>Zawodnicy w {team_name} "
+                                           f"({len(team.players)}/{self.tournament.format.players_per_team})</h3>")
         else:
             self.players_label.setText("<h3>Zawodnicy w wybranej drużynie</h3>")
 
@@ -385,50 +675,46 @@ class TournamentApp(QMainWindow):
                                                        top_scorers]); scorer_text = f" | 👑 Król Strzelców: {scorers_names} ({top_scorers[0].goals} goli)"
             text = f"{winner_text}{scorer_text}"
         elif self.tournament.phase == "GROUP_STAGE":
-            text = f"Faza grupowa: Kolejka {self.tournament.current_round}/6"
+            text = f"Faza grupowa: Kolejka {self.tournament.current_round}/{self.tournament.num_group_rounds}"
+        elif self.tournament.phase == "SWISS_STAGE":
+            text = f"System szwajcarski: Runda {self.tournament.current_round}/{self.tournament.num_group_rounds}"
         else:
-            text = f"Faza pucharowa: {['Quarter-finals', 'Semi-finals', 'Final'][self.tournament.current_round]}"
+            text = f"Faza pucharowa: {self.tournament.current_round_name}"
         self.status_label.setText(text)
 
-    def populate_group_table(self, group_name, table):
-        if group_name not in self.tournament.groups: return
-        teams = sorted(self.tournament.groups[group_name], key=lambda t: (t.points, t.goal_difference, t.goals_for),
-                       reverse=True)
-        headers = ['#', 'Drużyna', 'M', 'Pkt', 'Z', 'R', 'P', 'B+', 'B-', '+/-']
-        data = [[i + 1, t.name, t.matches_played, t.points, t.wins, t.draws, t.losses, t.goals_for, t.goals_against,
-                 f"{t.goal_difference:+d}"] for i, t in enumerate(teams)]
-        self.populate_table(table, headers, data)
+    def populate_group_table(self, group_name, model):
+        if group_name not in self.tournament.table_names(): return
+        teams = self.tournament.ranking(group_name)
+        model.set_rows([[i + 1, t.name, t.matches_played, t.points, t.wins, t.draws, t.losses, t.goals_for,
+                         t.goals_against, f"{t.goal_difference:+d}"] for i, t in enumerate(teams)])
 
     def populate_player_stats_tables(self):
-        players = self.tournament.all_players;
-        scorers = sorted([p for p in players if p.goals > 0], key=lambda p: p.goals, reverse=True);
-        self.populate_table(self.scorers_table, ["Gracz", "Drużyna", "Gole"],
-                            [[p.name, p.team_name, p.goals] for p in scorers])
-        yellows = sorted([p for p in players if p.yellow_cards > 0], key=lambda p: p.yellow_cards, reverse=True);
-        self.populate_table(self.yellow_cards_table, ["Gracz", "Drużyna", "ŻK"],
-                            [[p.name, p.team_name, p.yellow_cards] for p in yellows])
-        reds = sorted([p for p in players if p.red_cards > 0], key=lambda p: p.red_cards, reverse=True);
-        self.populate_table(self.red_cards_table, ["Gracz", "Drużyna", "CZK"],
-                            [[p.name, p.team_name, p.red_cards] for p in reds])
+        leaderboards = self.tournament.leaderboards
+        scorers = leaderboards.goals.top(STATS_TABLE_ROWS)
+        self.scorers_model.set_rows([[p.name, p.team_name, p.goals] for p in scorers])
+        yellows = leaderboards.yellow_cards.top(STATS_TABLE_ROWS)
+        self.yellow_cards_model.set_rows([[p.name, p.team_name, p.yellow_cards] for p in yellows])
+        reds = leaderboards.red_cards.top(STATS_TABLE_ROWS)
+        self.red_cards_model.set_rows([[p.name, p.team_name, p.red_cards] for p in reds])
 
     def populate_results_table(self):
         played_matches = [m for m in self.tournament.matches if m.is_played] + [m for r in
                                                                                 self.tournament.knockout_matches.values()
                                                                                 for m in r if m.is_played]
-        headers = ["Mecz", "Wynik", "Strzelcy goli"];
-        data = []
-        for match in sorted(played_matches, key=lambda m: (m.phase, m.round)):
+        self.results_model.set_rows(self.result_rows(sorted(played_matches, key=lambda m: (m.phase, m.round))))
+
+    def result_rows(self, matches):
+        rows = []
+        for match in matches:
             scorers_list = [f"{event['player'].name} ({event['minute']}')" for event in match.events if
                             event['type'] == 'GOAL'];
             scorers_str = ", ".join(scorers_list) if scorers_list else "Brak"
-            data.append([f"{match.team1.name} vs {match.team2.name}", f"{match.score1} - {match.score2}", scorers_str])
-        self.populate_table(self.results_table, headers, data);
-        self.results_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents);
-        self.results_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
+            rows.append([f"{match.team1.name} vs {match.team2.name}", f"{match.score1} - {match.score2}", scorers_str])
+        return rows
 
     def populate_knockout_tab(self):
         html = "<h1>Drabinka Pucharowa</h1>"
-        for round_name in ["Quarter-finals", "Semi-finals", "Final"]:
+        for round_name in self.tournament.format.knockout_round_names():
             if round_name in self.tournament.knockout_matches:
                 html += f"<h2>{round_name.replace('-', ' ')}</h2><ul>"
                 for match in self.tournament.knockout_matches[round_name]:
@@ -437,8 +723,16 @@ class TournamentApp(QMainWindow):
                         team2_str = f"<b>{match.team2.name}</b>" if match.winner == match.team2 else match.team2.name
                         html += f"<li>{team1_str} {match.score1} - {match.score2} {team2_str}</li>"
                     else:
-                        html += f"<li>{match.team1.name} vs {match.team2.name}</li>"
+                        advance = self.tournament.match_odds(match).advance
+                        html += (f"<li>{match.team1.name} vs {match.team2.name} "
+                                 f"<i>(szanse awansu: {advance:.0%} – {1 - advance:.0%})</i></li>")
                 html += "</ul>"
+        if self.tournament.phase == "KNOCKOUT_STAGE" and not self.tournament.winner:
+            title_odds = sorted(((stats["title"], name) for name, stats in self.tournament.knockout_odds().items()
+                                 if stats["title"] > 0), reverse=True)
+            html += "<h2>Szanse na tytuł</h2><ul>"
+            html += "".join(f"<li>{name}: {chance:.1%}</li>" for chance, name in title_odds)
+            html += "</ul>"
         if self.tournament.winner:
             scorer_html = "";
             top_scorers = self.tournament.top_scorer
@@ -447,20 +741,10 @@ class TournamentApp(QMainWindow):
             html += f"<hr><h1>🏆 Zwycięzca: {self.tournament.winner.name} 🏆</h1>{scorer_html}"
         self.knockout_tab.setHtml(html)
 
-    def populate_table(self, table, headers, data):
-        table.setColumnCount(len(headers));
-        table.setHorizontalHeaderLabels(headers);
-        table.setRowCount(len(data))
-        for row_idx, row_data in enumerate(data):
-            for col_idx, cell_data in enumerate(row_data): table.setItem(row_idx, col_idx,
-                                                                         QTableWidgetItem(str(cell_data)))
-        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch);
-
-        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-
     def save_tournament_state(self):
-        """Otwiera okno dialogowe do zapisu stanu turnieju w pliku .json."""
-        filename, _ = QFileDialog.getSaveFileName(self, "Zapisz turniej", "", "Pliki JSON (*.json)")
+        """Otwiera okno dialogowe do zapisu stanu turnieju w pliku .json lub binarnym .trn."""
+        filename, _ = QFileDialog.getSaveFileName(self, "Zapisz turniej", "",
+                                                  "Pliki JSON (*.json);;Zapis binarny (*.trn)")
 
         if filename:
             try:
@@ -472,18 +756,21 @@ class TournamentApp(QMainWindow):
                 logging.error(f"Błąd podczas zapisu do pliku {filename}: {e}")
 
     def load_tournament_state(self):
-        """Otwiera okno dialogowe do wczytania stanu turnieju z pliku .json."""
+        """Otwiera okno dialogowe do wczytania stanu turnieju z pliku .json lub .trn."""
         reply = QMessageBox.question(self, "Potwierdzenie",
                                      "Spowoduje to nadpisanie obecnego stanu turnieju. Kontynuować?",
                                      QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.No:
             return
 
-        filename, _ = QFileDialog.getOpenFileName(self, "Wczytaj turniej", "", "Pliki JSON (*.json)")
+        filename, _ = QFileDialog.getOpenFileName(self, "Wczytaj turniej", "",
+                                                  "Zapisy turnieju (*.json *.trn)")
 
         if filename:
             try:
                 self.tournament.load_from_file(filename)
+                if self.tournament.phase != "SETUP":
+                    self.tournament.start_replay()
                 self.refresh_all_views()
                 QMessageBox.information(self, "Sukces", "Turniej został pomyślnie wczytany.")
                 logging.info(f"Wczytano stan turnieju z {filename}")
@@ -516,58 +803,72 @@ class TournamentApp(QMainWindow):
         layout.addLayout(buttons_layout)
         layout.addWidget(self.chart_label)
 
-        # Przechowamy ścieżkę do wygenerowanego pliku
-        self.current_chart_path = None
+        # Ostatni narysowany wykres (figura i PNG) oraz wątek, który rysuje nowy
+        self.chart_cache = ChartCache()
+        self.chart_thread = None
+        self.chart_worker = None
 
         return widget
 
     def generate_scorers_chart(self):
-        """Generuje wykres słupkowy dla 10 najlepszych strzelców, zapisuje go
-        do tymczasowego pliku i wyświetla w aplikacji."""
-
-
-        all_scorers = [p for p in self.tournament.all_players if p.goals > 0]
-
-        if not all_scorers:
+        """Wyświetla wykres 10 najlepszych strzelców.
+
+        Wykres jest rysowany w wątku roboczym (ChartWorker) do PNG w pamięci
+        i zapamiętywany razem z wersją rankingu strzelców, więc przy
+        niezmienionych danych jest tylko ponownie wyświetlany.
+        """
+        with self.tournament_lock:
+            goals_board = self.tournament.leaderboards.goals
+            key = goals_board.version
+            rows = scorer_chart_rows(self.tournament.leaderboards)
+
+        if not rows:
             QMessageBox.warning(self, "Brak danych", "Brak strzelców do wyświetlenia na wykresie.")
             return
 
-        sorted_scorers = sorted(all_scorers, key=lambda p: p.goals, reverse=True)
-
-        top_10_scorers = sorted_scorers[:10]
-
-
-        player_names = [p.name for p in top_10_scorers]
-        player_goals = [p.goals for p in top_10_scorers]
-
-        plt.figure(figsize=(12, 7))
-        sns.set_style("whitegrid")  #
-
-        bar_plot = sns.barplot(x=player_goals, y=player_names, palette="viridis", orient='h')
-
-        plt.xlabel("Liczba goli", fontsize=12)
-        plt.ylabel("Zawodnik", fontsize=12)
-        plt.title("Najlepsi Strzelcy Turnieju", fontsize=16, weight='bold')
-        plt.tight_layout()
-
-        self.current_chart_path = "top_scorers_chart.png"
-        try:
-            plt.savefig(self.current_chart_path)
-            logging.info(f"Wykres zapisany tymczasowo jako {self.current_chart_path}")
-        except Exception as e:
-            QMessageBox.critical(self, "Błąd", f"Nie udało się zapisać wykresu: {e}")
+        if self.chart_cache.get(key) is not None:
+            self.show_chart()
+            return
+        if self.chart_thread is not None:
             return
-        finally:
-            plt.close()
 
-        pixmap = QPixmap(self.current_chart_path)
+        self.chart_thread = QThread()
+        self.chart_worker = ChartWorker(key, rows)
+        self.chart_worker.moveToThread(self.chart_thread)
+        self.chart_thread.started.connect(self.chart_worker.run)
+        self.chart_worker.finished.connect(self.on_chart_rendered)
+        self.chart_worker.failed.connect(self.on_chart_failed)
+        self.generate_chart_btn.setEnabled(False)
+        self.chart_label.setText("Rysowanie wykresu...")
+        self.chart_thread.start()
+
+    def on_chart_rendered(self, key, figure, png):
+        self.finish_chart_thread()
+        self.chart_cache.store(key, figure, png)
+        logging.info("Narysowano wykres najlepszych strzelców")
+        self.show_chart()
+
+    def on_chart_failed(self, error):
+        self.finish_chart_thread()
+        self.chart_label.setText("Kliknij 'Generuj...', aby wyświetlić wykres.")
+        QMessageBox.critical(self, "Błąd", f"Nie udało się narysować wykresu: {error}")
+
+    def finish_chart_thread(self):
+        self.chart_thread.quit()
+        self.chart_thread.wait()
+        self.chart_thread = None
+        self.chart_worker = None
+        self.generate_chart_btn.setEnabled(True)
+
+    def show_chart(self):
+        pixmap = QPixmap()
+        pixmap.loadFromData(self.chart_cache.png, "PNG")
         self.chart_label.setPixmap(pixmap.scaled(self.chart_label.size(), Qt.AspectRatioMode.KeepAspectRatio,
                                                  Qt.TransformationMode.SmoothTransformation))
-
         self.save_chart_btn.setEnabled(True)
 
     def save_chart_as(self):
-        if not self.current_chart_path:
+        if self.chart_cache.figure is None:
             QMessageBox.warning(self, "Brak wykresu", "Najpierw wygeneruj wykres.")
             return
 
@@ -580,7 +881,8 @@ class TournamentApp(QMainWindow):
 
         if save_path:
             try:
-                shutil.copy(self.current_chart_path, save_path)
+                # Zapis z zapamiętanej figury; format wynika z rozszerzenia pliku
+                self.chart_cache.figure.savefig(save_path)
                 QMessageBox.information(self, "Sukces", f"Wykres został zapisany w:\n{save_path}")
                 logging.info(f"Użytkownik zapisał wykres jako {save_path}")
             except Exception as e:
@@ -588,6 +890,8 @@ class TournamentApp(QMainWindow):
 
 
 if __name__ == "__main__":
+    # Konfiguracja debugowania
+    logging.basicConfig(level=logging.DEBUG, format='[%(levelname)s] %(message)s')
     app = QApplication(sys.argv)
     window = TournamentApp()
     window.show()
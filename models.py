@@ -1,27 +1,211 @@
 import random
 import json
+from itertools import accumulate
 from data import team_names, first_names, last_names  # Import danych do generowania losowego
+from standings import Standings, DEFAULT_TIE_BREAKERS
+from state_io import is_binary_state, read_binary_state, write_binary_state
+from swiss import BYE_POINTS, swiss_pairings
+from leaderboard import PlayerLeaderboards
+from rng import make_rng
+from snapshots import DEFAULT_CHECKPOINT_EVERY, SnapshotWriter, read_snapshot
+from replay import DEFAULT_REPLAY_CHECKPOINT_EVERY, Replay
+from instrumentation import CountingRandom, Instrumentation, ProfileCapture, timed
+
+# Rodzaje strumieni losowych turnieju i kody faz w kluczach strumieni (Tournament.match_rng)
+MATCH_STREAM = 0
+ROUND_STREAM = 1
+PHASE_CODES = {"GROUP": 0, "SWISS": 1, "KNOCKOUT": 2}
+
+# Stopery całych kolejek w poszczególnych fazach (Tournament.instrumentation)
+ROUND_TIMERS = {"GROUP_STAGE": "round.group", "SWISS_STAGE": "round.swiss", "KNOCKOUT_STAGE": "round.knockout"}
+
+# Parametry modelu wyniku: liczba goli ~ N(suma ataku / GOAL_SCALE, GOAL_SIGMA)
+GOAL_SCALE = 55
+GOAL_SIGMA = 1.5
+
+# Pary ćwierćfinałowe jako ((indeks grupy, miejsce), (indeks grupy, miejsce)):
+# A1 vs B2, C1 vs D2, B1 vs A2, D1 vs C2
+QUARTER_FINAL_PAIRING = [
+    ((0, 0), (1, 1)),
+    ((2, 0), (3, 1)),
+    ((1, 0), (0, 1)),
+    ((3, 0), (2, 1)),
+]
+
+# Nazwy rund pucharowych według liczby drużyn w rundzie; większe to "Round of N"
+KNOCKOUT_ROUND_NAMES = {2: "Final", 4: "Semi-finals", 8: "Quarter-finals"}
+KNOCKOUT_ROUND_LABELS = {"Final": "finał", "Semi-finals": "półfinały", "Quarter-finals": "ćwierćfinały"}
+
+# Nazwa jedynej tabeli w formacie szwajcarskim (odpowiednik nazwy grupy)
+SWISS_TABLE_NAME = "System szwajcarski"
+
+
+def group_name(index):
+    """Nazwa grupy o danym indeksie: Grupa A..Z, potem AA, AB, ... (jak kolumny arkusza)."""
+    letters = ""
+    index += 1
+    while index:
+        index, rest = divmod(index - 1, 26)
+        letters = chr(ord("A") + rest) + letters
+    return f"Grupa {letters}"
+
+
+def knockout_round_label(round_name):
+    """Polska nazwa rundy pucharowej do komunikatów, np. "1/8 finału"."""
+    if round_name in KNOCKOUT_ROUND_LABELS:
+        return KNOCKOUT_ROUND_LABELS[round_name]
+    return f"1/{int(round_name.rsplit(' ', 1)[1]) // 2} finału"
+
+
+def bracket_order(size):
+    """Numery rozstawienia (od 1) w kolejności miejsc drabinki o rozmiarze size.
+
+    Klasyczne rozstawienie: 1 i 2 mogą się spotkać dopiero w finale, a pierwsza
+    runda paruje rozstawienie s z size + 1 - s, więc wolne losy trafiają do
+    najwyżej rozstawionych drużyn.
+    """
+    order = [1]
+    while len(order) < size:
+        n = len(order) * 2
+        order = [seed for s in order for seed in (s, n + 1 - s)]
+    return order
+
+
+class TournamentFormat:
+    """Opis formatu turnieju: liczba drużyn, grup i awansujących z każdej grupy.
+
+    Drużyny są dzielone na grupy możliwie równo (pierwsze grupy dostają
+    o jedną drużynę więcej), grają każdy z każdym (legs=2: mecz i rewanż),
+    a najlepsze advance_per_group z każdej grupy trafia do drabinki pucharowej
+    o rozmiarze najbliższej potęgi dwójki; brakujące miejsca to wolne losy.
+
+    Przy swiss_rounds > 0 zamiast grup rozgrywana jest faza w systemie
+    szwajcarskim (jedna tabela, num_groups=1), z której awansuje
+    advance_per_group najlepszych drużyn.
+    """
+
+    def __init__(self, num_teams=16, num_groups=4, advance_per_group=2, players_per_team=11, legs=2,
+                 swiss_rounds=0):
+        if num_groups < 1:
+            raise ValueError("Turniej musi mieć co najmniej jedną grupę.")
+        if num_teams < 2 * num_groups:
+            raise ValueError("Każda grupa musi mieć co najmniej 2 drużyny.")
+        if not 1 <= advance_per_group <= num_teams // num_groups:
+            raise ValueError("Liczba awansujących nie może przekraczać liczebności najmniejszej grupy.")
+        if num_groups * advance_per_group < 2:
+            raise ValueError("Do fazy pucharowej muszą awansować co najmniej 2 drużyny.")
+        if players_per_team < 1:
+            raise ValueError("Drużyna musi mieć co najmniej jednego zawodnika.")
+        if legs not in (1, 2):
+            raise ValueError("Faza grupowa może mieć jedną lub dwie rundy (legs=1 lub 2).")
+        if swiss_rounds and num_groups != 1:
+            raise ValueError("System szwajcarski rozgrywany jest w jednej tabeli (num_groups=1).")
+        if not 0 <= swiss_rounds < num_teams:
+            raise ValueError("Liczba rund szwajcarskich musi być mniejsza od liczby drużyn.")
+        self.num_teams = num_teams
+        self.num_groups = num_groups
+        self.advance_per_group = advance_per_group
+        self.players_per_team = players_per_team
+        self.legs = legs
+        self.swiss_rounds = swiss_rounds
+
+    @property
+    def is_swiss(self):
+        return self.swiss_rounds > 0
+
+    @property
+    def qualifiers(self):
+        return self.num_groups * self.advance_per_group
+
+    @property
+    def bracket_size(self):
+        return 1 << (self.qualifiers - 1).bit_length()
+
+    @property
+    def uses_fixed_quarter_finals(self):
+        """Format 4 grupy × 2 awansujących gra stałymi parami QUARTER_FINAL_PAIRING."""
+        return self.num_groups == 4 and self.advance_per_group == 2
+
+    def group_names(self):
+        return [group_name(i) for i in range(self.num_groups)]
+
+    def group_sizes(self):
+        base, extra = divmod(self.num_teams, self.num_groups)
+        return [base + 1 if i < extra else base for i in range(self.num_groups)]
+
+    def group_rounds(self, group_size):
+        """Liczba kolejek grupy danej wielkości (przy nieparzystej jedna drużyna pauzuje)."""
+        return (group_size - 1 + group_size % 2) * self.legs
+
+    @property
+    def num_group_rounds(self):
+        """Liczba kolejek fazy przed drabinką (grupowej albo szwajcarskiej)."""
+        if self.is_swiss:
+            return self.swiss_rounds
+        return self.group_rounds(max(self.group_sizes()))
+
+    def knockout_round_names(self):
+        """Nazwy rund pucharowych od pierwszej do finału."""
+        names = []
+        size = self.bracket_size
+        while size >= 2:
+            names.append(KNOCKOUT_ROUND_NAMES.get(size, f"Round of {size}"))
+            size //= 2
+        return names
+
+    def seed_bracket(self, rankings, key):
+        """Układa drużyny awansujące w miejsca pierwszej rundy drabinki.
+
+        rankings to tabele grup (listy od pierwszego miejsca) w kolejności grup,
+        key - klucz porównujący drużyny z tych samych miejsc różnych grup.
+        Zwraca listę długości bracket_size, w której None oznacza wolny los.
+        """
+        if self.uses_fixed_quarter_finals:
+            return [rankings[g][pos] for pair in QUARTER_FINAL_PAIRING for g, pos in pair]
+        seeds = []
+        for pos in range(self.advance_per_group):
+            seeds.extend(sorted((ranking[pos] for ranking in rankings), key=key, reverse=True))
+        return [seeds[s - 1] if s <= len(seeds) else None for s in bracket_order(self.bracket_size)]
+
+    def to_list(self):
+        return [self.num_teams, self.num_groups, self.advance_per_group, self.players_per_team, self.legs,
+                self.swiss_rounds]
+
+    def __eq__(self, other):
+        return isinstance(other, TournamentFormat) and self.to_list() == other.to_list()
+
+    def __repr__(self):
+        return (f"TournamentFormat(num_teams={self.num_teams}, num_groups={self.num_groups}, "
+                f"advance_per_group={self.advance_per_group}, players_per_team={self.players_per_team}, "
+                f"legs={self.legs}, swiss_rounds={self.swiss_rounds})")
+
+
+DEFAULT_FORMAT = TournamentFormat()
 
 
 class Player:
     """Reprezentuje pojedynczego zawodnika ze statystykami."""
 
-    def __init__(self, first_name, last_name, team_name, attack=None, defense=None, aggression=None):
+    def __init__(self, first_name, last_name, team_name, attack=None, defense=None, aggression=None, rng=None):
         self.first_name = first_name
         self.last_name = last_name
         self.team_name = team_name
         self.name = f"{self.first_name} {self.last_name}"
 
         # Statystyki umiejętności: użyj podanych lub wylosuj, jeśli nie istnieją
-        self.attack = attack if attack is not None else random.randint(3, 10)
-        self.defense = defense if defense is not None else random.randint(3, 10)
-        self.aggression = aggression if aggression is not None else random.randint(1, 10)
+        # (generatorem turnieju, a bez niego globalnym random)
+        rng = rng if rng is not None else random
+        self.attack = attack if attack is not None else rng.randint(3, 10)
+        self.defense = defense if defense is not None else rng.randint(3, 10)
+        self.aggression = aggression if aggression is not None else rng.randint(1, 10)
 
         # Statystyki zdobyte podczas turnieju
         self.goals = 0
         self.yellow_cards = 0
         self.red_cards = 0
 
+        self.player_id = None  # Stały numer nadawany przez PlayerRegistry przy dodaniu do drużyny
+
     def to_dict(self):
         """Konwertuje obiekt gracza na słownik, idealny do zapisu w formacie JSON."""
         return {
@@ -42,13 +226,51 @@ class Player:
         return f"{self.name}"
 
 
+class PlayerRegistry:
+    """Nadaje zawodnikom stałe numery i wyszukuje zawodnika po numerze w O(1).
+
+    Numery nie są używane ponownie po usunięciu zawodnika, a zapis turnieju
+    je przechowuje, więc pozostają ważne po wczytaniu stanu.
+    """
+
+    def __init__(self):
+        self.players = {}
+        self.next_id = 0
+
+    def register(self, player, player_id=None):
+        if player_id is None:
+            player_id = self.next_id
+        player.player_id = player_id
+        self.players[player_id] = player
+        self.next_id = max(self.next_id, player_id + 1)
+
+    def unregister(self, player):
+        self.players.pop(player.player_id, None)
+
+    def get(self, player_id):
+        return self.players.get(player_id)
+
+    def __len__(self):
+        return len(self.players)
+
+
 class Team:
     """Reprezentuje drużynę składającą się z zawodników."""
 
-    def __init__(self, name, group=None):
+    def __init__(self, name, group=None, registry=None, rng=None):
         self.name = name
         self.group = group
         self.players = []  # Drużyna startuje z pustym składem
+        # Numery zawodników (wspólne dla całego turnieju) i indeks składu po nazwie bez rozróżniania wielkości liter
+        self.registry = registry if registry is not None else PlayerRegistry()
+        self._players_by_name = {}
+        self.rng = rng  # Generator losujący umiejętności nowych zawodników (None = globalny random)
+        self.store = None  # Opcjonalny kolumnowy magazyn statystyk (player_store.PlayerStore)
+        self.store_index = None
+        self.standings = None  # Tabela grup (standings.Standings), jeśli drużyna jest w grupie
+        # (aktywni zawodnicy, suma ataku, suma obrony, skumulowane wagi strzelców);
+        # unieważniane przez add_player, remove_player i register_red_card
+        self._strength_cache = None
 
         # Statystyki drużyny w fazie grupowej
         self.points = 0
@@ -63,36 +285,105 @@ class Team:
         # Sprawdzamy, czy imię i nazwisko nie są pustymi stringami
         if not first_name or not last_name:
             raise ValueError("Imię i nazwisko gracza nie mogą być puste.")
+        if self.store is not None:
+            raise ValueError("Nie można zmieniać składu drużyny powiązanej z magazynem statystyk.")
 
         # Tworzymy gracza, podając mu jego imię, nazwisko ORAZ nazwę drużyny (self.name)
-        player = Player(first_name, last_name, self.name)  # <--- POPRAWIONA LINIA
+        player = Player(first_name, last_name, self.name, rng=self.rng)  # <--- POPRAWIONA LINIA
+        self._attach_player(player)
+        self.invalidate_strength()
+        return player
+
+    def _attach_player(self, player, player_id=None):
+        """Dopisuje zawodnika do składu, nadaje mu numer i dodaje go do indeksu nazw."""
         self.players.append(player)
+        self.registry.register(player, player_id)
+        self._players_by_name.setdefault(player.name.casefold(), []).append(player)
 
+    def rebuild_player_index(self):
+        """Odbudowuje indeks nazw i rejestr numerów po podmianie obiektów w self.players."""
+        self._players_by_name = {}
+        for player in self.players:
+            self.registry.register(player, player.player_id)
+            self._players_by_name.setdefault(player.name.casefold(), []).append(player)
+
+    def find_player(self, player_name):
+        """Zwraca pierwszego zawodnika o podanym imieniu i nazwisku (bez rozróżniania wielkości liter)."""
+        players = self._players_by_name.get(player_name.casefold())
+        return players[0] if players else None
 
     def remove_player(self, player_name):
         """Usuwa zawodnika z drużyny na podstawie jego imienia i nazwiska."""
-        player_to_remove = next((p for p in self.players if p.name == player_name), None)
-        if player_to_remove:
-            self.players.remove(player_to_remove)
-        else:
+        player_to_remove = self.find_player(player_name)
+        if player_to_remove is None:
             raise ValueError("Nie znaleziono takiego zawodnika w drużynie.")
+        self._detach_player(player_to_remove)
+
+    def remove_player_by_id(self, player_id):
+        """Usuwa zawodnika o podanym numerze (jednoznacznie także przy powtarzających się nazwiskach)."""
+        player = self.registry.get(player_id)
+        if player is None or player not in self._players_by_name.get(player.name.casefold(), ()):
+            raise ValueError("Nie znaleziono takiego zawodnika w drużynie.")
+        self._detach_player(player)
+
+    def _detach_player(self, player):
+        if self.store is not None:
+            raise ValueError("Nie można zmieniać składu drużyny powiązanej z magazynem statystyk.")
+        self.players.remove(player)
+        self._players_by_name[player.name.casefold()].remove(player)
+        if not self._players_by_name[player.name.casefold()]:
+            del self._players_by_name[player.name.casefold()]
+        self.registry.unregister(player)
+        self.invalidate_strength()
+
+    def _strength(self):
+        """Zwraca (i w razie potrzeby przelicza) zapamiętaną siłę drużyny."""
+        if self._strength_cache is None:
+            active = [p for p in self.players if p.red_cards == 0]
+            cum_weights = list(accumulate(p.attack for p in active))
+            self._strength_cache = (active, cum_weights[-1] if cum_weights else 0,
+                                    sum(p.defense for p in active), cum_weights)
+        return self._strength_cache
+
+    def register_red_card(self, player):
+        """Zapisuje czerwoną kartkę zawodnika i unieważnia zapamiętaną siłę drużyny."""
+        player.red_cards += 1
+        self.invalidate_strength()
+
+    def invalidate_strength(self):
+        """Wymusza ponowne przeliczenie siły przy następnym odczycie."""
+        self._strength_cache = None
+
+    @property
+    def active_players(self):
+        """Zawodnicy bez czerwonej kartki."""
+        return self._strength()[0]
+
+    @property
+    def scorer_weights(self):
+        """Skumulowane wagi (atak) aktywnych zawodników do losowania strzelców."""
+        return self._strength()[3]
 
     @property
     def total_attack(self):
         """Oblicza sumę ataku wszystkich aktywnych (bez czerwonej kartki) zawodników."""
-        return sum(p.attack for p in self.players if p.red_cards == 0)
+        if self.store is not None:
+            return self.store.team_total("attack", self.store_index)
+        return self._strength()[1]
 
     @property
     def total_defense(self):
         """Oblicza sumę obrony wszystkich aktywnych zawodników."""
-        return sum(p.defense for p in self.players if p.red_cards == 0)
+        if self.store is not None:
+            return self.store.team_total("defense", self.store_index)
+        return self._strength()[2]
 
     @property
     def goal_difference(self):
         """Oblicza różnicę bramek."""
         return self.goals_for - self.goals_against
 
-    def add_match_result(self, goals_for, goals_against):
+    def add_match_result(self, goals_for, goals_against, opponent=None):
         """Aktualizuje statystyki drużyny po rozegranym meczu grupowym."""
         self.matches_played += 1
         self.goals_for += goals_for
@@ -105,6 +396,8 @@ class Team:
             self.points += 1
         else:
             self.losses += 1
+        if self.standings is not None:
+            self.standings.record_result(self, goals_for, goals_against, opponent)
 
     def get_all_players(self):
         return self.players
@@ -138,17 +431,25 @@ class Match:
         self.team2 = team2
         self.round = round_num
         self.phase = phase
+        self.index = 0  # Pozycja meczu w kolejce lub rundzie pucharowej (klucz strumienia losowego)
         self.score1 = None
         self.score2 = None
         self.winner = None
         self.events = []
+        self.event_sink = None  # Opcjonalny odbiorca zdarzeń (np. event_log.EventLogWriter)
+        self.leaderboards = None  # Rankingi zawodników (leaderboard.PlayerLeaderboards) aktualizowane zdarzeniami
 
     @property
     def is_played(self):
         return self.score1 is not None
 
     def add_event(self, minute, event_type, player, details=""):
-        self.events.append({"minute": minute, "type": event_type, "player": player, "details": details})
+        event = {"minute": minute, "type": event_type, "player": player, "details": details}
+        self.events.append(event)
+        if self.leaderboards is not None:
+            self.leaderboards.record_event(event)
+        if self.event_sink is not None:
+            self.event_sink.write(self, event)
 
     def __repr__(self):
         if self.is_played:
@@ -159,36 +460,48 @@ class Match:
 class Tournament:
     """Główna klasa zarządzająca całym stanem i logiką turnieju."""
 
-    def to_dict(self):
-        """Konwertuje obiekt drużyny i jej zawodników na słownik do zapisu w JSON."""
-        return {
-            "name": self.name,
-            "group": self.group,
-            "group_stage_stats": {
-                "points": self.points,
-                "matches_played": self.matches_played,
-                "wins": self.wins,
-                "draws": self.draws,
-                "losses": self.losses,
-                "goals_for": self.goals_for,
-                "goals_against": self.goals_against
-            },
-            "players": [player.to_dict() for player in self.players]
-        }
-
-    def __init__(self):
+    def __init__(self, tie_breakers=DEFAULT_TIE_BREAKERS, tournament_format=DEFAULT_FORMAT, rng_backend="stdlib",
+                 seed=None):
+        self.tie_breakers = tie_breakers  # Kryteria tabeli grup, np. dodatkowo "head_to_head"
+        self.format = tournament_format  # Liczba drużyn, grup i awansujących (TournamentFormat)
+        # Generator losowy (jeden z rng.RNG_BACKENDS) i ziarno; bez ziarna jest ono losowane z globalnego
+        # random przy każdym resecie, więc random.seed nadal daje powtarzalność
+        self.rng_backend = rng_backend
+        self.seed = seed
+        self.event_sink = None  # Odbiornik zdarzeń meczów; pozostaje podłączony po resecie
+        self.instrumentation = None  # Pomiary silnika (instrumentation.Instrumentation); pozostają po resecie
+        self.snapshot_writer = None  # Dziennik migawek (snapshots.SnapshotWriter); zamykany przy resecie
+        self.replay = None  # Historia kolejek do przewijania (replay.Replay); kończona przy resecie
         self.reset_to_setup()
 
     def reset_to_setup(self):
         """Resetuje turniej do pustego stanu konfiguracji, gotowego na nowe dane."""
+        self.stop_replay()
+        self.stop_snapshots()
         self.teams = []
         self.all_players = []
         self.groups = {}
         self.phase = "SETUP"  # Faza początkowa, w której użytkownik dodaje dane
         self.current_round = 0
         self.matches = []
+        self.matches_by_round = {}  # Numer kolejki grupowej lub szwajcarskiej -> mecze tej kolejki
+        # System szwajcarski: dotychczasowi rywale każdej drużyny i pauzujący w kolejnych rundach
+        self.swiss_opponents = {}
+        self.swiss_byes = []
         self.knockout_matches = {}
+        # Drużyny bieżącej rundy pucharowej w kolejności drabinki (None = wolny los)
+        # oraz odpowiadające im pary: Match albo drużyna przechodząca bez gry
+        self.knockout_entrants = []
+        self._knockout_pairs = []
         self.winner = None
+        self.player_store = None
+        self.standings = None
+        self.leaderboards = PlayerLeaderboards()  # Strzelcy i kartki; przebudowywane, gdy zmienia się all_players
+        self.player_registry = PlayerRegistry()  # Stałe numery zawodników wszystkich drużyn
+        self._team_index = {}  # Nazwa drużyny (casefold) -> Team
+        # Główny strumień losowy (skład, losowanie grup, terminarz); mecze mają własne strumienie
+        self.rng = make_rng(self.rng_backend, self.seed if self.seed is not None else random.getrandbits(64))
+        self.last_round_matches = []  # Mecze rozegrane w ostatnim wywołaniu simulate_next_round
 
     def add_team(self, name):
         if not name or not name.strip():
@@ -196,63 +509,274 @@ class Tournament:
         """Dodaje nową drużynę do turnieju (tylko w fazie SETUP)."""
         if self.phase != "SETUP":
             raise ValueError("Nie można dodawać drużyn po rozpoczęciu turnieju.")
-        if any(t.name.lower() == name.lower() for t in self.teams):
+        key = name.casefold()
+        if key in self._team_index:
             raise ValueError(f"Drużyna o nazwie '{name}' już istnieje.")
-        team = Team(name)
+        team = Team(name, registry=self.player_registry, rng=self.rng)
         self.teams.append(team)
+        self._team_index[key] = team
+        return team
+
+    def set_format(self, tournament_format):
+        """Zmienia format turnieju (tylko w fazie SETUP)."""
+        if self.phase != "SETUP":
+            raise ValueError("Nie można zmienić formatu po rozpoczęciu turnieju.")
+        self.format = tournament_format
 
     def remove_team(self, name):
         """Usuwa drużynę z turnieju (tylko w fazie SETUP)."""
         if self.phase != "SETUP":
             raise ValueError("Nie można usuwać drużyn po rozpoczęciu turnieju.")
-        team_to_remove = next((t for t in self.teams if t.name == name), None)
+        team_to_remove = self.find_team(name)
         if team_to_remove:
             self.teams.remove(team_to_remove)
+            del self._team_index[team_to_remove.name.casefold()]
+            for player in team_to_remove.players:
+                self.player_registry.unregister(player)
         else:
             raise ValueError("Nie znaleziono takiej drużyny.")
 
     def find_team(self, name):
-        """Wyszukuje i zwraca obiekt drużyny o podanej nazwie."""
-        for team in self.teams:
-            if team.name == name:
-                return team
-        return None
-
-    def save_to_file(self, filename):
-        """Zapisuje stan turnieju do pliku JSON."""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self.to_dict(), f, ensure_ascii=False, indent=4)
+        """Wyszukuje i zwraca obiekt drużyny o podanej nazwie (bez rozróżniania wielkości liter)."""
+        return self._team_index.get(name.casefold())
+
+    def find_player(self, player_id):
+        """Zwraca zawodnika o podanym stałym numerze lub None."""
+        return self.player_registry.get(player_id)
+
+    def to_dict(self, include_events=True):
+        """Zwraca pełny stan turnieju jako słownik złożony z list i liczb.
+
+        Drużyny, zawodnicy i mecze są zapisywane w zwartej postaci wierszy,
+        a odwołania między nimi jako indeksy (drużyna, zawodnik w drużynie).
+        Obejmuje też generator losowy turnieju (nazwa, ziarno i stan strumienia
+        głównego), więc wczytany turniej toczy się dalej dokładnie tak samo jak oryginał.
+        """
+        team_index = {id(team): i for i, team in enumerate(self.teams)}
+        player_ref = {id(p): [ti, pi] for ti, team in enumerate(self.teams) for pi, p in enumerate(team.players)}
+        knockout = [m for r in self.knockout_matches.values() for m in r]
+
+        def match_row(match):
+            winner = team_index[id(match.winner)] if match.winner is not None else -1
+            return [team_index[id(match.team1)], team_index[id(match.team2)], match.round, match.phase,
+                    match.score1, match.score2, winner]
+
+        state = {
+            "format_version": 1,
+            "phase": self.phase,
+            "current_round": self.current_round,
+            "winner": team_index[id(self.winner)] if self.winner is not None else -1,
+            "tie_breakers": list(self.tie_breakers),
+            "tournament_format": self.format.to_list(),
+            "rng": [self.rng_backend, self.rng.root_seed, self.rng.get_state()],
+            "teams": [
+                {
+                    "name": team.name,
+                    "group": team.group,
+                    "stats": [team.points, team.matches_played, team.wins, team.draws, team.losses,
+                              team.goals_for, team.goals_against],
+                    "players": [[p.first_name, p.last_name, p.attack, p.defense, p.aggression,
+                                 p.goals, p.yellow_cards, p.red_cards, p.player_id] for p in team.players],
+                }
+                for team in self.teams
+            ],
+            "all_players": [player_ref[id(p)] for p in self.all_players],
+            "next_player_id": self.player_registry.next_id,
+            "groups": {name: [team_index[id(t)] for t in teams] for name, teams in self.groups.items()},
+            "matches": [match_row(m) for m in self.matches],
+            "knockout_matches": {name: [match_row(m) for m in r] for name, r in self.knockout_matches.items()},
+            "knockout_entrants": [team_index[id(t)] if t is not None else -1 for t in self.knockout_entrants],
+            "swiss_byes": [team_index[id(t)] for t in self.swiss_byes],
+        }
+        if include_events:
+            # Zdarzenia meczów w kolejności: mecze grupowe, potem pucharowe
+            state["events"] = [
+                [[e["minute"], e["type"], *(player_ref[id(e["player"])] if e["player"] is not None else [-1, -1]),
+                  e["details"]] for e in match.events]
+                for match in self.matches + knockout
+            ]
+        return state
+
+    @classmethod
+    def from_dict(cls, state):
+        """Tworzy turniej ze słownika zwróconego przez to_dict."""
+        tournament = cls()
+        tournament.load_dict(state)
+        return tournament
+
+    def load_dict(self, state):
+        """Zastępuje bieżący stan turnieju stanem ze słownika (to_dict)."""
+        if state.get("format_version") != 1:
+            raise ValueError("Nieobsługiwana wersja zapisu turnieju.")
+        self.reset_to_setup()
+        self.tie_breakers = tuple(state["tie_breakers"])
+        self.format = TournamentFormat(*state["tournament_format"]) if "tournament_format" in state else DEFAULT_FORMAT
+        if "rng" in state:
+            self.rng_backend, root_seed, rng_state = state["rng"]
+            self.rng = make_rng(self.rng_backend, root_seed)
+        else:
+            # Zapis sprzed generatorów turnieju: stan globalnego random, a z niego ziarno strumieni meczów
+            self.rng_backend, rng_state = "stdlib", state["rng_state"]
+            self.rng = make_rng("stdlib", 0)
+            self.rng.set_state(rng_state)
+            self.rng = make_rng("stdlib", self.rng.getrandbits(64))
+        self.rng.set_state(rng_state)
+
+        for team_state in state["teams"]:
+            team = Team(team_state["name"], team_state["group"], registry=self.player_registry, rng=self.rng)
+            (team.points, team.matches_played, team.wins, team.draws, team.losses,
+             team.goals_for, team.goals_against) = team_state["stats"]
+            for row in team_state["players"]:
+                # Zapisy sprzed stałych numerów mają 8 pól; numer zostanie wtedy nadany od nowa
+                first_name, last_name, attack, defense, aggression, goals, yellows, reds = row[:8]
+                player = Player(first_name, last_name, team.name, attack, defense, aggression)
+                player.goals, player.yellow_cards, player.red_cards = goals, yellows, reds
+                team._attach_player(player, row[8] if len(row) > 8 else None)
+            self.teams.append(team)
+            self._team_index[team.name.casefold()] = team
+        # Numery usuniętych zawodników (także tych z końca numeracji) nie wracają po wczytaniu
+        self.player_registry.next_id = max(self.player_registry.next_id, state.get("next_player_id", 0))
+        teams = self.teams
+
+        self.all_players = [teams[ti].players[pi] for ti, pi in state["all_players"]]
+        self.leaderboards.rebuild(self.all_players)
+        self.groups = {name: [teams[i] for i in indices] for name, indices in state["groups"].items()}
+
+        def load_match(row):
+            team1, team2, round_num, phase, score1, score2, winner = row
+            match = self._new_match(teams[team1], teams[team2], round_num, phase)
+            match.score1, match.score2 = score1, score2
+            match.winner = teams[winner] if winner >= 0 else None
+            return match
+
+        self.matches = [load_match(row) for row in state["matches"]]
+        for match in self.matches:
+            self.matches_by_round.setdefault(match.round, []).append(match)
+        for round_matches in self.matches_by_round.values():
+            _number_matches(round_matches)
+        if self.format.is_swiss and state["phase"] != "SETUP":
+            self.swiss_opponents = {team: set() for team in teams}
+            for match in self.matches:
+                self.swiss_opponents[match.team1].add(match.team2)
+                self.swiss_opponents[match.team2].add(match.team1)
+            self.swiss_byes = [teams[i] for i in state.get("swiss_byes", [])]
+        self.knockout_matches = {name: _number_matches([load_match(row) for row in rows])
+                                 for name, rows in state["knockout_matches"].items()}
+        for match, events in zip(self.matches + [m for r in self.knockout_matches.values() for m in r],
+                                 state.get("events", [])):
+            for minute, event_type, ti, pi, details in events:
+                player = teams[ti].players[pi] if ti >= 0 else None
+                match.events.append({"minute": minute, "type": event_type, "player": player, "details": details})
+
+        if self.groups:
+            self.standings = Standings(self.groups, self.tie_breakers)
+            for match in self.matches:
+                if match.is_played:
+                    self.standings.record_result(match.team1, match.score1, match.score2, match.team2)
+                    self.standings.record_result(match.team2, match.score2, match.score1, match.team1)
+
+        self.phase = state["phase"]
+        self.current_round = state["current_round"]
+        if self.phase == "KNOCKOUT_STAGE":
+            self._restore_knockout_pairs(state.get("knockout_entrants", []))
+        self.winner = teams[state["winner"]] if state["winner"] >= 0 else None
+
+    def _restore_knockout_pairs(self, entrant_indices):
+        """Odtwarza pary bieżącej rundy pucharowej z zapisanych miejsc drabinki."""
+        matches = self.knockout_matches[self.format.knockout_round_names()[self.current_round]]
+        if entrant_indices:
+            self.knockout_entrants = [self.teams[i] if i >= 0 else None for i in entrant_indices]
+        else:  # Zapis bez miejsc drabinki (sprzed wolnych losów): runda to same mecze
+            self.knockout_entrants = [team for m in matches for team in (m.team1, m.team2)]
+        remaining = iter(matches)
+        self._knockout_pairs = []
+        for i in range(0, len(self.knockout_entrants), 2):
+            team1, team2 = self.knockout_entrants[i], self.knockout_entrants[i + 1]
+            if team1 is None or team2 is None:
+                self._knockout_pairs.append(team1 if team2 is None else team2)
+            else:
+                self._knockout_pairs.append(next(remaining))
+
+    @timed("io.save")
+    def save_to_file(self, filename, binary=None, include_events=True):
+        """Zapisuje stan turnieju do pliku JSON lub (binary=True) w zwartym formacie binarnym.
+
+        Przy binary=None format wynika z rozszerzenia: ".json" oznacza JSON.
+        """
+        if binary is None:
+            binary = not str(filename).lower().endswith(".json")
+        state = self.to_dict(include_events)
+        if binary:
+            write_binary_state(filename, state)
+        else:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False, separators=(",", ":"))
+
+    @timed("io.load")
+    def load_from_file(self, filename, include_events=True):
+        """Wczytuje stan turnieju zapisany przez save_to_file (format rozpoznawany po nagłówku).
+
+        Przy include_events=False wczytywany jest sam skład, wyniki i tabele,
+        bez historii zdarzeń meczów.
+        """
+        if is_binary_state(filename):
+            state = read_binary_state(filename, include_events)
+        else:
+            with open(filename, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if not include_events:
+                state.pop("events", None)
+        self.load_dict(state)
 
+    @timed("setup.generate")
     def generate_random_tournament(self):
         """Automatycznie generuje pełny turniej z losowymi drużynami i graczami."""
         self.reset_to_setup()
-        selected_team_names = random.sample(team_names, 16)
+        selected_team_names = self._random_team_names(self.format.num_teams)
         for name in selected_team_names:
-            self.add_team(name)
-            team = next(t for t in self.teams if t.name == name)
+            team = self.add_team(name)
             players_added = 0
-            while players_added < 11:
-                team.add_player(random.choice(first_names), random.choice(last_names))
+            while players_added < self.format.players_per_team:
+                team.add_player(self.rng.choice(first_names), self.rng.choice(last_names))
                 players_added += 1
         self.start_tournament()
 
+    def _random_team_names(self, count):
+        """Losuje count różnych nazw; gdy brakuje nazw w data.team_names, dokłada numery ("Lech Poznań 2")."""
+        if count <= len(team_names):
+            return self.rng.sample(team_names, count)
+        names = []
+        for i in range(count):
+            base = team_names[i % len(team_names)]
+            names.append(base if i < len(team_names) else f"{base} {i // len(team_names) + 1}")
+        self.rng.shuffle(names)
+        return names
+
+    @timed("setup.start_tournament")
     def start_tournament(self):
         """Waliduje stan turnieju i rozpoczyna fazę grupową."""
-        if len(self.teams) != 16:
-            raise ValueError("Turniej musi mieć dokładnie 16 drużyn, aby go rozpocząć.")
+        fmt = self.format
+        if len(self.teams) != fmt.num_teams:
+            raise ValueError(f"Turniej musi mieć dokładnie {fmt.num_teams} drużyn, aby go rozpocząć.")
         for team in self.teams:
-            if len(team.players) != 11:
-                raise ValueError(f"Drużyna '{team.name}' musi mieć dokładnie 11 zawodników.")
+            if len(team.players) != fmt.players_per_team:
+                raise ValueError(f"Drużyna '{team.name}' musi mieć dokładnie {fmt.players_per_team} zawodników.")
 
         self.all_players = [p for t in self.teams for p in t.players]
-        random.shuffle(self.teams)
-        self.groups = {
-            "Grupa A": self.teams[0:4], "Grupa B": self.teams[4:8],
-            "Grupa C": self.teams[8:12], "Grupa D": self.teams[12:16],
-        }
+        self.leaderboards.rebuild(self.all_players)
+        self.rng.shuffle(self.teams)
+        if fmt.is_swiss:
+            self._start_swiss_stage()
+            return
+        self.groups = {}
+        start = 0
+        for name, size in zip(fmt.group_names(), fmt.group_sizes()):
+            self.groups[name] = self.teams[start:start + size]
+            start += size
         for name, teams_in_group in self.groups.items():
             for team in teams_in_group:
                 team.group = name
+        self.standings = Standings(self.groups, self.tie_breakers)
 
         self.phase = "GROUP_STAGE"
         self.current_round = 1
@@ -261,64 +785,290 @@ class Tournament:
     @property
     def top_scorer(self):
         """Zwraca listę graczy z największą liczbą goli w turnieju."""
-        if not self.all_players: return []
-        max_goals = max(p.goals for p in self.all_players)
-        if max_goals == 0: return []
-        return [p for p in self.all_players if p.goals == max_goals]
+        return self.leaderboards.goals.leaders()
 
     def export_teams_to_json(self, filename="teams_data.json"):
-        """Eksportuje dane wszystkich drużyn i ich zawodników do pliku JSON."""
-        data = [team.to_dict() for team in self.teams]
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        """Eksportuje dane wszystkich drużyn i ich zawodników do pliku JSON (zwarty zapis, drużyna po drużynie).
+
+        Inne tabele i formaty (JSONL, CSV, .npz, gzip) obsługuje exporters.export_tournament.
+        """
+        from exporters import write_teams_json
+        write_teams_json(self.teams, filename)
         return f"Dane drużyn zostały pomyślnie wyeksportowane do pliku '{filename}'"
 
     def simulate_next_round(self):
         """Symuluje wszystkie mecze w bieżącej kolejce lub rundzie pucharowej."""
+        instrumentation = self.instrumentation
+        in_progress = self.phase != "SETUP" and self.winner is None
+        if instrumentation is None:
+            message = self._simulate_next_round()
+        else:
+            with instrumentation.timer(ROUND_TIMERS.get(self.phase, "round.other")):
+                message = self._simulate_next_round()
+        if in_progress:
+            if self.snapshot_writer is not None:
+                self._write_snapshot()
+            if self.replay is not None:
+                self.replay.record_round()
+        return message
+
+    @timed("io.snapshot")
+    def _write_snapshot(self):
+        self.snapshot_writer.write_round(self)
+
+    def _simulate_next_round(self):
         if self.winner:
             return "Turniej zakończony."
 
+        if self.phase == "SWISS_STAGE":
+            matches_to_play = [m for m in self.matches_by_round[self.current_round] if not m.is_played]
+            self._play_matches(matches_to_play)
+            self.last_round_matches = matches_to_play
+
+            if self.current_round >= self.num_group_rounds:
+                self.phase = "KNOCKOUT_STAGE"
+                self.current_round = 0
+                self._create_knockout_bracket()
+                first_round = self.format.knockout_round_names()[0]
+                return f"Faza szwajcarska zakończona. Czas na {knockout_round_label(first_round)}!"
+            self.current_round += 1
+            self._pair_swiss_round()
+            return f"Zakończono rundę {self.current_round - 1}."
+
         if self.phase == "GROUP_STAGE":
-            matches_to_play = [m for m in self.matches if m.round == self.current_round and not m.is_played]
-            for match in matches_to_play:
-                self._simulate_match_result(match)
+            matches_to_play = [m for m in self.matches_by_round.get(self.current_round, []) if not m.is_played]
+            self._play_matches(matches_to_play)
+            self.last_round_matches = matches_to_play
 
-            if self.current_round == 6:
+            if self.current_round >= self.num_group_rounds:
                 self.phase = "KNOCKOUT_STAGE"
                 self.current_round = 0
                 self._create_knockout_bracket()
-                return "Faza grupowa zakończona. Czas na ćwierćfinały!"
+                first_round = self.format.knockout_round_names()[0]
+                return f"Faza grupowa zakończona. Czas na {knockout_round_label(first_round)}!"
             else:
                 self.current_round += 1
                 return f"Zakończono kolejkę {self.current_round - 1}."
 
         elif self.phase == "KNOCKOUT_STAGE":
-            round_names = ["Quarter-finals", "Semi-finals", "Final"]
+            round_names = self.format.knockout_round_names()
             current_knockout_round = round_names[self.current_round]
             matches_to_play = self.knockout_matches[current_knockout_round]
 
-            for match in matches_to_play:
-                self._simulate_match_result(match)
+            self._play_matches(matches_to_play)
+            self.last_round_matches = matches_to_play
 
-            winners = [m.winner for m in matches_to_play]
+            # Zwycięzcy meczów i drużyny z wolnym losem, w kolejności drabinki
+            winners = [pair.winner if isinstance(pair, Match) else pair for pair in self._knockout_pairs]
 
-            if current_knockout_round == "Final":
+            if len(winners) == 1:
                 self.winner = winners[0]
                 return f"Turniej wygrywa {self.winner.name}!"
 
             next_knockout_round_name = round_names[self.current_round + 1]
-            self.knockout_matches[next_knockout_round_name] = []
-
-            for i in range(0, len(winners), 2):
-                new_match = Match(winners[i], winners[i + 1], self.current_round + 2, "KNOCKOUT")
-                self.knockout_matches[next_knockout_round_name].append(new_match)
-
+            self._start_knockout_round(winners, self.current_round + 2)
             self.current_round += 1
             return f"Zakończono {current_knockout_round}. Czas na {next_knockout_round_name}!"
 
+    def attach_event_sink(self, sink):
+        """Przekierowuje wszystkie nowe zdarzenia meczów do sink.write(match, event)."""
+        self.event_sink = sink
+        for match in self.matches + [m for r in self.knockout_matches.values() for m in r]:
+            match.event_sink = sink
+
+    def start_snapshots(self, path, checkpoint_every=DEFAULT_CHECKPOINT_EVERY):
+        """Zaczyna dziennik migawek: obraz bazowy teraz, a po każdej kolejce tylko zmiany.
+
+        Poprzedni dziennik jest zamykany; zwraca obiekt SnapshotWriter.
+        """
+        self.stop_snapshots()
+        self.snapshot_writer = SnapshotWriter(path, self, checkpoint_every)
+        return self.snapshot_writer
+
+    def stop_snapshots(self):
+        """Zamyka dziennik migawek (jeśli był otwarty)."""
+        if self.snapshot_writer is not None:
+            self.snapshot_writer.close()
+            self.snapshot_writer = None
+
+    def load_snapshot(self, path, round_index=None):
+        """Wczytuje stan z dziennika migawek po round_index kolejkach (None = ostatni zapis); zwraca numer."""
+        state, reached = read_snapshot(path, round_index)
+        self.load_dict(state)
+        return reached
+
+    def start_replay(self, checkpoint_every=DEFAULT_REPLAY_CHECKPOINT_EVERY):
+        """Zaczyna historię kolejek od bieżącego stanu (przewijanie: replay.seek, step_back, step_forward)."""
+        self.replay = Replay(self, checkpoint_every)
+        return self.replay
+
+    def stop_replay(self):
+        """Kończy historię kolejek; turniej zostaje w bieżącym stanie (Replay.close)."""
+        if self.replay is not None:
+            self.replay.close()
+            self.replay = None
+
+    def enable_instrumentation(self):
+        """Włącza pomiar czasów etapów i liczników silnika; zwraca obiekt Instrumentation."""
+        if self.instrumentation is None:
+            self.instrumentation = Instrumentation()
+        return self.instrumentation
+
+    def disable_instrumentation(self):
+        """Wyłącza pomiar i zwraca zebrane dane (None, jeśli pomiar nie był włączony)."""
+        instrumentation, self.instrumentation = self.instrumentation, None
+        return instrumentation
+
+    @staticmethod
+    def profile(kind="cprofile"):
+        """Kontekst profilujący wywołania w bloku: with tournament.profile("tracemalloc") as capture: ..."""
+        return ProfileCapture(kind)
+
+    def detach_event_sink(self):
+        """Odłącza odbiornik zdarzeń i zwraca go (bez zamykania)."""
+        sink = self.event_sink
+        self.attach_event_sink(None)
+        return sink
+
+    def _new_match(self, team1, team2, round_num, phase):
+        match = Match(team1, team2, round_num, phase)
+        match.event_sink = self.event_sink
+        match.leaderboards = self.leaderboards
+        return match
+
+    def enable_player_store(self):
+        """Przenosi statystyki zawodników do kolumnowego magazynu NumPy (player_store).
+
+        Obiekty w team.players i all_players stają się widokami na tablice magazynu,
+        więc GUI i raporty działają bez zmian, a symulacja zdarzeń liczy siłę,
+        strzelców i kartki operacjami na tablicach. Wymaga rozpoczętego turnieju.
+        """
+        if self.phase == "SETUP":
+            raise ValueError("Magazyn statystyk można włączyć dopiero po rozpoczęciu turnieju.")
+        if self.player_store is not None:
+            return self.player_store
+        from player_store import PlayerStore
+
+        old_players = [p for t in self.teams for p in t.players]
+        self.player_store = PlayerStore.from_teams(self.teams, seed=self.rng.getrandbits(64))
+        view_of = {id(old): view for old, view in zip(old_players, self.player_store.players)}
+        self.all_players = [view_of[id(p)] for p in self.all_players]
+        self.leaderboards.rebuild(self.all_players)
+        for match in self.matches + [m for r in self.knockout_matches.values() for m in r]:
+            for event in match.events:
+                if event["player"] is not None:
+                    event["player"] = view_of[id(event["player"])]
+        return self.player_store
+
+    def run_monte_carlo(self, n_runs, seed=None, workers=1, rng_backend="stdlib", store_path=None):
+        """Symuluje cały turniej n_runs razy na kopii składów, nie zmieniając bieżącego stanu.
+
+        Zwraca obiekt MonteCarloResult z rozkładami dla drużyn i zawodników.
+        Przy workers > 1 paczki przebiegów liczone są w osobnych procesach.
+        store_path dopisuje każdy przebieg do magazynu wyników (results_store).
+        """
+        from monte_carlo import run_monte_carlo
+        return run_monte_carlo(self, n_runs, seed, workers, rng_backend, store_path)
+
+    def match_odds(self, match):
+        """Dokładne prawdopodobieństwa wyniku meczu (odds.MatchOdds) dla obecnych składów drużyn."""
+        from odds import match_odds
+        return match_odds(match.team1.total_attack, match.team2.total_attack)
+
+    def expected_table(self, table_name):
+        """Oczekiwana tabela grupy po nierozegranych meczach terminarza (bez symulacji)."""
+        from odds import expected_table
+        return expected_table(self, table_name)
+
+    def knockout_odds(self):
+        """Dokładne szanse drużyn na każdą rundę pucharową i tytuł z bieżącej drabinki (bez symulacji).
+
+        Przed fazą pucharową zgłasza ValueError, bo drabinka nie jest jeszcze znana.
+        """
+        from odds import knockout_odds
+        return knockout_odds(self)
+
+    def remaining_rounds(self):
+        """Liczba wywołań simulate_next_round potrzebnych do wyłonienia zwycięzcy."""
+        if self.winner or self.phase == "SETUP":
+            return 0
+        knockout_rounds = len(self.format.knockout_round_names())
+        if self.phase in ("GROUP_STAGE", "SWISS_STAGE"):
+            return self.num_group_rounds - self.current_round + 1 + knockout_rounds
+        return knockout_rounds - self.current_round
+
+    @property
+    def num_group_rounds(self):
+        """Liczba kolejek fazy grupowej (lub rund szwajcarskich) w bieżącym formacie."""
+        return self.format.num_group_rounds
+
+    def table_names(self):
+        """Nazwy tabel fazy przed drabinką: grupy albo jedna tabela systemu szwajcarskiego."""
+        if self.format.is_swiss and self.phase != "SETUP":
+            return [SWISS_TABLE_NAME]
+        return list(self.groups)
+
+    def ranking(self, table_name):
+        """Kolejność drużyn w tabeli grupy lub tabeli systemu szwajcarskiego."""
+        if table_name == SWISS_TABLE_NAME and self.format.is_swiss:
+            return self.swiss_ranking()
+        return self.standings.ranking(table_name)
+
+    def swiss_ranking(self):
+        """Klasyfikacja systemu szwajcarskiego: punkty, Buchholz (suma punktów rywali), bilans, gole."""
+        buchholz = {team: sum(o.points for o in self.swiss_opponents.get(team, ())) for team in self.teams}
+        return sorted(self.teams, key=lambda t: (t.points, buchholz[t], t.goal_difference, t.goals_for),
+                      reverse=True)
+
+    @property
+    def current_round_name(self):
+        """Nazwa bieżącej rundy pucharowej (None poza fazą pucharową)."""
+        if self.phase != "KNOCKOUT_STAGE":
+            return None
+        return self.format.knockout_round_names()[self.current_round]
+
+    def _play_matches(self, matches):
+        """Rozgrywa mecze jednej kolejki: wsadowo przy magazynie kolumnowym, inaczej po kolei."""
+        if self.player_store is not None:
+            from round_simulator import simulate_round
+            simulate_round(self, matches)
+        else:
+            for match in matches:
+                self._simulate_match_result(match)
+        if self.instrumentation is not None:
+            self.instrumentation.count("matches", len(matches))
+            for match in matches:
+                for event in match.events:
+                    self.instrumentation.count(f"events.{event['type']}")
+
+    def match_rng(self, match):
+        """Świeży strumień losowy meczu wyprowadzony z (ziarno turnieju, faza, kolejka, numer meczu).
+
+        Strumień nie zależy od kolejności rozgrywania meczów ani od innych
+        losowań, więc każdy mecz można powtórzyć lub przesymulować osobno.
+        """
+        rng = self.rng.spawn(MATCH_STREAM, PHASE_CODES[match.phase], match.round, match.index)
+        if self.instrumentation is not None:
+            self.instrumentation.count("rng.streams")
+            return CountingRandom(rng, self.instrumentation)
+        return rng
+
+    def round_rng(self, matches):
+        """Strumień losowy dla wsadowej symulacji całej kolejki (round_simulator)."""
+        match = matches[0]
+        if self.instrumentation is not None:
+            self.instrumentation.count("rng.streams")
+        return self.rng.spawn(ROUND_STREAM, PHASE_CODES[match.phase], match.round)
+
+    @timed("schedule.group_stage")
     def _schedule_group_stage(self):
-        """Tworzy sprawiedliwy terminarz dla fazy grupowej (mecz i rewanż)."""
+        """Tworzy sprawiedliwy terminarz dla fazy grupowej (mecz i rewanż przy legs=2).
+
+        Metoda kołowa: jedna kolejka to jeden obrót listy drużyn, więc koszt
+        kolejki jest liniowy względem wielkości grupy.
+        """
         self.matches = []
+        self.matches_by_round = {}
         for group_teams in self.groups.values():
 
             teams = list(group_teams)
@@ -337,123 +1087,199 @@ class Tournament:
                     team2 = teams[num_teams - 1 - i]
 
                     if team1 is not None and team2 is not None:
-                        current_round_matches.append(Match(team1, team2, round_num + 1, "GROUP"))
+                        current_round_matches.append(self._new_match(team1, team2, round_num + 1, "GROUP"))
 
                 first_leg_rounds.append(current_round_matches)
 
                 teams.insert(1, teams.pop())
 
             second_leg_rounds = []
-            for i, round_matches in enumerate(first_leg_rounds):
-                current_round_matches = []
-                for match in round_matches:
-                    current_round_matches.append(Match(match.team2, match.team1, num_rounds + i + 1, "GROUP"))
-                second_leg_rounds.append(current_round_matches)
+            if self.format.legs == 2:
+                for i, round_matches in enumerate(first_leg_rounds):
+                    current_round_matches = []
+                    for match in round_matches:
+                        current_round_matches.append(self._new_match(match.team2, match.team1, num_rounds + i + 1, "GROUP"))
+                    second_leg_rounds.append(current_round_matches)
 
             all_rounds = first_leg_rounds + second_leg_rounds
 
-            random.shuffle(all_rounds)
+            self.rng.shuffle(all_rounds)
 
             round_counter = 1
             for round_matches in all_rounds:
                 for match in round_matches:
                     match.round = round_counter
                     self.matches.append(match)
+                self.matches_by_round.setdefault(round_counter, []).extend(round_matches)
                 round_counter += 1
+        for round_matches in self.matches_by_round.values():
+            _number_matches(round_matches)
+
+    def _start_swiss_stage(self):
+        """Rozpoczyna fazę szwajcarską; pary kolejnych rund powstają po wynikach poprzednich."""
+        for team in self.teams:
+            team.group = SWISS_TABLE_NAME
+        self.swiss_opponents = {team: set() for team in self.teams}
+        self.swiss_byes = []
+        self.phase = "SWISS_STAGE"
+        self.current_round = 1
+        self._pair_swiss_round()
+
+    @timed("schedule.swiss_pairing")
+    def _pair_swiss_round(self):
+        """Kojarzy pary bieżącej rundy szwajcarskiej (bez powtórek); pauzujący dostaje BYE_POINTS."""
+        pairs, bye = swiss_pairings(self.swiss_ranking(), self.swiss_opponents, set(self.swiss_byes))
+        if bye is not None:
+            bye.points += BYE_POINTS
+            self.swiss_byes.append(bye)
+        round_matches = []
+        for team1, team2 in pairs:
+            self.swiss_opponents[team1].add(team2)
+            self.swiss_opponents[team2].add(team1)
+            round_matches.append(self._new_match(team1, team2, self.current_round, "SWISS"))
+        self.matches.extend(_number_matches(round_matches))
+        self.matches_by_round[self.current_round] = round_matches
 
     def _simulate_match_result(self, match):
         """Symuluje wynik jednego meczu na podstawie statystyk i losowości."""
+        rng = self.match_rng(match)
+        self._draw_score(match, rng)
+        self._simulate_events(match, rng)
+        self._apply_match_result(match, rng)
+
+    @timed("match.score_draw")
+    def _draw_score(self, match, rng):
+        """Losuje wynik meczu z rozkładu normalnego wokół siły ataku drużyn."""
         strength1 = match.team1.total_attack
         strength2 = match.team2.total_attack
 
-        score1 = max(0, int(random.gauss(strength1 / 55, 1.5)))
-        score2 = max(0, int(random.gauss(strength2 / 55, 1.5)))
+        match.score1 = max(0, int(rng.gauss(strength1 / GOAL_SCALE, GOAL_SIGMA)))
+        match.score2 = max(0, int(rng.gauss(strength2 / GOAL_SCALE, GOAL_SIGMA)))
 
-        match.score1 = score1
-        match.score2 = score2
-        self._simulate_events(match)
+    @timed("match.standings")
+    def _apply_match_result(self, match, rng=None):
+        """Przenosi wynik rozegranego meczu do tabeli (grupa) lub wyłania zwycięzcę (puchar).
 
-        if match.phase == "GROUP":
-            match.team1.add_match_result(score1, score2)
-            match.team2.add_match_result(score2, score1)
+        Rzuty karne losuje rng, a bez niego świeży strumień meczu.
+        """
+        score1, score2 = match.score1, match.score2
+        if match.phase in ("GROUP", "SWISS"):
+            match.team1.add_match_result(score1, score2, match.team2)
+            match.team2.add_match_result(score2, score1, match.team1)
         else:  # KNOCKOUT
             if score1 > score2:
                 match.winner = match.team1
             elif score2 > score1:
                 match.winner = match.team2
             else:
-                match.winner = random.choice([match.team1, match.team2])
+                match.winner = (rng or self.match_rng(match)).choice([match.team1, match.team2])
                 match.add_event(91, "INFO", None,
                                 f"Mecz rozstrzygnięty w rzutach karnych. Wygrywa: {match.winner.name}")
 
-    def _simulate_events(self, match):
+    @timed("match.events")
+    def _simulate_events(self, match, rng):
         """Symuluje kto strzelił gole i kto dostał kartki w meczu."""
-        # Przypisanie goli dla drużyny 1
-        for _ in range(match.score1):
-            scorers_pool = [p for p in match.team1.players if p.red_cards == 0]
-            if not scorers_pool: continue
-            scorer = random.choices(scorers_pool, weights=[p.attack for p in scorers_pool], k=1)[0]
-            scorer.goals += 1
-            match.add_event(random.randint(1, 90), "GOAL", scorer)
+        if self.player_store is not None:
+            self._simulate_events_columnar(match, rng.generator)
+            return
 
-        for _ in range(match.score2):
-            scorers_pool = [p for p in match.team2.players if p.red_cards == 0]
+        # Przypisanie goli: pula i wagi strzelców są zapamiętane w drużynie
+        for team, score in ((match.team1, match.score1), (match.team2, match.score2)):
+            scorers_pool = team.active_players
             if not scorers_pool: continue
-            scorer = random.choices(scorers_pool, weights=[p.attack for p in scorers_pool], k=1)[0]
-            scorer.goals += 1
-            match.add_event(random.randint(1, 90), "GOAL", scorer)
+            cum_weights = team.scorer_weights
+            for _ in range(score):
+                scorer = rng.choices(scorers_pool, cum_weights=cum_weights, k=1)[0]
+                scorer.goals += 1
+                match.add_event(rng.randint(1, 90), "GOAL", scorer)
 
         # Przypisanie kartek
-        all_players_in_match = match.team1.players + match.team2.players
-        for player in all_players_in_match:
-            # Szansa na żółtą kartkę rośnie z agresją
-            if random.randint(1, 100) < player.aggression * 2:
-                if player.yellow_cards % 2 == 1:
-                    player.red_cards += 1
-                    match.add_event(random.randint(1, 90), "RED_CARD", player, "Druga żółta")
-                else:
-                    player.yellow_cards += 1
-                    match.add_event(random.randint(1, 90), "YELLOW_CARD", player)
+        for team in (match.team1, match.team2):
+            for player in team.players:
+                # Szansa na żółtą kartkę rośnie z agresją
+                if rng.randint(1, 100) < player.aggression * 2:
+                    if player.yellow_cards % 2 == 1:
+                        team.register_red_card(player)
+                        match.add_event(rng.randint(1, 90), "RED_CARD", player, "Druga żółta")
+                    else:
+                        player.yellow_cards += 1
+                        match.add_event(rng.randint(1, 90), "YELLOW_CARD", player)
+
+    def _simulate_events_columnar(self, match, generator):
+        """Wariant _simulate_events operujący na tablicach PlayerStore (generator: numpy.random.Generator)."""
+        store = self.player_store
+        for team, score in ((match.team1, match.score1), (match.team2, match.score2)):
+            scorer_ids = store.pick_scorers(team.store_index, score, generator)
+            minutes = store.draw_minutes(len(scorer_ids), generator)
+            for player_id, minute in zip(scorer_ids, minutes):
+                scorer = store.players[player_id]
+                scorer.goals += 1
+                match.add_event(int(minute), "GOAL", scorer)
+
+        carded_ids = store.draw_cards(store.team_ids(match.team1.store_index, match.team2.store_index), generator)
+        minutes = store.draw_minutes(len(carded_ids), generator)
+        for player_id, minute in zip(carded_ids, minutes):
+            player = store.players[player_id]
+            if player.yellow_cards % 2 == 1:
+                team = match.team1 if player.team_name == match.team1.name else match.team2
+                team.register_red_card(player)
+                match.add_event(int(minute), "RED_CARD", player, "Druga żółta")
+            else:
+                player.yellow_cards += 1
+                match.add_event(int(minute), "YELLOW_CARD", player)
 
+    @timed("bracket.create")
     def _create_knockout_bracket(self):
-        """Tworzy drabinkę pucharową z 2 najlepszych drużyn z każdej grupy."""
-        qualifiers = {}
-        for name, teams_in_group in self.groups.items():
-            sorted_teams = sorted(teams_in_group, key=lambda t: (t.points, t.goal_difference, t.goals_for),
-                                  reverse=True)
-            qualifiers[name] = sorted_teams[:2]
+        """Tworzy pierwszą rundę drabinki z najlepszych drużyn każdej grupy.
+
+        Format domyślny gra stałymi parami ćwierćfinałów (A1 vs B2, C1 vs D2, itd.),
+        pozostałe - klasycznym rozstawieniem z wolnymi losami (TournamentFormat.seed_bracket).
+        Kolejne rundy powstają dopiero po rozegraniu poprzednich.
+        """
+        rankings = [self.ranking(name) for name in self.table_names()]
+        entrants = self.format.seed_bracket(
+            rankings, key=lambda t: (t.points, t.goal_difference, t.goals_for))
+        self._start_knockout_round(entrants, 1)
+
+    @timed("bracket.round")
+    def _start_knockout_round(self, entrants, round_num):
+        """Paruje kolejne miejsca drabinki; drużyna bez rywala przechodzi dalej bez gry."""
+        round_name = self.format.knockout_round_names()[round_num - 1]
+        pairs = []
+        matches = []
+        for i in range(0, len(entrants), 2):
+            team1, team2 = entrants[i], entrants[i + 1]
+            if team1 is None or team2 is None:
+                pairs.append(team1 if team2 is None else team2)
+            else:
+                match = self._new_match(team1, team2, round_num, "KNOCKOUT")
+                pairs.append(match)
+                matches.append(match)
+        self.knockout_entrants = list(entrants)
+        self._knockout_pairs = pairs
+        self.knockout_matches[round_name] = _number_matches(matches)
 
-        # Standardowe pary ćwierćfinałowe (A1 vs B2, C1 vs D2, itd.)
-        qf_matches = [
-            Match(qualifiers["Grupa A"][0], qualifiers["Grupa B"][1], 1, "KNOCKOUT"),
-            Match(qualifiers["Grupa C"][0], qualifiers["Grupa D"][1], 1, "KNOCKOUT"),
-            Match(qualifiers["Grupa B"][0], qualifiers["Grupa A"][1], 1, "KNOCKOUT"),
-            Match(qualifiers["Grupa D"][0], qualifiers["Grupa C"][1], 1, "KNOCKOUT"),
-        ]
-        self.knockout_matches["Quarter-finals"] = qf_matches
+
+def _number_matches(matches):
+    """Nadaje meczom kolejki (lub rundy pucharowej) numery 0, 1, ... i zwraca tę listę."""
+    for index, match in enumerate(matches):
+        match.index = index
+    return matches
 
 
 class PlayerStatsReporter(Player):
-    def __init__(self, all_players_list):
+    def __init__(self, all_players_list, leaderboards=None):
 
         super().__init__(first_name="Stat-Bot", last_name="Reporter", team_name="System")
 
         self.players_to_report_on = all_players_list
+        # Rankingi turnieju (Tournament.leaderboards); bez nich budowane jednorazowo z listy
+        self.leaderboards = leaderboards if leaderboards is not None else PlayerLeaderboards(all_players_list)
 
 
     def get_top_scorers_ranking(self, top_n=5):
 
-        sorted_by_goals = sorted(self.players_to_report_on, key=lambda p: p.goals, reverse=True)
-
-        ranking = []
-        for i, player in enumerate(sorted_by_goals[:top_n]):
-            if player.goals > 0:
-                ranking_entry = (i + 1, player)
-                ranking.append(ranking_entry)
-            else:
-
-                break
-        return ranking
+        return [(i + 1, player) for i, player in enumerate(self.leaderboards.goals.top(top_n))]
 
     def display_top_scorers(self, top_n=5):
         print(f"\n--- NAJLEPSI STRZELCY (TOP {top_n}) ---")
@@ -470,22 +1296,13 @@ class PlayerStatsReporter(Player):
     def display_card_offenders(self):
         print("\n--- ZAWODNICY Z NAJWIĘKSZĄ LICZBĄ KARTEK ---")
 
-        offenders = list(filter(
-            lambda p: p.yellow_cards > 0 or p.red_cards > 0,
-            self.players_to_report_on
-        ))
-
-        sorted_by_cards = sorted(
-            offenders,
-            key=lambda p: (p.red_cards * 3 + p.yellow_cards),
-            reverse=True
-        )
+        sorted_by_cards = self.leaderboards.card_points.top(5)
 
         if not sorted_by_cards:
             print("Żaden zawodnik nie otrzymał kartki.")
             return
 
-        for player in sorted_by_cards[:5]:
+        for player in sorted_by_cards:
             print(f"- {player.name}: {player.yellow_cards} żółtych, {player.red_cards} czerwonych")
 
     def display_full_stats_table(self):
@@ -0,0 +1,532 @@
+import math
+import os
+import random
+from bisect import bisect_right
+from itertools import accumulate
+
+from models import GOAL_SCALE, GOAL_SIGMA
+from rng import make_rng
+from swiss import BYE_POINTS, swiss_pairings
+
+# Liczba przebiegów w paczce z własnym strumieniem losowym (jednostka pracy procesu)
+BATCH_SIZE = 500
+
+# Rozmiar paczki zawodników, dla której tablicujemy rozkład wszystkich kombinacji kartek
+CARD_CHUNK_SIZE = 6
+
+_SQRT2 = math.sqrt(2)
+_score_cdf_cache = {}
+
+
+def score_cdf(total_attack):
+    """Dystrybuanta liczby goli max(0, int(N(total_attack / GOAL_SCALE, GOAL_SIGMA))).
+
+    int() obcina w stronę zera, więc 0 goli odpowiada wartościom poniżej 1,
+    a k >= 1 goli przedziałowi [k, k + 1). Ostatni element listy to zawsze 1.0.
+    """
+    cdf = _score_cdf_cache.get(total_attack)
+    if cdf is None:
+        mean = total_attack / GOAL_SCALE
+        cdf = []
+        k = 0
+        while True:
+            p = 0.5 * (1 + math.erf((k + 1 - mean) / (GOAL_SIGMA * _SQRT2)))
+            if p > 1 - 1e-12:
+                cdf.append(1.0)
+                break
+            cdf.append(p)
+            k += 1
+        _score_cdf_cache[total_attack] = cdf
+    return cdf
+
+
+def stage_key(round_name):
+    """Klucz statystyk dla rundy pucharowej: "Quarter-finals" -> "quarter_final", "Round of 16" -> "round_of_16"."""
+    key = round_name.lower().replace("-", "_").replace(" ", "_")
+    return key[:-1] if key.endswith("s") else key
+
+
+def _card_table(chances):
+    """Tablicuje wszystkie kombinacje kartek w paczce zawodników.
+
+    Zwraca (dystrybuanta, lista krotek pozycji ukaranych). Jedno losowanie
+    z tej tablicy jest równoważne niezależnym losowaniom dla każdego zawodnika.
+    """
+    outcomes = [((), 1.0)]
+    for pos, chance in enumerate(chances):
+        outcomes = [(hit + (pos,), p * chance) for hit, p in outcomes] + \
+                   [(hit, p * (1 - chance)) for hit, p in outcomes]
+    outcomes = [o for o in outcomes if o[1] > 0]
+    outcomes.sort(key=lambda o: o[1], reverse=True)
+    cdf = list(accumulate(p for _, p in outcomes))
+    cdf[-1] = 1.0
+    return cdf, [hit for hit, _ in outcomes]
+
+
+class RosterSnapshot:
+    """Niezmienny, płaski obraz składów turnieju używany przez silnik Monte Carlo.
+
+    Zawodnicy są numerowani kolejno w obrębie całego turnieju, a drużyna
+    przechowuje zakres swoich numerów. Dzięki temu pojedynczy przebieg operuje
+    wyłącznie na listach liczb, a nie na obiektach Player/Team.
+    """
+
+    def __init__(self, tournament):
+        fmt = tournament.format
+        if len(tournament.teams) != fmt.num_teams:
+            raise ValueError(f"Turniej musi mieć dokładnie {fmt.num_teams} drużyn, aby go rozpocząć.")
+        for team in tournament.teams:
+            if len(team.players) != fmt.players_per_team:
+                raise ValueError(f"Drużyna '{team.name}' musi mieć dokładnie {fmt.players_per_team} zawodników.")
+        self.format = fmt
+        # Poziom etapu: 0 = faza grupowa, k = k-ta runda pucharowa, ostatni = zwycięstwo
+        self.stage_keys = [stage_key(name) for name in fmt.knockout_round_names()] + ["title"]
+
+        self.team_names = [team.name for team in tournament.teams]
+        self.player_names = []
+        self.player_teams = []
+        self.player_attack = []
+        self.player_card_chance = []
+        self.team_players = []
+
+        for team_idx, team in enumerate(tournament.teams):
+            start = len(self.player_names)
+            for player in team.players:
+                self.player_names.append(player.name)
+                self.player_teams.append(team_idx)
+                self.player_attack.append(player.attack)
+                # Kartka pada, gdy randint(1, 100) < 2 * agresja
+                hits = min(100, max(0, 2 * player.aggression - 1))
+                self.player_card_chance.append(hits / 100)
+            self.team_players.append(range(start, len(self.player_names)))
+
+        # Dla każdej drużyny: paczki (dystrybuanta, numery ukaranych zawodników)
+        self.card_tables = []
+        for ids in self.team_players:
+            chunks = []
+            for i in range(0, len(ids), CARD_CHUNK_SIZE):
+                chunk = ids[i:i + CARD_CHUNK_SIZE]
+                cdf, hits = _card_table([self.player_card_chance[p] for p in chunk])
+                chunks.append((cdf, [tuple(chunk[pos] for pos in hit) for hit in hits]))
+            self.card_tables.append(chunks)
+
+        # Jeśli grupy zostały już rozlosowane, każdy przebieg używa tego losowania
+        self.groups = None
+        if tournament.groups:
+            index_of = {id(team): i for i, team in enumerate(tournament.teams)}
+            self.groups = [[index_of[id(t)] for t in teams] for teams in tournament.groups.values()]
+
+        elif fmt.is_swiss and tournament.phase != "SETUP":
+            # System szwajcarski: rozstawieniem jest kolejność drużyn po losowaniu
+            self.groups = [list(range(len(tournament.teams)))]
+
+        # Terminarz każdy z każdym dla każdej występującej wielkości grupy
+        self.group_rounds = {}
+        if not fmt.is_swiss:
+            self.group_rounds = {size: _round_robin(size, fmt.legs) for size in set(fmt.group_sizes())}
+
+    @property
+    def n_teams(self):
+        return len(self.team_names)
+
+    @property
+    def n_players(self):
+        return len(self.player_names)
+
+
+class MonteCarloResult:
+    """Zagregowane wyniki wielu niezależnych przebiegów turnieju."""
+
+    def __init__(self, roster):
+        self.team_names = roster.team_names
+        self.player_names = roster.player_names
+        self.player_teams = roster.player_teams
+        self.stage_keys = roster.stage_keys
+        self.n_runs = 0
+        self.seed = None
+
+        n_teams = roster.n_teams
+        n_players = roster.n_players
+        self.stage_counts = [[0] * (len(self.stage_keys) + 1) for _ in range(n_teams)]
+        self.points_sum = [0] * n_teams
+        self.goals_for_sum = [0] * n_teams
+        self.goals_sum = [0] * n_players
+        self.goal_histograms = [{} for _ in range(n_players)]
+        self.top_scorer_counts = [0] * n_players
+        self.yellow_sum = [0] * n_players
+        self.red_card_runs = [0] * n_players
+
+    def add_run(self, run):
+        """Dolicza wynik pojedynczego przebiegu zwrócony przez simulate_run."""
+        stages, points, goals_for, goals, yellows, reds = run
+        self.n_runs += 1
+        stage_counts = self.stage_counts
+        points_sum = self.points_sum
+        goals_for_sum = self.goals_for_sum
+        for team_idx, stage in enumerate(stages):
+            stage_counts[team_idx][stage] += 1
+            points_sum[team_idx] += points[team_idx]
+            goals_for_sum[team_idx] += goals_for[team_idx]
+
+        # Zera w histogramach uzupełniamy dopiero przy odczycie (n_runs - reszta)
+        max_goals = max(goals)
+        histograms = self.goal_histograms
+        goals_sum = self.goals_sum
+        top_scorer_counts = self.top_scorer_counts
+        for player_idx, player_goals in enumerate(goals):
+            if player_goals:
+                histogram = histograms[player_idx]
+                histogram[player_goals] = histogram.get(player_goals, 0) + 1
+                goals_sum[player_idx] += player_goals
+                if player_goals == max_goals:
+                    top_scorer_counts[player_idx] += 1
+
+        yellow_sum = self.yellow_sum
+        red_card_runs = self.red_card_runs
+        for player_idx, player_yellows in enumerate(yellows):
+            if player_yellows:
+                yellow_sum[player_idx] += player_yellows
+        for player_idx, player_reds in enumerate(reds):
+            if player_reds:
+                red_card_runs[player_idx] += 1
+
+    def merge(self, other):
+        """Dolicza liczniki innego wyniku (np. paczki policzonej w osobnym procesie)."""
+        self.n_runs += other.n_runs
+        for counts, other_counts in zip(self.stage_counts, other.stage_counts):
+            for stage, count in enumerate(other_counts):
+                counts[stage] += count
+        for name in ("points_sum", "goals_for_sum", "goals_sum", "top_scorer_counts", "yellow_sum", "red_card_runs"):
+            totals = getattr(self, name)
+            for i, value in enumerate(getattr(other, name)):
+                totals[i] += value
+        for histogram, other_histogram in zip(self.goal_histograms, other.goal_histograms):
+            for goals, count in other_histogram.items():
+                histogram[goals] = histogram.get(goals, 0) + count
+
+    def _goal_distribution(self, player_idx):
+        histogram = self.goal_histograms[player_idx]
+        scoring_runs = sum(histogram.values())
+        distribution = {0: (self.n_runs - scoring_runs) / self.n_runs}
+        for goals, count in sorted(histogram.items()):
+            distribution[goals] = count / self.n_runs
+        return distribution
+
+    def _reach_probability(self, team_idx, stage):
+        return sum(self.stage_counts[team_idx][stage:]) / self.n_runs
+
+    @property
+    def team_stats(self):
+        """Słownik: nazwa drużyny -> prawdopodobieństwa awansu i średnie statystyki.
+
+        Klucze etapów zależą od formatu (stage_keys), np. "quarter_final",
+        "semi_final", "final" i "title" dla formatu domyślnego.
+        """
+        if not self.n_runs:
+            return {}
+        stats = {}
+        for i, name in enumerate(self.team_names):
+            team_stats = {key: self._reach_probability(i, level) for level, key in enumerate(self.stage_keys, 1)}
+            team_stats["avg_points"] = self.points_sum[i] / self.n_runs
+            team_stats["avg_goals_for"] = self.goals_for_sum[i] / self.n_runs
+            stats[name] = team_stats
+        return stats
+
+    @property
+    def player_stats(self):
+        """Lista słowników ze średnimi i rozkładem goli dla każdego zawodnika."""
+        if not self.n_runs:
+            return []
+        n = self.n_runs
+        return [
+            {
+                "name": name,
+                "team_name": self.team_names[self.player_teams[i]],
+                "avg_goals": self.goals_sum[i] / n,
+                "goal_distribution": self._goal_distribution(i),
+                "top_scorer": self.top_scorer_counts[i] / n,
+                "avg_yellow_cards": self.yellow_sum[i] / n,
+                "red_card": self.red_card_runs[i] / n,
+            }
+            for i, name in enumerate(self.player_names)
+        ]
+
+    def to_dict(self):
+        """Konwertuje wyniki na słownik do zapisu w JSON."""
+        return {"n_runs": self.n_runs, "seed": self.seed, "teams": self.team_stats, "players": self.player_stats}
+
+
+def _round_robin(group_size, legs=2):
+    """Zwraca kolejki (mecz i rewanż przy legs=2) jako listy par pozycji w grupie."""
+    slots = list(range(group_size))
+    if len(slots) % 2:
+        slots.append(None)
+    n = len(slots)
+
+    first_leg = []
+    for _ in range(n - 1):
+        pairs = [(slots[i], slots[n - 1 - i]) for i in range(n // 2)]
+        first_leg.append([p for p in pairs if p[0] is not None and p[1] is not None])
+        slots.insert(1, slots.pop())
+    if legs == 1:
+        return first_leg
+    second_leg = [[(b, a) for a, b in round_pairs] for round_pairs in first_leg]
+    return first_leg + second_leg
+
+
+def simulate_run(roster, rng):
+    """Rozgrywa jeden pełny turniej na płaskich listach i zwraca jego wynik.
+
+    Zwracana krotka: (etap drużyn, punkty, gole zdobyte, gole zawodników,
+    żółte kartki zawodników, czerwone kartki zawodników).
+    """
+    uniform = rng.random
+    attack = roster.player_attack
+    card_tables = roster.card_tables
+    team_players = roster.team_players
+    n_teams = roster.n_teams
+    n_players = roster.n_players
+
+    goals = [0] * n_players
+    yellows = [0] * n_players
+    reds = [0] * n_players
+    points = [0] * n_teams
+    goals_for = [0] * n_teams
+    goals_against = [0] * n_teams
+    stages = [0] * n_teams
+
+    # Stan aktywnych zawodników (bez czerwonej kartki) zmienia się tylko przy czerwonej kartce
+    active = [list(ids) for ids in team_players]
+    cum_weights = [list(accumulate(attack[p] for p in ids)) for ids in active]
+    cdfs = [score_cdf(w[-1] if w else 0) for w in cum_weights]
+
+    def play(t1, t2):
+        # Gole każdej drużyny zależą tylko od jej składu sprzed meczu, a kartki
+        # zmieniają skład dopiero na kolejne mecze, więc drużyny losujemy po kolei.
+        scores = []
+        for team_idx in (t1, t2):
+            cdf = cdfs[team_idx]
+            score = bisect_right(cdf, uniform())
+            if score >= len(cdf):
+                score = len(cdf) - 1
+            pool = active[team_idx]
+            if score and pool:
+                weights = cum_weights[team_idx]
+                total = weights[-1]
+                for _ in range(score):
+                    goals[pool[bisect_right(weights, uniform() * total)]] += 1
+            scores.append(score)
+
+            sent_off = False
+            for card_cdf, hits in card_tables[team_idx]:
+                for p in hits[bisect_right(card_cdf, uniform())]:
+                    if yellows[p] % 2 == 1:
+                        if not reds[p]:
+                            sent_off = True
+                        reds[p] += 1
+                    else:
+                        yellows[p] += 1
+            if sent_off:
+                pool = [p for p in team_players[team_idx] if not reds[p]]
+                active[team_idx] = pool
+                cum_weights[team_idx] = list(accumulate(attack[p] for p in pool))
+                cdfs[team_idx] = score_cdf(cum_weights[team_idx][-1] if pool else 0)
+
+        score1, score2 = scores
+        goals_for[t1] += score1
+        goals_for[t2] += score2
+        goals_against[t1] += score2
+        goals_against[t2] += score1
+        return score1, score2
+
+    groups = roster.groups
+    if groups is None:
+        order = list(range(n_teams))
+        rng.shuffle(order)
+        groups = []
+        start = 0
+        for size in roster.format.group_sizes():
+            groups.append(order[start:start + size])
+            start += size
+
+    def play_for_points(t1, t2):
+        score1, score2 = play(t1, t2)
+        if score1 > score2:
+            points[t1] += 3
+        elif score1 == score2:
+            points[t1] += 1
+            points[t2] += 1
+        else:
+            points[t2] += 3
+
+    if roster.format.is_swiss:
+        # Faza szwajcarska: pary jak w Tournament._pair_swiss_round, klasyfikacja z Buchholzem
+        seeding = groups[0]
+        opponents = [set() for _ in range(n_teams)]
+        had_bye = set()
+
+        def swiss_key(t):
+            return (points[t], sum(points[o] for o in opponents[t]), goals_for[t] - goals_against[t], goals_for[t])
+
+        for _ in range(roster.format.swiss_rounds):
+            pairs, bye = swiss_pairings(sorted(seeding, key=swiss_key, reverse=True), opponents, had_bye)
+            if bye is not None:
+                points[bye] += BYE_POINTS
+                had_bye.add(bye)
+            for t1, t2 in pairs:
+                opponents[t1].add(t2)
+                opponents[t2].add(t1)
+            for t1, t2 in pairs:
+                play_for_points(t1, t2)
+        standings = [sorted(seeding, key=swiss_key, reverse=True)]
+    else:
+        # Faza grupowa: kolejki w losowej kolejności, jak w Tournament._schedule_group_stage
+        schedules = []
+        for group in groups:
+            rounds = list(roster.group_rounds[len(group)])
+            rng.shuffle(rounds)
+            schedules.append(rounds)
+        for round_idx in range(max(len(s) for s in schedules)):
+            for group, rounds in zip(groups, schedules):
+                if round_idx >= len(rounds):
+                    continue
+                for a, b in rounds[round_idx]:
+                    play_for_points(group[a], group[b])
+
+        standings = [
+            sorted(group, key=lambda t: (points[t], goals_for[t] - goals_against[t], goals_for[t]), reverse=True)
+            for group in groups
+        ]
+
+    # Faza pucharowa: rozstawienie jak w Tournament, dalej zwycięzcy kolejnych par;
+    # None w drabince to wolny los
+    entrants = roster.format.seed_bracket(
+        standings, key=lambda t: (points[t], goals_for[t] - goals_against[t], goals_for[t]))
+    stage = 1
+    while True:
+        winners = []
+        for i in range(0, len(entrants), 2):
+            t1, t2 = entrants[i], entrants[i + 1]
+            if t1 is None or t2 is None:
+                bye = t1 if t2 is None else t2
+                stages[bye] = stage
+                winners.append(bye)
+                continue
+            stages[t1] = stages[t2] = stage
+            score1, score2 = play(t1, t2)
+            if score1 > score2:
+                winners.append(t1)
+            elif score2 > score1:
+                winners.append(t2)
+            else:
+                winners.append(t1 if uniform() < 0.5 else t2)
+        stage += 1
+        if len(winners) == 1:
+            stages[winners[0]] = stage
+            break
+        entrants = winners
+
+    return stages, points, goals_for, goals, yellows, reds
+
+
+def batch_rng(seed, batch_index, rng_backend="stdlib"):
+    """Zwraca niezależny generator dla paczki przebiegów wyprowadzony z ziarna głównego.
+
+    Strumień pochodny (rng.spawn) zależy tylko od (seed, batch_index), a nie od
+    procesu, w którym paczka jest liczona. Dla "stdlib" to random.Random
+    ziarnowany napisem "seed:batch_index".
+    """
+    return make_rng(rng_backend, seed).spawn(batch_index)
+
+
+_worker_roster = None
+
+
+def _init_worker(roster):
+    """Przekazuje obraz składów do procesu roboczego raz, zamiast z każdą paczką."""
+    global _worker_roster
+    _worker_roster = roster
+
+
+def _run_worker_batch(seed, batch_index, n_runs, rng_backend, keep_records):
+    return _run_batch(_worker_roster, seed, batch_index, n_runs, rng_backend, keep_records)
+
+
+def _run_batch(roster, seed, batch_index, n_runs, rng_backend="stdlib", keep_records=False):
+    """Liczy jedną paczkę przebiegów danym strumieniem losowym.
+
+    Zwraca (wynik, rekordy), gdzie rekordy to tablica results_store z każdym
+    przebiegiem paczki albo None, gdy keep_records jest fałszywe.
+    """
+    rng = batch_rng(seed, batch_index, rng_backend)
+    result = MonteCarloResult(roster)
+    runs = [] if keep_records else None
+    for _ in range(n_runs):
+        run = simulate_run(roster, rng)
+        result.add_run(run)
+        if keep_records:
+            runs.append(run)
+    if not keep_records:
+        return result, None
+    from results_store import records_from_runs
+    return result, records_from_runs(runs, roster.n_teams, roster.n_players)
+
+
+def run_monte_carlo(tournament, n_runs, seed=None, workers=1, rng_backend="stdlib", store_path=None):
+    """Symuluje n_runs pełnych turniejów na obrazie składów i agreguje wyniki.
+
+    Stan przekazanego turnieju (drużyny, zawodnicy, mecze) nie jest modyfikowany.
+    Przebiegi są dzielone na paczki po BATCH_SIZE, każda z własnym strumieniem
+    losowym, więc wynik dla danego seed jest identyczny niezależnie od liczby
+    procesów (workers=None oznacza wszystkie rdzenie). rng_backend wybiera
+    generator (rng.RNG_BACKENDS); przebiegi losują pojedyncze liczby, więc
+    najszybszy jest "stdlib".
+
+    Jeśli podano store_path, każdy przebieg jest dopisywany (w kolejności paczek)
+    do magazynu wyników results_store.ResultsStore; istniejący magazyn musi
+    dotyczyć tych samych składów.
+    """
+    if n_runs <= 0:
+        raise ValueError("Liczba przebiegów musi być dodatnia.")
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    roster = RosterSnapshot(tournament)
+    batches = [(i, min(BATCH_SIZE, n_runs - start)) for i, start in enumerate(range(0, n_runs, BATCH_SIZE))]
+
+    store = None
+    if store_path is not None:
+        from results_store import ResultsStore
+        store = ResultsStore.open_or_create(store_path, roster)
+
+    result = MonteCarloResult(roster)
+    result.seed = seed
+    keep_records = store is not None
+    try:
+        if workers <= 1 or len(batches) == 1:
+            partials = (_run_batch(roster, seed, batch_index, batch_runs, rng_backend, keep_records)
+                        for batch_index, batch_runs in batches)
+            _collect(result, partials, store)
+            return result
+
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(batches)),
+                                 initializer=_init_worker, initargs=(roster,)) as executor:
+            partials = executor.map(_run_worker_batch, [seed] * len(batches),
+                                    [i for i, _ in batches], [n for _, n in batches],
+                                    [rng_backend] * len(batches), [keep_records] * len(batches))
+            _collect(result, partials, store)
+        return result
+    finally:
+        if store is not None:
+            store.close()
+
+
+def _collect(result, partials, store):
+    """Scala wyniki paczek i dopisuje ich rekordy do magazynu (jeśli jest)."""
+    for partial, records in partials:
+        result.merge(partial)
+        if store is not None:
+            store.append(records)
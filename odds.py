@@ -0,0 +1,187 @@
+"""Dokładne prawdopodobieństwa wyników meczów wyliczone z modelu goli, bez losowania.
+
+Gole drużyny to max(0, int(N(suma ataku / GOAL_SCALE, GOAL_SIGMA))), a wyniki
+obu drużyn są losowane niezależnie, więc macierz P(gole1, gole2) jest iloczynem
+rozkładów brzegowych (monte_carlo.score_cdf). Z niej wynikają szanse zwycięstwa,
+remisu i porażki, oczekiwane punkty, szansa awansu w pucharze (remis rozstrzygają
+karne 50/50) oraz oczekiwane tabele. Ostatnio używane macierze są zapamiętywane
+według sił ataku (najwyżej ODDS_CACHE_SIZE).
+Szanse awansu w pojedynczych meczach składają się w dokładne szanse dotarcia
+do każdej rundy drabinki (bracket_probabilities, knockout_odds).
+"""
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+
+from monte_carlo import score_cdf, stage_key
+
+# Liczba zapamiętanych macierzy wyników (par sił ataku); najdawniej używane są usuwane
+ODDS_CACHE_SIZE = 4096
+
+
+def score_pmf(total_attack):
+    """Rozkład liczby goli drużyny o danej sumie ataku: lista P(k goli) dla k = 0, 1, ..."""
+    cdf = score_cdf(total_attack)
+    return [cdf[0]] + [b - a for a, b in zip(cdf, cdf[1:])]
+
+
+class MatchOdds:
+    """Macierz wyników meczu drużyn o danych sumach ataku i wynikające z niej prawdopodobieństwa.
+
+    matrix[i][j] to P(drużyna 1 strzeli i goli, a drużyna 2 j goli). Obiekty
+    są współdzielone przez pamięć podręczną match_odds i nie należy ich zmieniać.
+    """
+
+    __slots__ = ("attack1", "attack2", "matrix", "win", "draw", "loss", "expected_goals", "_cdf", "_columns")
+
+    def __init__(self, attack1, attack2):
+        self.attack1 = attack1
+        self.attack2 = attack2
+        pmf1 = score_pmf(attack1)
+        pmf2 = score_pmf(attack2)
+        self.matrix = [[p1 * p2 for p2 in pmf2] for p1 in pmf1]
+
+        # P(drużyna 2 strzeli mniej niż i goli) – suma wiersza macierzy pod przekątną
+        cdf2 = score_cdf(attack2)
+        self.win = sum(p1 * cdf2[min(i, len(cdf2)) - 1] for i, p1 in enumerate(pmf1) if i)
+        self.draw = sum(p1 * pmf2[i] for i, p1 in enumerate(pmf1[:len(pmf2)]))
+        self.loss = max(0.0, 1.0 - self.win - self.draw)
+        self.expected_goals = (sum(k * p for k, p in enumerate(pmf1)), sum(k * p for k, p in enumerate(pmf2)))
+
+        self._columns = len(pmf2)
+        self._cdf = list(accumulate(p for row in self.matrix for p in row))
+        self._cdf[-1] = 1.0
+
+    @property
+    def expected_points(self):
+        """Oczekiwane punkty (drużyna 1, drużyna 2) za mecz grupowy."""
+        return 3 * self.win + self.draw, 3 * self.loss + self.draw
+
+    @property
+    def advance(self):
+        """Szansa awansu drużyny 1 w meczu pucharowym (remis rozstrzygają karne 50/50)."""
+        return self.win + self.draw / 2
+
+    def sample(self, rng):
+        """Losuje wynik (gole1, gole2) z macierzy jedną liczbą rng.random()."""
+        index = bisect_right(self._cdf, rng.random())
+        if index >= len(self._cdf):
+            index = len(self._cdf) - 1
+        return divmod(index, self._columns)
+
+    def to_dict(self):
+        """Prawdopodobieństwa meczu w postaci słownika (np. do JSON)."""
+        points1, points2 = self.expected_points
+        return {"win": self.win, "draw": self.draw, "loss": self.loss,
+                "expected_points": [points1, points2], "expected_goals": list(self.expected_goals),
+                "advance": self.advance}
+
+
+@lru_cache(maxsize=ODDS_CACHE_SIZE)
+def match_odds(attack1, attack2):
+    """Zwraca (zapamiętany) MatchOdds dla drużyn o sumach ataku attack1 i attack2."""
+    return MatchOdds(attack1, attack2)
+
+
+def expected_table(tournament, table_name):
+    """Oczekiwana tabela grupy (albo systemu szwajcarskiego) po rozegraniu zaplanowanych meczów.
+
+    Do bieżących punktów i goli każdej drużyny dolicza wartości oczekiwane
+    nierozegranych meczów tej tabeli, licząc siłę z obecnych składów (bez
+    zawodników z czerwoną kartką). Zwraca listę słowników posortowaną
+    malejąco według oczekiwanych punktów.
+    """
+    teams = tournament.ranking(table_name)
+    rows = {id(team): {"team": team.name, "points": team.points, "expected_points": float(team.points),
+                       "expected_goals_for": float(team.goals_for),
+                       "expected_goals_against": float(team.goals_against)} for team in teams}
+    for match in tournament.matches:
+        if match.is_played or id(match.team1) not in rows or id(match.team2) not in rows:
+            continue
+        odds = match_odds(match.team1.total_attack, match.team2.total_attack)
+        points1, points2 = odds.expected_points
+        goals1, goals2 = odds.expected_goals
+        row1, row2 = rows[id(match.team1)], rows[id(match.team2)]
+        row1["expected_points"] += points1
+        row2["expected_points"] += points2
+        row1["expected_goals_for"] += goals1
+        row1["expected_goals_against"] += goals2
+        row2["expected_goals_for"] += goals2
+        row2["expected_goals_against"] += goals1
+    return sorted(rows.values(), key=lambda row: row["expected_points"], reverse=True)
+
+
+def bracket_probabilities(slots, advance):
+    """Dokładne szanse dotarcia drużyn do kolejnych rund drabinki (programowanie dynamiczne po drzewie).
+
+    slots to miejsca pierwszej rozgrywanej rundy w kolejności drabinki (długość
+    2^k, None = wolny los), advance(a, b) - szansa, że a pokona b. Zwraca listę
+    słowników {drużyna: prawdopodobieństwo}: element r dotyczy obecności
+    w r-tej rundzie od slots (0 = bieżąca runda), a ostatni - zwycięstwa.
+    Czas O(n² log n) dla n miejsc.
+    """
+    if len(slots) & (len(slots) - 1) or not slots:
+        raise ValueError("Liczba miejsc drabinki musi być potęgą dwójki.")
+    # Rozkład drużyny zajmującej każde miejsce; pusty słownik to wolny los
+    level = [{team: 1.0} if team is not None else {} for team in slots]
+    rounds = [{team: 1.0 for team in slots if team is not None}]
+    while len(level) > 1:
+        next_level = []
+        for first, second in zip(level[::2], level[1::2]):
+            if not first or not second:
+                next_level.append(dict(first or second))
+                continue
+            # Każda para liczona raz: rywal awansuje z prawdopodobieństwem 1 - advance
+            winners = dict.fromkeys(first, 0.0)
+            winners.update(dict.fromkeys(second, 0.0))
+            for team, p in first.items():
+                for rival, q in second.items():
+                    chance = p * q * advance(team, rival)
+                    winners[team] += chance
+                    winners[rival] += p * q - chance
+            next_level.append(winners)
+        level = next_level
+        rounds.append({team: p for slot in level for team, p in slot.items()})
+    return rounds
+
+
+def knockout_odds(tournament):
+    """Szanse każdej drużyny na każdą rundę pucharową i tytuł z bieżącego stanu turnieju.
+
+    Liczy od miejsc bieżącej rundy drabinki (rozstawionej przez
+    _create_knockout_bracket, także ze stałymi parami ćwierćfinałów), a rundy
+    rozegrane mają szansę 0 albo 1. Przed fazą pucharową skład drabinki nie jest
+    znany, więc zgłaszany jest ValueError (szanse awansu z grup szacuje
+    Tournament.run_monte_carlo). Siła drużyn to obecne składy bez zawodników
+    z czerwoną kartką. Zwraca słownik nazwa drużyny -> {klucz etapu: szansa}
+    z kluczami jak MonteCarloResult.team_stats, np. "quarter_final", "title".
+    """
+    round_names = tournament.format.knockout_round_names()
+    keys = [stage_key(name) for name in round_names] + ["title"]
+    reached = {id(team): -1 for team in tournament.teams}  # Ostatnia runda (indeks), do której dotarła drużyna
+    for index, name in enumerate(round_names):
+        for match in tournament.knockout_matches.get(name, []):
+            reached[id(match.team1)] = reached[id(match.team2)] = index
+
+    if tournament.winner is not None:
+        reached[id(tournament.winner)] = len(round_names)
+        rounds, first = [], len(keys)
+    else:
+        if tournament.phase != "KNOCKOUT_STAGE":
+            raise ValueError("Szanse w drabince można policzyć dopiero po utworzeniu fazy pucharowej.")
+        slots, first = tournament.knockout_entrants, tournament.current_round
+        for team in slots:  # Także drużyny z wolnym losem w bieżącej rundzie
+            if team is not None:
+                reached[id(team)] = first
+        attack = {id(team): team.total_attack for team in tournament.teams}
+        rounds = bracket_probabilities(
+            [id(team) if team is not None else None for team in slots],
+            lambda a, b: match_odds(attack[a], attack[b]).advance)
+
+    odds = {}
+    for team in tournament.teams:
+        stats = {key: float(reached[id(team)] >= index) for index, key in enumerate(keys[:first])}
+        for key, probabilities in zip(keys[first:], rounds):
+            stats[key] = probabilities.get(id(team), 0.0)
+        odds[team.name] = stats
+    return odds
@@ -0,0 +1,141 @@
+import random
+
+from models import Player
+
+try:
+    import numpy as np
+except ImportError:  # NumPy jest zależnością opcjonalną
+    np = None
+
+# Kolumny przechowywane w magazynie (nazwy zgodne z atrybutami klasy Player)
+STAT_FIELDS = ("attack", "defense", "aggression", "goals", "yellow_cards", "red_cards")
+
+
+class _StoreColumn:
+    """Deskryptor, który czyta i zapisuje atrybut zawodnika w kolumnie magazynu."""
+
+    def __init__(self, field):
+        self.field = field
+
+    def __get__(self, player, owner=None):
+        if player is None:
+            return self
+        return int(player.store.columns[self.field][player.store_id])
+
+    def __set__(self, player, value):
+        player.store.columns[self.field][player.store_id] = value
+
+
+class StoredPlayer(Player):
+    """Zawodnik, którego statystyki leżą w PlayerStore; interfejs taki jak Player."""
+
+    attack = _StoreColumn("attack")
+    defense = _StoreColumn("defense")
+    aggression = _StoreColumn("aggression")
+    goals = _StoreColumn("goals")
+    yellow_cards = _StoreColumn("yellow_cards")
+    red_cards = _StoreColumn("red_cards")
+
+    def __init__(self, store, store_id, first_name, last_name, team_name, player_id=None):
+        # Celowo bez Player.__init__: statystyki są już zapisane w magazynie
+        self.store = store
+        self.store_id = store_id
+        self.player_id = player_id
+        self.first_name = first_name
+        self.last_name = last_name
+        self.team_name = team_name
+        self.name = f"{self.first_name} {self.last_name}"
+
+
+class PlayerStore:
+    """Kolumnowy magazyn statystyk zawodników oparty na tablicach NumPy.
+
+    Każda statystyka to ciągła tablica indeksowana numerem zawodnika, a zawodnicy
+    drużyny i zajmują przedział [team_offsets[i], team_offsets[i + 1]).
+    Siła drużyn, wybór strzelców i kartki liczone są operacjami na tablicach.
+    """
+
+    def __init__(self, capacity, seed=None):
+        if np is None:
+            raise ImportError("PlayerStore wymaga biblioteki NumPy (pip install numpy).")
+        self.size = 0
+        self.columns = {field: np.zeros(capacity, dtype=np.int32) for field in STAT_FIELDS}
+        self.players = []
+        self.teams = []
+        self.team_offsets = np.zeros(1, dtype=np.int64)
+        # Strumień ziarnowany z globalnego random, więc random.seed nadal daje powtarzalność
+        self.rng = np.random.default_rng(seed if seed is not None else random.getrandbits(64))
+
+    @classmethod
+    def from_teams(cls, teams, seed=None):
+        """Przenosi statystyki zawodników podanych drużyn do magazynu.
+
+        Listy team.players są podmieniane na obiekty StoredPlayer (z tymi samymi
+        numerami player_id), a drużyny dostają odwołanie do magazynu i swój indeks.
+        """
+        store = cls(sum(len(team.players) for team in teams), seed)
+        offsets = [0]
+        for team_idx, team in enumerate(teams):
+            views = []
+            for player in team.players:
+                for field in STAT_FIELDS:
+                    store.columns[field][store.size] = getattr(player, field)
+                view = StoredPlayer(store, store.size, player.first_name, player.last_name, player.team_name,
+                                    player.player_id)
+                store.players.append(view)
+                views.append(view)
+                store.size += 1
+            team.players = views
+            team.rebuild_player_index()
+            team.invalidate_strength()  # Zapamiętana siła odwołuje się do podmienionych obiektów Player
+            team.store = store
+            team.store_index = team_idx
+            store.teams.append(team)
+            offsets.append(store.size)
+        store.team_offsets = np.array(offsets, dtype=np.int64)
+        return store
+
+    def team_ids(self, *team_indices):
+        """Zwraca numery wszystkich zawodników podanych drużyn (w kolejności drużyn)."""
+        return np.concatenate([np.arange(self.team_offsets[i], self.team_offsets[i + 1]) for i in team_indices])
+
+    def active_ids(self, team_idx):
+        """Zwraca numery zawodników drużyny bez czerwonej kartki."""
+        start, stop = self.team_offsets[team_idx], self.team_offsets[team_idx + 1]
+        return np.flatnonzero(self.columns["red_cards"][start:stop] == 0) + start
+
+    def team_total(self, field, team_idx):
+        """Suma statystyki po aktywnych zawodnikach jednej drużyny."""
+        start, stop = self.team_offsets[team_idx], self.team_offsets[team_idx + 1]
+        values = self.columns[field][start:stop]
+        return int(values[self.columns["red_cards"][start:stop] == 0].sum())
+
+    def team_totals(self, field):
+        """Sumy statystyki po aktywnych zawodnikach dla wszystkich drużyn naraz."""
+        values = np.where(self.columns["red_cards"][:self.size] == 0, self.columns[field][:self.size], 0)
+        cumulative = np.concatenate(([0], np.cumsum(values, dtype=np.int64)))
+        return cumulative[self.team_offsets[1:]] - cumulative[self.team_offsets[:-1]]
+
+    def pick_scorers(self, team_idx, count, rng=None):
+        """Losuje count strzelców spośród aktywnych zawodników z wagami równymi atakowi.
+
+        rng to numpy.random.Generator (np. strumień meczu); domyślnie generator magazynu.
+        """
+        rng = rng if rng is not None else self.rng
+        ids = self.active_ids(team_idx)
+        if count <= 0 or len(ids) == 0:
+            return ids[:0]
+        cum_weights = np.cumsum(self.columns["attack"][ids])
+        picks = np.searchsorted(cum_weights, rng.random(count) * cum_weights[-1], side="right")
+        return ids[np.minimum(picks, len(ids) - 1)]
+
+    def draw_cards(self, ids, rng=None):
+        """Zwraca numery zawodników, którzy dostają kartkę (randint(1, 100) < 2 * agresja)."""
+        rng = rng if rng is not None else self.rng
+        draws = rng.integers(1, 101, size=len(ids))
+        return ids[draws < 2 * self.columns["aggression"][ids]]
+
+    def draw_minutes(self, count, rng=None):
+        """Losuje minuty zdarzeń z przedziału 1-90."""
+        rng = rng if rng is not None else self.rng
+        return rng.integers(1, 91, size=count)
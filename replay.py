@@ -0,0 +1,128 @@
+"""Powtórka turnieju: przejście do dowolnej rozegranej kolejki oraz krok w przód i w tył.
+
+Silnik jest deterministyczny (mecze losują ze strumieni wyprowadzonych z ziarna
+turnieju), więc stan po kolejce k powstaje przez wczytanie najbliższego punktu
+kontrolnego z pamięci i ponowne rozegranie co najwyżej checkpoint_every - 1 kolejek.
+"""
+import marshal
+import zlib
+
+# Domyślny odstęp punktów kontrolnych powtórki (w kolejkach)
+DEFAULT_REPLAY_CHECKPOINT_EVERY = 4
+
+
+class Replay:
+    """Historia kolejek turnieju z punktami kontrolnymi w pamięci.
+
+    Tournament wywołuje record_round() po każdej rozegranej kolejce: nowa
+    kolejka wydłuża historię (co checkpoint_every kolejek zapamiętywany jest
+    spakowany stan to_dict), a kolejka rozgrywana ponownie po cofnięciu jest
+    sprawdzana z zapisaną pozycją generatora losowego. Jeśli pozycja się nie
+    zgadza, dalsza historia jest odrzucana i zaczyna się od nowa od tej kolejki.
+
+    Podczas odtwarzania zapisanych kolejek dziennik zdarzeń i dziennik migawek
+    turnieju są odłączone, a po dojściu do ostatniej kolejki wracają na miejsce.
+    Turniej wywołuje close() przy zakończeniu powtórki (stop_replay, reset).
+    """
+
+    def __init__(self, tournament, checkpoint_every=DEFAULT_REPLAY_CHECKPOINT_EVERY):
+        if tournament.player_store is not None:
+            raise ValueError("Powtórka nie obsługuje magazynu kolumnowego (jego generator nie jest zapisywany).")
+        self.tournament = tournament
+        self.checkpoint_every = max(1, checkpoint_every)
+        self.seed = tournament.rng.root_seed
+        self.rng_backend = tournament.rng_backend
+        self.position = 0  # Liczba kolejek rozegranych od początku powtórki w bieżącym stanie turnieju
+        self.rng_positions = [self._rng_position()]  # Stan głównego generatora po każdej kolejce
+        self.checkpoints = {0: self._capture()}
+        self._detached = None  # (odbiornik zdarzeń, dziennik migawek) odłączone na czas odtwarzania
+
+    @property
+    def latest(self):
+        """Numer ostatniej zapisanej kolejki."""
+        return len(self.rng_positions) - 1
+
+    def _rng_position(self):
+        return marshal.dumps(self.tournament.rng.get_state())
+
+    def _capture(self):
+        return zlib.compress(marshal.dumps(self.tournament.to_dict()), 1)
+
+    def record_round(self):
+        """Zapisuje kolejkę właśnie rozegraną przez turniej (wywoływane przez Tournament)."""
+        self.position += 1
+        rng_position = self._rng_position()
+        if self.position <= self.latest:
+            if rng_position == self.rng_positions[self.position]:
+                if self.position == self.latest:
+                    self._reattach()
+                return
+            # Kolejka potoczyła się inaczej niż zapisana: dalsza historia jest nieaktualna
+            del self.rng_positions[self.position:]
+            self.checkpoints = {i: state for i, state in self.checkpoints.items() if i < self.position}
+            self._reattach()
+        self.rng_positions.append(rng_position)
+        if self.position % self.checkpoint_every == 0:
+            self.checkpoints[self.position] = self._capture()
+
+    def seek(self, round_index):
+        """Ustawia turniej w stanie po round_index kolejkach (przycinane do zakresu 0..latest)."""
+        round_index = max(0, min(round_index, self.latest))
+        start = max(i for i in self.checkpoints if i <= round_index)
+        if round_index < self.position or start > self.position:
+            self._restore(start)
+        while self.position < round_index:
+            self.tournament.simulate_next_round()
+        return self.position
+
+    def step_back(self):
+        """Cofa turniej o jedną kolejkę; zwraca nową pozycję."""
+        return self.seek(self.position - 1)
+
+    def step_forward(self):
+        """Przechodzi o kolejkę dalej: zapisaną z historii albo nową, gdy to już ostatnia.
+
+        Zwraca komunikat simulate_next_round albo None, gdy turniej jest zakończony.
+        """
+        if self.position == self.latest and self.tournament.winner is not None:
+            return None
+        return self.tournament.simulate_next_round()
+
+    def close(self):
+        """Kończy powtórkę: przywraca odłączony dziennik zdarzeń i zamyka odłączony dziennik migawek.
+
+        Dziennik migawek kończy się na ostatniej zapisanej kolejce, więc po
+        cofnięciu nie pasuje już do stanu turnieju i nie jest podłączany z powrotem.
+        """
+        if self._detached is None:
+            return
+        sink, writer = self._detached
+        self._detached = None
+        if sink is not None:
+            self.tournament.attach_event_sink(sink)
+        if writer is not None:
+            writer.close()
+
+    def _restore(self, index):
+        tournament = self.tournament
+        if self._detached is None:
+            self._detached = (tournament.event_sink, tournament.snapshot_writer)
+        # Odłączone przed load_dict, aby reset turnieju nie zamknął dziennika migawek ani tej powtórki
+        tournament.event_sink = tournament.snapshot_writer = tournament.replay = None
+        tournament.load_dict(marshal.loads(zlib.decompress(self.checkpoints[index])))
+        tournament.replay = self
+        self.position = index
+        if index == self.latest:
+            self._reattach()
+
+    def _reattach(self):
+        if self._detached is None:
+            return
+        sink, writer = self._detached
+        self._detached = None
+        tournament = self.tournament
+        if sink is not None:
+            tournament.attach_event_sink(sink)
+        if writer is not None:
+            writer.resync(tournament)
+            tournament.snapshot_writer = writer
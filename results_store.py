@@ -0,0 +1,291 @@
+"""Magazyn wyników przebiegów Monte Carlo: binarny plik o stałym schemacie, tylko do dopisywania.
+
+Plik zaczyna się nagłówkiem (sygnatura, wersja schematu, rozmiar nagłówka,
+liczby drużyn, zawodników i zapisanych przebiegów oraz odcisk składów), po
+którym leżą metadane JSON (nazwy drużyn i zawodników, klucze etapów), a od
+offsetu header_size kolejne rekordy przebiegów o stałej długości. Rekord to
+jeden przebieg: etap, punkty i gole drużyn oraz gole i kartki zawodników.
+
+Odczyt mapuje rekordy przez numpy.memmap, więc kolumny (np. gole zawodnika
+we wszystkich przebiegach) są widokami bez kopiowania, a agregacja idzie
+paczkami przebiegów, bez wczytywania całego pliku do pamięci.
+"""
+import hashlib
+import json
+import os
+import struct
+
+try:
+    import numpy as np
+except ImportError:  # NumPy jest zależnością opcjonalną
+    np = None
+
+STORE_MAGIC = b"TRES"
+SCHEMA_VERSION = 2
+
+# Sygnatura, wersja schematu, rozmiar nagłówka z metadanymi, długość metadanych,
+# liczba drużyn, liczba zawodników, liczba przebiegów, odcisk składów (SHA-256)
+_HEADER = struct.Struct("<4sHIIIIQ32s")
+_N_RUNS_OFFSET = 22  # Pozycja pola liczby przebiegów w _HEADER (nadpisywana po dopisaniu)
+
+# Rekordy zaczynają się od granicy tylu bajtów
+HEADER_ALIGN = 64
+
+# Liczba przebiegów agregowanych naraz przez ResultsStore.aggregate
+DEFAULT_CHUNK_RUNS = 65536
+
+# Kolumny rekordu: (nazwa, typ, wymiar: "teams" albo "players"). Typy mieszczą
+# wartości największych formatów (np. jedna grupa 4096 drużyn z rewanżami);
+# create() dodatkowo sprawdza górne ograniczenia wynikające z formatu.
+RECORD_FIELDS = (
+    ("stage", "u1", "teams"),
+    ("points", "<i4", "teams"),
+    ("goals_for", "<i4", "teams"),
+    ("goals", "<u4", "players"),
+    ("yellow_cards", "<u2", "players"),
+    ("red_cards", "<u2", "players"),
+)
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Magazyn wyników wymaga biblioteki NumPy (pip install numpy).")
+
+
+def record_dtype(n_teams, n_players):
+    """Typ strukturalny rekordu jednego przebiegu dla danej liczby drużyn i zawodników."""
+    _require_numpy()
+    sizes = {"teams": n_teams, "players": n_players}
+    return np.dtype([(name, dtype, (sizes[dim],)) for name, dtype, dim in RECORD_FIELDS])
+
+
+def roster_fingerprint(roster):
+    """Odcisk SHA-256 składów (monte_carlo.RosterSnapshot), od których zależą wyniki przebiegów.
+
+    Obejmuje format, drużyny, zawodników z ich siłą ataku i szansą kartki
+    oraz rozlosowane grupy, więc zmiana któregokolwiek unieważnia magazyn.
+    """
+    data = [roster.format.to_list(), roster.team_names, roster.player_names, roster.player_teams,
+            roster.player_attack, roster.player_card_chance, roster.groups]
+    return hashlib.sha256(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")).digest()
+
+
+def value_limits(roster):
+    """Górne ograniczenia wartości kolumn rekordu dla składów roster (monte_carlo.RosterSnapshot).
+
+    Drużyna rozegra najwyżej tyle meczów, ile kolejek ma faza przed drabinką
+    i runda pucharowa, w każdym strzeli najwyżej tyle goli, ile obejmuje
+    rozkład score_cdf jej pełnego składu, a zawodnik dostaje w meczu
+    najwyżej jedną kartkę każdego rodzaju.
+    """
+    from monte_carlo import score_cdf
+    fmt = roster.format
+    matches = fmt.num_group_rounds + len(roster.stage_keys) - 1
+    attack = roster.player_attack
+    max_score = max((len(score_cdf(sum(attack[p] for p in ids))) - 1 for ids in roster.team_players), default=0)
+    return {
+        "stage": len(roster.stage_keys),
+        "points": 3 * matches,
+        "goals_for": max_score * matches,
+        "goals": max_score * matches,
+        "yellow_cards": matches,
+        "red_cards": matches,
+    }
+
+
+def check_capacity(roster):
+    """Zgłasza ValueError, jeśli wartości przebiegu dla tych składów mogą nie zmieścić się w rekordzie."""
+    _require_numpy()
+    dtypes = {name: dtype for name, dtype, _ in RECORD_FIELDS}
+    for name, limit in value_limits(roster).items():
+        maximum = np.iinfo(np.dtype(dtypes[name])).max
+        if limit > maximum:
+            raise ValueError(f"Format turnieju jest za duży dla magazynu wyników: kolumna '{name}' "
+                             f"może osiągnąć {limit} (maksimum {maximum}).")
+
+
+def records_from_runs(runs, n_teams, n_players):
+    """Zamienia listę wyników monte_carlo.simulate_run na tablicę rekordów."""
+    _require_numpy()
+    records = np.zeros(len(runs), dtype=record_dtype(n_teams, n_players))
+    for i, run in enumerate(runs):
+        for (name, _, _), values in zip(RECORD_FIELDS, run):
+            records[name][i] = values
+    return records
+
+
+class ResultsStore:
+    """Plik wyników przebiegów: dopisywanie rekordów i odczyt przez numpy.memmap.
+
+    Otwarcie sprawdza sygnaturę i wersję schematu, a jeśli podano roster, także
+    odcisk składów; niezgodność kończy się ValueError, aby nie mieszać wyników
+    innego turnieju. Rekordy dopisywane są za ostatnim zatwierdzonym
+    przebiegiem, a liczba przebiegów w nagłówku zmienia się dopiero po ich
+    zapisaniu, więc przerwany zapis nie psuje wcześniejszych danych.
+    """
+
+    def __init__(self, path, roster=None, mode="r"):
+        _require_numpy()
+        if mode not in ("r", "a"):
+            raise ValueError(f"Nieznany tryb magazynu wyników '{mode}' (dostępne: r, a).")
+        self.path = path
+        self.mode = mode
+        self._file = open(path, "r+b" if mode == "a" else "rb")
+        try:
+            self._read_header()
+            if roster is not None and roster_fingerprint(roster) != self.fingerprint:
+                raise ValueError(f"Magazyn wyników '{path}' dotyczy innych składów turnieju.")
+        except Exception:
+            self._file.close()
+            raise
+        self._runs = None
+
+    @classmethod
+    def create(cls, path, roster):
+        """Tworzy pusty magazyn dla składów roster (nadpisując istniejący plik).
+
+        Składy, których wartości mogłyby przekroczyć typy kolumn, są odrzucane (ValueError).
+        """
+        check_capacity(roster)
+        meta = json.dumps({
+            "team_names": roster.team_names,
+            "player_names": roster.player_names,
+            "player_teams": roster.player_teams,
+            "stage_keys": roster.stage_keys,
+        }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        header_size = -(-(_HEADER.size + len(meta)) // HEADER_ALIGN) * HEADER_ALIGN
+        header = _HEADER.pack(STORE_MAGIC, SCHEMA_VERSION, header_size, len(meta),
+                              roster.n_teams, roster.n_players, 0, roster_fingerprint(roster))
+        with open(path, "wb") as f:
+            f.write(header + meta + bytes(header_size - len(header) - len(meta)))
+        return cls(path, roster, mode="a")
+
+    @classmethod
+    def open_or_create(cls, path, roster):
+        """Otwiera magazyn do dopisywania albo tworzy nowy, jeśli pliku nie ma."""
+        if os.path.exists(path):
+            return cls(path, roster, mode="a")
+        return cls.create(path, roster)
+
+    def _read_header(self):
+        head = self._file.read(_HEADER.size)
+        if len(head) < _HEADER.size or head[:4] != STORE_MAGIC:
+            raise ValueError(f"Plik '{self.path}' nie jest magazynem wyników.")
+        (_, version, self.header_size, meta_size, self.n_teams, self.n_players,
+         self.n_runs, self.fingerprint) = _HEADER.unpack(head)
+        if version != SCHEMA_VERSION:
+            raise ValueError(f"Nieobsługiwana wersja schematu magazynu wyników: {version} "
+                             f"(obsługiwana: {SCHEMA_VERSION}).")
+        meta = json.loads(self._file.read(meta_size).decode("utf-8"))
+        self.team_names = meta["team_names"]
+        self.player_names = meta["player_names"]
+        self.player_teams = meta["player_teams"]
+        self.stage_keys = meta["stage_keys"]
+        self.dtype = record_dtype(self.n_teams, self.n_players)
+
+    def append(self, records):
+        """Dopisuje tablicę rekordów (typu self.dtype) i zatwierdza je w nagłówku."""
+        if self.mode != "a":
+            raise ValueError("Magazyn wyników otwarto tylko do odczytu.")
+        records = np.asarray(records)
+        if records.dtype != self.dtype:
+            raise ValueError("Rekordy nie pasują do schematu magazynu wyników.")
+        if not len(records):
+            return
+        f = self._file
+        # Zapis za ostatnim zatwierdzonym rekordem nadpisuje ewentualne resztki przerwanego dopisywania
+        f.seek(self.header_size + self.n_runs * self.dtype.itemsize)
+        f.write(records.tobytes())
+        f.flush()
+        self.n_runs += len(records)
+        f.seek(_N_RUNS_OFFSET)
+        f.write(struct.pack("<Q", self.n_runs))
+        f.flush()
+        self._runs = None
+
+    def append_runs(self, runs):
+        """Dopisuje wyniki monte_carlo.simulate_run."""
+        self.append(records_from_runs(runs, self.n_teams, self.n_players))
+
+    @property
+    def runs(self):
+        """Wszystkie zatwierdzone rekordy jako tablica tylko do odczytu zmapowana z pliku."""
+        if self._runs is None:
+            if self.n_runs:
+                self._runs = np.memmap(self.path, dtype=self.dtype, mode="r",
+                                       offset=self.header_size, shape=(self.n_runs,))
+            else:
+                self._runs = np.zeros(0, dtype=self.dtype)
+        return self._runs
+
+    def column(self, name):
+        """Kolumna rekordu jako widok (n_runs, liczba drużyn albo zawodników) bez kopiowania."""
+        if name not in self.dtype.names:
+            raise KeyError(f"Nieznana kolumna magazynu wyników '{name}' (dostępne: {', '.join(self.dtype.names)}).")
+        return self.runs[name]
+
+    def iter_chunks(self, chunk_runs=DEFAULT_CHUNK_RUNS):
+        """Zwraca kolejne wycinki rekordów po najwyżej chunk_runs przebiegów (widoki memmap)."""
+        runs = self.runs
+        for start in range(0, len(runs), max(1, chunk_runs)):
+            yield runs[start:start + chunk_runs]
+
+    def aggregate(self, chunk_runs=DEFAULT_CHUNK_RUNS):
+        """Agreguje wszystkie przebiegi do monte_carlo.MonteCarloResult, paczka po paczce.
+
+        Wynik jest taki sam, jak przy dodaniu tych przebiegów przez add_run.
+        """
+        from monte_carlo import MonteCarloResult
+        result = MonteCarloResult(self)
+        n_stages = len(self.stage_keys) + 1
+        stage_counts = np.zeros((self.n_teams, n_stages), dtype=np.int64)
+        offsets = np.arange(self.n_teams, dtype=np.int64) * n_stages
+        sums = {name: np.zeros(self.n_teams, dtype=np.int64) for name in ("points", "goals_for")}
+        goals_sum = np.zeros(self.n_players, dtype=np.int64)
+        top_scorer_counts = np.zeros(self.n_players, dtype=np.int64)
+        yellow_sum = np.zeros(self.n_players, dtype=np.int64)
+        red_card_runs = np.zeros(self.n_players, dtype=np.int64)
+        histograms = {}  # (zawodnik, gole) -> liczba przebiegów
+        for chunk in self.iter_chunks(chunk_runs):
+            stages = chunk["stage"].astype(np.int64) + offsets
+            stage_counts += np.bincount(stages.ravel(), minlength=stage_counts.size).reshape(stage_counts.shape)
+            for name, total in sums.items():
+                total += chunk[name].sum(axis=0, dtype=np.int64)
+            goals = chunk["goals"]
+            goals_sum += goals.sum(axis=0, dtype=np.int64)
+            top = (goals == goals.max(axis=1, keepdims=True)) & (goals > 0)
+            top_scorer_counts += top.sum(axis=0)
+            yellow_sum += chunk["yellow_cards"].sum(axis=0, dtype=np.int64)
+            red_card_runs += (chunk["red_cards"] > 0).sum(axis=0)
+            runs_idx, players_idx = np.nonzero(goals)
+            if len(players_idx):
+                width = int(goals.max()) + 1
+                keys, counts = np.unique(players_idx.astype(np.int64) * width + goals[runs_idx, players_idx],
+                                         return_counts=True)
+                for key, count in zip(keys.tolist(), counts.tolist()):
+                    pair = divmod(key, width)
+                    histograms[pair] = histograms.get(pair, 0) + count
+
+        result.n_runs = self.n_runs
+        result.stage_counts = stage_counts.tolist()
+        result.points_sum = sums["points"].tolist()
+        result.goals_for_sum = sums["goals_for"].tolist()
+        result.goals_sum = goals_sum.tolist()
+        result.top_scorer_counts = top_scorer_counts.tolist()
+        result.yellow_sum = yellow_sum.tolist()
+        result.red_card_runs = red_card_runs.tolist()
+        for (player_idx, goals), count in sorted(histograms.items()):
+            result.goal_histograms[player_idx][goals] = count
+        return result
+
+    def close(self):
+        self._runs = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
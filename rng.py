@@ -0,0 +1,190 @@
+import random
+from bisect import bisect_right
+from itertools import accumulate
+
+np = None  # NumPy (zależność opcjonalna) jest importowany dopiero przez generatory, które go używają
+
+# Nazwy dostępnych generatorów (argument rng_backend turnieju i opcja --rng w CLI)
+RNG_BACKENDS = ("stdlib", "pcg64", "philox", "batched")
+
+# Liczba gaussów i liczb jednostajnych losowanych naraz przez generator "batched"
+BATCH_BLOCK_SIZE = 64
+
+
+class StdlibRandom(random.Random):
+    """Generator z biblioteki standardowej (Mersenne Twister) ze strumieniami pochodnymi.
+
+    Strumień dla klucza (k1, k2, ...) jest ziarnowany napisem "ziarno:k1:k2:...",
+    który random haszuje (SHA-512), więc zależy wyłącznie od ziarna głównego
+    i klucza, a nie od kolejności, w jakiej strumienie są tworzone.
+    """
+
+    name = "stdlib"
+
+    def __init__(self, root_seed):
+        self.root_seed = root_seed
+        self._generator = None
+        super().__init__(root_seed)
+
+    def spawn(self, *key):
+        """Niezależny strumień dla klucza liczb całkowitych, np. (faza, kolejka, mecz)."""
+        return StdlibRandom(":".join(map(str, (self.root_seed,) + key)))
+
+    @property
+    def generator(self):
+        """numpy.random.Generator ziarnowany z tego strumienia (do losowań wektorowych)."""
+        if self._generator is None:
+            self._generator = _numpy().random.default_rng(self.getrandbits(64))
+        return self._generator
+
+    def get_state(self):
+        version, internal_state, gauss_next = self.getstate()
+        return [version, list(internal_state), gauss_next]
+
+    def set_state(self, state):
+        version, internal_state, gauss_next = state
+        self.setstate((version, tuple(internal_state), gauss_next))
+
+
+class NumpyRandom:
+    """Generator oparty na numpy.random.Generator (PCG64 lub licznikowy Philox).
+
+    Udostępnia ten sam interfejs co random.Random w zakresie używanym przez
+    turniej (random, gauss, randint, choice, choices, shuffle, sample,
+    getrandbits), a strumienie pochodne powstają przez SeedSequence ze
+    spawn_key, więc są statystycznie niezależne. Pojedyncze losowania przez
+    NumPy są wolne; do dużych losowań służy właściwość generator.
+    """
+
+    def __init__(self, root_seed, bit_generator="PCG64", spawn_key=()):
+        np = _numpy()
+        self.root_seed = root_seed
+        self.bit_generator = bit_generator
+        self.name = bit_generator.lower()
+        sequence = np.random.SeedSequence(root_seed, spawn_key=spawn_key)
+        self.generator = np.random.Generator(getattr(np.random, bit_generator)(sequence))
+
+    def spawn(self, *key):
+        return type(self)(self.root_seed, self.bit_generator, key)
+
+    def random(self):
+        return float(self.generator.random())
+
+    def _normal(self):
+        return float(self.generator.standard_normal())
+
+    def gauss(self, mu=0.0, sigma=1.0):
+        return mu + sigma * self._normal()
+
+    def randint(self, a, b):
+        return a + int(self.random() * (b - a + 1))
+
+    def choice(self, seq):
+        return seq[int(self.random() * len(seq))]
+
+    def choices(self, population, weights=None, *, cum_weights=None, k=1):
+        if cum_weights is None:
+            if weights is None:
+                return [self.choice(population) for _ in range(k)]
+            cum_weights = list(accumulate(weights))
+        total = cum_weights[-1]
+        hi = len(population) - 1
+        return [population[min(bisect_right(cum_weights, self.random() * total), hi)] for _ in range(k)]
+
+    def shuffle(self, x):
+        for i in reversed(range(1, len(x))):
+            j = int(self.random() * (i + 1))
+            x[i], x[j] = x[j], x[i]
+
+    def sample(self, population, k):
+        pool = list(population)
+        for i in range(k):
+            j = i + int(self.random() * (len(pool) - i))
+            pool[i], pool[j] = pool[j], pool[i]
+        return pool[:k]
+
+    def getrandbits(self, k):
+        return int.from_bytes(self.generator.bytes((k + 7) // 8), "little") >> (-k % 8)
+
+    def get_state(self):
+        return _plain(self.generator.bit_generator.state)
+
+    def set_state(self, state):
+        self.generator.bit_generator.state = _bit_generator_state(state)
+
+
+class BatchedRandom(NumpyRandom):
+    """Generator PCG64, który losuje gaussy i liczby jednostajne blokami po block_size.
+
+    Każde pojedyncze losowanie to odczyt z przygotowanej listy zamiast wywołania
+    NumPy, więc koszt wywołania generatora rozkłada się na cały blok.
+    """
+
+    def __init__(self, root_seed, bit_generator="PCG64", spawn_key=(), block_size=BATCH_BLOCK_SIZE):
+        super().__init__(root_seed, bit_generator, spawn_key)
+        self.name = "batched"
+        self.block_size = block_size
+        self._uniforms = []
+        self._normals = []
+
+    def random(self):
+        if not self._uniforms:
+            # Blok odwrócony, aby pop() z końca listy zwracał wartości w kolejności losowania
+            self._uniforms = self.generator.random(self.block_size)[::-1].tolist()
+        return self._uniforms.pop()
+
+    def _normal(self):
+        if not self._normals:
+            self._normals = self.generator.standard_normal(self.block_size)[::-1].tolist()
+        return self._normals.pop()
+
+    def get_state(self):
+        return {"bit_generator": super().get_state(), "uniforms": list(self._uniforms),
+                "normals": list(self._normals)}
+
+    def set_state(self, state):
+        super().set_state(state["bit_generator"])
+        self._uniforms = list(state["uniforms"])
+        self._normals = list(state["normals"])
+
+
+def make_rng(backend, root_seed):
+    """Tworzy generator o podanej nazwie (jedna z RNG_BACKENDS) z ziarnem głównym."""
+    if backend == "stdlib":
+        return StdlibRandom(root_seed)
+    if backend == "pcg64":
+        return NumpyRandom(root_seed, "PCG64")
+    if backend == "philox":
+        return NumpyRandom(root_seed, "Philox")
+    if backend == "batched":
+        return BatchedRandom(root_seed)
+    raise ValueError(f"Nieznany generator losowy '{backend}'. Dostępne: {', '.join(RNG_BACKENDS)}.")
+
+
+def _numpy():
+    """Importuje NumPy przy pierwszym użyciu, więc generator "stdlib" go nie wymaga."""
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("Generatory NumPy wymagają biblioteki NumPy (pip install numpy).") from None
+        np = numpy
+    return np
+
+
+def _plain(value):
+    """Zamienia tablice NumPy w stanie generatora na listy (zapis JSON i marshal)."""
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if np is not None and isinstance(value, np.ndarray):
+        return {"__array__": value.tolist(), "dtype": str(value.dtype)}
+    return value
+
+
+def _bit_generator_state(value):
+    if isinstance(value, dict):
+        if "__array__" in value:
+            return np.array(value["__array__"], dtype=value["dtype"])
+        return {key: _bit_generator_state(item) for key, item in value.items()}
+    return value
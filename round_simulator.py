@@ -0,0 +1,82 @@
+import numpy as np
+
+from models import GOAL_SCALE, GOAL_SIGMA
+
+
+def simulate_round(tournament, matches):
+    """Rozgrywa wszystkie mecze kolejki jednym wsadowym przebiegiem na PlayerStore.
+
+    W jednej kolejce każda drużyna gra co najwyżej raz, więc mecze są od siebie
+    niezależne: wyniki, strzelców i kartki wszystkich meczów losujemy naraz.
+    Kolejność zdarzeń w meczu jest taka jak w Tournament._simulate_events
+    (gole drużyny 1, gole drużyny 2, kartki w kolejności składów), a wyniki
+    trafiają do tabel przez Tournament._apply_match_result. Losowania pochodzą
+    ze strumienia kolejki (Tournament.round_rng), więc nie zależą od wcześniejszych kolejek.
+    """
+    if not matches:
+        return
+    store = tournament.player_store
+    rng = tournament.round_rng(matches).generator
+    offsets = store.team_offsets
+
+    # Strony meczów w kolejności: mecz 0 drużyna 1, mecz 0 drużyna 2, mecz 1 drużyna 1, ...
+    sides = np.array([t.store_index for m in matches for t in (m.team1, m.team2)], dtype=np.int64)
+
+    # Aktywni zawodnicy (bez czerwonej kartki) ważeni atakiem; suma skumulowana po całym magazynie
+    red = store.columns["red_cards"][:store.size]
+    weights = np.where(red == 0, store.columns["attack"][:store.size], 0).astype(np.int64)
+    cumulative = np.concatenate(([0], np.cumsum(weights)))
+    strength = cumulative[offsets[sides + 1]] - cumulative[offsets[sides]]
+
+    scores = np.trunc(rng.normal(strength / GOAL_SCALE, GOAL_SIGMA)).astype(np.int64)
+    np.maximum(scores, 0, out=scores)
+
+    # Strzelcy: pozycja w skumulowanych wagach drużyny wskazuje od razu numer zawodnika.
+    # Drużyna bez aktywnych zawodników zachowuje wynik, ale gole nie mają strzelców.
+    goal_sides = np.repeat(np.arange(len(sides)), np.where(strength > 0, scores, 0))
+    base = cumulative[offsets[sides[goal_sides]]]
+    targets = base + rng.random(len(goal_sides)) * strength[goal_sides]
+    # Wagi są całkowite, więc przycięcie o 0.5 chroni przed zaokrągleniem na koniec przedziału
+    targets = np.minimum(targets, base + strength[goal_sides] - 0.5)
+    scorer_ids = np.searchsorted(cumulative, targets, side="right") - 1
+    np.add.at(store.columns["goals"], scorer_ids, 1)
+    goal_minutes = rng.integers(1, 91, size=len(scorer_ids))
+
+    # Kartki dla wszystkich 22 x k zawodników jednym losowaniem
+    starts = offsets[sides]
+    lengths = offsets[sides + 1] - starts
+    player_sides = np.repeat(np.arange(len(sides)), lengths)
+    side_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    player_ids = np.arange(lengths.sum()) - side_starts[player_sides] + starts[player_sides]
+    draws = rng.integers(1, 101, size=len(player_ids))
+    carded = draws < 2 * store.columns["aggression"][player_ids]
+    card_ids = player_ids[carded]
+    card_sides = player_sides[carded]
+    second_yellow = store.columns["yellow_cards"][card_ids] % 2 == 1
+    store.columns["red_cards"][card_ids[second_yellow]] += 1
+    store.columns["yellow_cards"][card_ids[~second_yellow]] += 1
+    card_minutes = rng.integers(1, 91, size=len(card_ids))
+    for team_idx in np.unique(sides[card_sides[second_yellow]]).tolist():
+        store.teams[team_idx].invalidate_strength()
+
+    if tournament.instrumentation is not None:
+        # Wyniki, strzelcy z minutami, kartki dla wszystkich zawodników i minuty kartek
+        tournament.instrumentation.count("rng.draws", len(sides) + 2 * len(scorer_ids) + len(player_ids)
+                                         + len(card_ids))
+
+    for i, match in enumerate(matches):
+        match.score1 = int(scores[2 * i])
+        match.score2 = int(scores[2 * i + 1])
+
+    players = store.players
+    for side, player_id, minute in zip(goal_sides.tolist(), scorer_ids.tolist(), goal_minutes.tolist()):
+        matches[side // 2].add_event(minute, "GOAL", players[player_id])
+    for side, player_id, minute, is_red in zip(card_sides.tolist(), card_ids.tolist(),
+                                               card_minutes.tolist(), second_yellow.tolist()):
+        if is_red:
+            matches[side // 2].add_event(minute, "RED_CARD", players[player_id], "Druga żółta")
+        else:
+            matches[side // 2].add_event(minute, "YELLOW_CARD", players[player_id])
+
+    for match in matches:
+        tournament._apply_match_result(match)
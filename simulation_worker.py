@@ -0,0 +1,110 @@
+import logging
+import time
+from types import SimpleNamespace
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from models import PlayerStatsReporter
+
+
+# Minimalny odstęp (s) między kolejnymi odświeżeniami widoków sygnałem batch_ready
+BATCH_INTERVAL = 0.1
+
+# Pola zawodnika potrzebne do raportu konsolowego
+SUMMARY_FIELDS = ("name", "first_name", "last_name", "team_name", "goals", "yellow_cards", "red_cards")
+
+
+def summary_players(tournament):
+    """Kopiuje statystyki zawodników potrzebne do raportu (wywoływać pod blokadą turnieju)."""
+    return [SimpleNamespace(**{field: getattr(p, field) for field in SUMMARY_FIELDS})
+            for p in tournament.all_players]
+
+
+def print_tournament_summary(players):
+    """Wypisuje w konsoli podsumowanie zakończonego turnieju z kopii statystyk (summary_players).
+
+    Działa na kopii, więc nie trzyma blokady turnieju potrzebnej wątkowi GUI.
+    """
+    print("\n" + "=" * 25)
+    print("TURNIEJ ZAKOŃCZONY! GENEROWANIE PODSUMOWANIA W KONSOLI...")
+    print("=" * 25)
+
+    try:
+        if players:
+            reporter = PlayerStatsReporter(players)
+            reporter.display_full_stats_table()
+            reporter.display_top_scorers()
+            reporter.display_card_offenders()
+        else:
+            print("Brak zawodników do wygenerowania raportu.")
+
+        print("\nPodsumowanie dostępne w konsoli, w której uruchomiono aplikację.")
+        print("=" * 25 + "\n")
+    except Exception as e:
+        print(f"Wystąpił nieoczekiwany błąd podczas generowania raportu: {e}")
+        logging.error(f"Błąd w raporcie konsolowym: {e}")
+
+
+class SimulationWorker(QObject):
+    """Symuluje kolejki turnieju poza wątkiem GUI (obiekt przenoszony do QThread).
+
+    rounds=None oznacza symulację do końca turnieju. Każda kolejka jest
+    rozgrywana pod blokadą turnieju, a rozegrane mecze są przekazywane do GUI
+    sygnałem batch_ready(mecze, zmiana_fazy) nie częściej niż co batch_interval
+    sekund (oraz po ostatniej kolejce), żeby szybka symulacja nie odświeżała
+    widoków po każdej kolejce.
+    """
+
+    progress = pyqtSignal(int, int, str)
+    batch_ready = pyqtSignal(list, bool)
+    finished = pyqtSignal(list, bool)
+    failed = pyqtSignal(str)
+
+    def __init__(self, tournament, lock, rounds=None, batch_interval=BATCH_INTERVAL):
+        super().__init__()
+        self.tournament = tournament
+        self.lock = lock
+        self.rounds = rounds
+        self.batch_interval = batch_interval
+        self._cancelled = False
+
+    def cancel(self):
+        """Prosi o przerwanie symulacji po bieżącej kolejce."""
+        self._cancelled = True
+
+    def run(self):
+        messages = []
+        try:
+            with self.lock:
+                remaining = self.tournament.remaining_rounds()
+            total = remaining if self.rounds is None else min(self.rounds, remaining)
+
+            pending = []
+            phase_changed = False
+            last_batch = time.monotonic()
+            for done in range(1, total + 1):
+                if self._cancelled:
+                    break
+                with self.lock:
+                    phase_before = self.tournament.phase
+                    message = self.tournament.simulate_next_round()
+                    pending.extend(self.tournament.last_round_matches)
+                    phase_changed = phase_changed or phase_before != self.tournament.phase
+                messages.append(message)
+                self.progress.emit(done, total, message)
+                now = time.monotonic()
+                if now - last_batch >= self.batch_interval:
+                    self.batch_ready.emit(pending, phase_changed)
+                    pending, phase_changed = [], False
+                    last_batch = now
+            if pending or phase_changed:
+                self.batch_ready.emit(pending, phase_changed)
+
+            with self.lock:
+                players = summary_players(self.tournament) if self.tournament.winner and messages else None
+            if players is not None:
+                print_tournament_summary(players)
+        except Exception as e:
+            logging.error(f"Błąd podczas symulacji w tle: {e}")
+            self.failed.emit(str(e))
+        self.finished.emit(messages, self._cancelled)
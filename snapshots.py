@@ -0,0 +1,235 @@
+"""Dziennik migawek turnieju: obraz bazowy, zmiany po każdej kolejce i okresowe pełne punkty kontrolne.
+
+Każda linia pliku to "rodzaj<TAB>numer<TAB>JSON", gdzie rodzaj to base
+(pełny stan Tournament.to_dict przy numerze 0), delta (zmiany po kolejce)
+albo checkpoint (pełny stan co checkpoint_every kolejek). Numer to liczba
+kolejek rozegranych od obrazu bazowego. Odczyt parsuje tylko ostatni punkt
+kontrolny przed szukaną kolejką i delty po nim. Ścieżki ".gz" są kompresowane.
+"""
+import gzip
+import json
+
+from event_log import GZIP_MAGIC, _COMPACT, _open_text
+
+SNAPSHOT_KINDS = ("base", "delta", "checkpoint")
+
+# Domyślny odstęp pełnych punktów kontrolnych (w kolejkach)
+DEFAULT_CHECKPOINT_EVERY = 8
+
+class SnapshotWriter:
+    """Zapisuje obraz bazowy turnieju, a po każdej kolejce tylko to, co się zmieniło.
+
+    Delta zawiera statystyki drużyn z rozegranych meczów (i pauzujących),
+    gole i kartki zawodników ze zdarzeń tych meczów, wyniki i zdarzenia
+    rozegranych meczów, nowe mecze (rundy szwajcarskie i pucharowe) oraz
+    fazę, kolejkę, zwycięzcę i stan generatora losowego, więc jej rozmiar
+    zależy od liczby meczów w kolejce, a nie od wielkości składów.
+    """
+
+    def __init__(self, path, tournament, checkpoint_every=DEFAULT_CHECKPOINT_EVERY, compress=None):
+        self.path = path
+        self.checkpoint_every = checkpoint_every
+        self.round_index = 0
+        self._file = _open_text(path, "w", compress)
+        self._write("base", tournament.to_dict())
+        self._track(tournament)
+
+    def _write(self, kind, data):
+        self._file.write(f"{kind}\t{self.round_index}\t{json.dumps(data, **_COMPACT)}\n")
+        self._file.flush()
+
+    def _track(self, tournament):
+        """Zapamiętuje numerację drużyn i meczów stanu, który właśnie zapisano w całości."""
+        self._team_index = {id(team): i for i, team in enumerate(tournament.teams)}
+        self._player_refs = {}  # id(zawodnika) -> (drużyna, miejsce w drużynie, zawodnik)
+        self._match_number = {}
+        for match in tournament.matches + [m for r in tournament.knockout_matches.values() for m in r]:
+            self._match_number[id(match)] = len(self._match_number)
+        self._known_matches = len(tournament.matches)
+        self._known_knockout = {name: len(r) for name, r in tournament.knockout_matches.items()}
+        self._known_byes = len(tournament.swiss_byes)
+        self._entrants = self._entrant_indices(tournament)
+        self._rng_state = tournament.rng.get_state()
+
+    def resync(self, tournament):
+        """Wiąże dziennik z nowymi obiektami turnieju w stanie ostatniego wpisu (np. po powtórce)."""
+        self._track(tournament)
+
+    def _entrant_indices(self, tournament):
+        return [self._team_index[id(t)] if t is not None else -1 for t in tournament.knockout_entrants]
+
+    def _player_ref(self, tournament, player):
+        ref = self._player_refs.get(id(player))
+        if ref is None or ref[2] is not player:  # Obiekty zawodników podmienia np. enable_player_store
+            team = tournament.find_team(player.team_name)
+            ref = self._player_refs[id(player)] = (self._team_index[id(team)], team.players.index(player), player)
+        return ref[0], ref[1]
+
+    def _match_row(self, match):
+        index = self._team_index
+        winner = index[id(match.winner)] if match.winner is not None else -1
+        return [index[id(match.team1)], index[id(match.team2)], match.round, match.phase,
+                match.score1, match.score2, winner]
+
+    def write_round(self, tournament):
+        """Dopisuje zmiany po kolejce (albo pełny punkt kontrolny co checkpoint_every kolejek)."""
+        self.round_index += 1
+        if self.checkpoint_every and self.round_index % self.checkpoint_every == 0:
+            self._write("checkpoint", tournament.to_dict())
+            self._track(tournament)
+            return
+        self._write("delta", self._delta(tournament))
+
+    def _delta(self, tournament):
+        delta = {
+            "phase": tournament.phase,
+            "current_round": tournament.current_round,
+            "winner": self._team_index[id(tournament.winner)] if tournament.winner is not None else -1,
+        }
+        # Stan głównego generatora tylko po zmianie (mecze losują z własnych strumieni)
+        rng_state = tournament.rng.get_state()
+        if rng_state != self._rng_state:
+            delta["rng"] = self._rng_state = rng_state
+
+        # Nowe mecze dopisywane są zawsze na końcu: kolejne rundy szwajcarskie albo pucharowe
+        new_matches = tournament.matches[self._known_matches:]
+        self._known_matches = len(tournament.matches)
+        new_knockout = {}
+        for name, round_matches in tournament.knockout_matches.items():
+            known = self._known_knockout.get(name, 0)
+            if len(round_matches) > known:
+                new_knockout[name] = round_matches[known:]
+                self._known_knockout[name] = len(round_matches)
+        for match in new_matches + [m for r in new_knockout.values() for m in r]:
+            self._match_number[id(match)] = len(self._match_number)
+        delta["matches"] = [self._match_row(m) for m in new_matches]
+        delta["knockout_matches"] = {name: [self._match_row(m) for m in r] for name, r in new_knockout.items()}
+
+        played = [m for m in tournament.last_round_matches if m.is_played]
+        delta["results"] = [[self._match_number[id(m)], m.score1, m.score2, self._match_row(m)[6]] for m in played]
+
+        changed_teams = {}
+        for match in played:
+            changed_teams[id(match.team1)] = match.team1
+            changed_teams[id(match.team2)] = match.team2
+        new_byes = tournament.swiss_byes[self._known_byes:]
+        self._known_byes = len(tournament.swiss_byes)
+        for team in new_byes:
+            changed_teams[id(team)] = team
+        delta["swiss_byes"] = [self._team_index[id(t)] for t in new_byes]
+        delta["teams"] = [[self._team_index[key], team.points, team.matches_played, team.wins, team.draws,
+                           team.losses, team.goals_for, team.goals_against] for key, team in changed_teams.items()]
+
+        events = []
+        changed_players = {}
+        for match in played:
+            rows = []
+            for e in match.events:
+                player = e["player"]
+                if player is None:
+                    rows.append([e["minute"], e["type"], -1, -1, e["details"]])
+                    continue
+                team_idx, player_idx = self._player_ref(tournament, player)
+                changed_players[id(player)] = (team_idx, player_idx, player)
+                rows.append([e["minute"], e["type"], team_idx, player_idx, e["details"]])
+            events.append([self._match_number[id(match)], rows])
+        delta["events"] = events
+        delta["players"] = [[ti, pi, p.goals, p.yellow_cards, p.red_cards]
+                            for ti, pi, p in changed_players.values()]
+
+        entrants = self._entrant_indices(tournament)
+        if entrants != self._entrants:
+            delta["knockout_entrants"] = self._entrants = entrants
+        return delta
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _match_rows(state):
+    """Wiersze meczów stanu w numeracji dziennika: grupowe (szwajcarskie), potem pucharowe."""
+    return state["matches"] + [row for r in state["knockout_matches"].values() for row in r]
+
+
+def apply_delta(state, delta, rows=None):
+    """Nanosi deltę na słownik stanu (Tournament.to_dict); rows to wynik _match_rows(state)."""
+    if rows is None:
+        rows = _match_rows(state)
+    events = state.setdefault("events", [[] for _ in rows])
+    for row in delta["matches"]:
+        state["matches"].append(row)
+    for name, new_rows in delta["knockout_matches"].items():
+        state["knockout_matches"].setdefault(name, []).extend(new_rows)
+    for row in delta["matches"] + [row for r in delta["knockout_matches"].values() for row in r]:
+        rows.append(row)
+        events.append([])
+
+    for number, score1, score2, winner in delta["results"]:
+        rows[number][4:7] = [score1, score2, winner]
+    for number, match_events in delta["events"]:
+        events[number] = match_events
+    teams = state["teams"]
+    for team_idx, *stats in delta["teams"]:
+        teams[team_idx]["stats"] = stats
+    for team_idx, player_idx, goals, yellows, reds in delta["players"]:
+        teams[team_idx]["players"][player_idx][5:8] = [goals, yellows, reds]
+
+    state.setdefault("swiss_byes", []).extend(delta["swiss_byes"])
+    if "knockout_entrants" in delta:
+        state["knockout_entrants"] = delta["knockout_entrants"]
+    state["phase"] = delta["phase"]
+    state["current_round"] = delta["current_round"]
+    state["winner"] = delta["winner"]
+    if "rng" in delta:
+        state["rng"][2] = delta["rng"]
+    return state
+
+
+def is_snapshot_log(path):
+    """Sprawdza, czy plik (zwykły lub gzip) jest dziennikiem migawek."""
+    with open(path, "rb") as f:
+        head = f.read(5)
+    if head[:2] == GZIP_MAGIC:
+        with gzip.open(path, "rb") as f:
+            head = f.read(5)
+    return head == b"base\t"
+
+
+def read_snapshot(path, round_index=None):
+    """Odtwarza stan turnieju po podanej liczbie kolejek (None = ostatni zapis).
+
+    Zwraca (stan, numer), gdzie stan nadaje się do Tournament.load_dict, a numer
+    to kolejka, którą faktycznie odtworzono (ostatnia zapisana, jeśli szukana
+    jest dalej). Parsowany jest tylko ostatni pełny obraz przed szukaną
+    kolejką i delty po nim.
+    """
+    start, deltas, reached = None, [], None
+    with _open_text(path, "r") as f:
+        for line in f:
+            kind, number, payload = line.split("\t", 2)
+            number = int(number)
+            if round_index is not None and number > round_index:
+                break
+            if kind == "delta":
+                deltas.append(payload)
+            elif kind in ("base", "checkpoint"):
+                start, deltas = payload, []
+            else:
+                raise ValueError(f"Nieznany rodzaj wpisu dziennika migawek '{kind}'.")
+            reached = number
+    if start is None:
+        raise ValueError("Plik nie zawiera obrazu bazowego dziennika migawek.")
+
+    state = json.loads(start)
+    rows = _match_rows(state)
+    for payload in deltas:
+        apply_delta(state, json.loads(payload), rows)
+    return state, reached
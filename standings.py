@@ -0,0 +1,108 @@
+DEFAULT_TIE_BREAKERS = ("points", "goal_difference", "goals_for")
+
+# Kryteria tabeli: większa wartość oznacza wyższe miejsce
+CRITERIA = {
+    "points": lambda team: team.points,
+    "goal_difference": lambda team: team.goal_difference,
+    "goals_for": lambda team: team.goals_for,
+    "goals_against": lambda team: -team.goals_against,
+    "wins": lambda team: team.wins,
+}
+
+HEAD_TO_HEAD = "head_to_head"
+
+
+class Standings:
+    """Tabele grup utrzymywane przyrostowo przez Team.add_match_result.
+
+    Każda grupa przechowuje listę drużyn już posortowaną według kryteriów
+    poprzedzających ewentualne "head_to_head". Po meczu drużyna jest tylko
+    przesuwana o tyle pozycji, o ile zmieniło się jej miejsce, zamiast sortować
+    całą grupę od nowa. Remisy rozstrzygane bezpośrednimi meczami liczone są
+    przy odczycie, wyłącznie w obrębie bloków drużyn z równym kluczem.
+    Drużyny nierozróżnialne według kryteriów zachowują kolejność z losowania grup.
+    """
+
+    def __init__(self, groups, tie_breakers=DEFAULT_TIE_BREAKERS):
+        for name in tie_breakers:
+            if name != HEAD_TO_HEAD and name not in CRITERIA:
+                raise ValueError(f"Nieznane kryterium tabeli: '{name}'.")
+        self.tie_breakers = tuple(tie_breakers)
+        if HEAD_TO_HEAD in self.tie_breakers:
+            split = self.tie_breakers.index(HEAD_TO_HEAD)
+            self._primary = [CRITERIA[name] for name in self.tie_breakers[:split]]
+            self._after_head_to_head = [CRITERIA[name] for name in self.tie_breakers[split + 1:]]
+        else:
+            self._primary = [CRITERIA[name] for name in self.tie_breakers]
+            self._after_head_to_head = None
+
+        self._rankings = {}
+        self._group_of = {}
+        self._seed = {}
+        self._head_to_head = {}
+        for group_name, teams in groups.items():
+            self._rankings[group_name] = list(teams)
+            for seed, team in enumerate(teams):
+                self._group_of[id(team)] = group_name
+                self._seed[id(team)] = seed
+                team.standings = self
+            self._rankings[group_name].sort(key=self._key, reverse=True)
+
+    def _key(self, team):
+        return tuple(criterion(team) for criterion in self._primary) + (-self._seed[id(team)],)
+
+    def record_result(self, team, goals_for, goals_against, opponent=None):
+        """Uwzględnia wynik meczu drużyny (po aktualizacji jej statystyk)."""
+        group_name = self._group_of.get(id(team))
+        if group_name is None:
+            return
+        if opponent is not None:
+            record = self._head_to_head.setdefault((id(team), id(opponent)), [0, 0, 0])
+            record[0] += 3 if goals_for > goals_against else 1 if goals_for == goals_against else 0
+            record[1] += goals_for
+            record[2] += goals_against
+
+        ranking = self._rankings[group_name]
+        pos = ranking.index(team)
+        key = self._key(team)
+        while pos > 0 and self._key(ranking[pos - 1]) < key:
+            ranking[pos - 1], ranking[pos] = ranking[pos], ranking[pos - 1]
+            pos -= 1
+        while pos < len(ranking) - 1 and self._key(ranking[pos + 1]) > key:
+            ranking[pos + 1], ranking[pos] = ranking[pos], ranking[pos + 1]
+            pos += 1
+
+    def ranking(self, group_name):
+        """Zwraca drużyny grupy od pierwszego do ostatniego miejsca."""
+        ranking = list(self._rankings[group_name])
+        if self._after_head_to_head is None:
+            return ranking
+
+        start = 0
+        while start < len(ranking):
+            primary = self._key(ranking[start])[:-1]
+            stop = start + 1
+            while stop < len(ranking) and self._key(ranking[stop])[:-1] == primary:
+                stop += 1
+            if stop - start > 1:
+                ranking[start:stop] = self._resolve_tie(ranking[start:stop])
+            start = stop
+        return ranking
+
+    def _resolve_tie(self, block):
+        """Porządkuje drużyny z równym kluczem według meczów między nimi."""
+        def key(team):
+            points = goals_for = goals_against = 0
+            for opponent in block:
+                record = self._head_to_head.get((id(team), id(opponent)))
+                if record:
+                    points += record[0]
+                    goals_for += record[1]
+                    goals_against += record[2]
+            return ((points, goals_for - goals_against, goals_for)
+                    + tuple(criterion(team) for criterion in self._after_head_to_head)
+                    + (-self._seed[id(team)],))
+        return sorted(block, key=key, reverse=True)
+
+    def group_names(self):
+        return list(self._rankings)
@@ -0,0 +1,96 @@
+import json
+import os
+import struct
+import zlib
+
+# Nagłówek: magia, wersja formatu, liczba sekcji; potem tabela sekcji
+# (nazwa 8 bajtów, flagi, przesunięcie, długość) i dane sekcji (JSON w UTF-8).
+# Wersja 1 serializowała sekcje przez marshal i nie jest już wczytywana.
+MAGIC = b"STRN"
+FORMAT_VERSION = 2
+_HEADER = struct.Struct("<4sHH")
+_SECTION = struct.Struct("<8sIQQ")
+_FLAG_ZLIB = 1
+_KNOWN_FLAGS = _FLAG_ZLIB
+
+# Klucze stanu trafiające do osobnej sekcji, którą można pominąć przy wczytywaniu
+EVENT_KEYS = ("events",)
+
+
+def is_binary_state(path):
+    """Sprawdza, czy plik zaczyna się od nagłówka zapisu binarnego."""
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def write_binary_state(path, state, compress=True):
+    """Zapisuje słownik stanu (Tournament.to_dict) w zwartym formacie binarnym.
+
+    Dane każdej sekcji to zwarty JSON (niezależny od wersji Pythona i bezpieczny
+    przy wczytywaniu obcych plików), opcjonalnie skompresowany zlib. Historia
+    zdarzeń leży w osobnej sekcji "events".
+    """
+    sections = {
+        "state": {k: v for k, v in state.items() if k not in EVENT_KEYS},
+        "events": {k: state[k] for k in EVENT_KEYS if k in state},
+    }
+    payloads = []
+    for name, data in sections.items():
+        payload = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        flags = 0
+        if compress:
+            payload = zlib.compress(payload, 1)
+            flags |= _FLAG_ZLIB
+        payloads.append((name.encode("ascii"), flags, payload))
+
+    offset = _HEADER.size + _SECTION.size * len(payloads)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(payloads)))
+        for name, flags, payload in payloads:
+            f.write(_SECTION.pack(name, flags, offset, len(payload)))
+            offset += len(payload)
+        for _, _, payload in payloads:
+            f.write(payload)
+
+
+def read_binary_state(path, include_events=True):
+    """Wczytuje słownik stanu zapisany przez write_binary_state.
+
+    Przy include_events=False sekcja zdarzeń nie jest nawet odczytywana z dysku.
+    """
+    state = {}
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError("Plik nie jest zapisem binarnym turnieju.")
+        magic, version, count = _HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError("Plik nie jest zapisem binarnym turnieju.")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Nieobsługiwana wersja zapisu binarnego: {version} (obsługiwana: {FORMAT_VERSION}).")
+        table_end = _HEADER.size + _SECTION.size * count
+        if table_end > size:
+            raise ValueError("Uszkodzony zapis binarny: niepełna tabela sekcji.")
+        table = [_SECTION.unpack(f.read(_SECTION.size)) for _ in range(count)]
+        for raw_name, flags, offset, length in table:
+            if flags & ~_KNOWN_FLAGS or offset < table_end or offset + length > size:
+                raise ValueError("Uszkodzony zapis binarny: nieprawidłowy wpis tabeli sekcji.")
+            try:
+                name = raw_name.rstrip(b"\0").decode("ascii")
+            except UnicodeDecodeError:
+                raise ValueError("Uszkodzony zapis binarny: nieprawidłowa nazwa sekcji.") from None
+            if name == "events" and not include_events:
+                continue
+            f.seek(offset)
+            payload = f.read(length)
+            try:
+                if flags & _FLAG_ZLIB:
+                    payload = zlib.decompress(payload)
+                data = json.loads(payload.decode("utf-8"))
+            except (zlib.error, UnicodeDecodeError, json.JSONDecodeError) as e:
+                raise ValueError(f"Uszkodzona sekcja '{name}' zapisu binarnego: {e}") from None
+            if not isinstance(data, dict):
+                raise ValueError(f"Uszkodzona sekcja '{name}' zapisu binarnego.")
+            state.update(data)
+    return state
@@ -0,0 +1,97 @@
+# Punkty za wolny los w rundzie szwajcarskiej (jak za zwycięstwo)
+BYE_POINTS = 3
+
+
+def pick_bye(ranked, had_bye):
+    """Wybiera pauzującego: najniżej sklasyfikowanego, który jeszcze nie pauzował.
+
+    Gdy wszyscy już pauzowali, pauzuje ostatni w klasyfikacji.
+    """
+    for item in reversed(ranked):
+        if item not in had_bye:
+            return item
+    return ranked[-1]
+
+
+def swiss_pairings(ranked, opponents, had_bye=(), max_steps=None):
+    """Kojarzy pary rundy szwajcarskiej bez powtórzeń meczów.
+
+    ranked to uczestnicy w kolejności klasyfikacji (najlepszy pierwszy),
+    opponents - mapowanie uczestnik -> zbiór dotychczasowych rywali, had_bye -
+    zbiór tych, którzy już pauzowali. Zwraca (lista par, pauzujący lub None).
+
+    Najwyżej sklasyfikowany wolny uczestnik dostaje najbliższego w tabeli
+    rywala, z którym jeszcze nie grał (system Monrad: 1-2, 3-4, ...), więc pary
+    powstają w obrębie grup punktowych, a nadmiarowi schodzą do niższej grupy.
+    Wolni uczestnicy są trzymani na liście dwukierunkowej, więc zwykle
+    skojarzenie jest liniowe; gdy na końcu tabeli brakuje poprawnego rywala,
+    algorytm cofa ostatnie decyzje. Po max_steps krokach (domyślnie 20 * n)
+    resztę par tworzy bez sprawdzania powtórzeń, zamiast szukać dalej.
+    """
+    ranked = list(ranked)
+    bye = None
+    if len(ranked) % 2:
+        bye = pick_bye(ranked, had_bye)
+        ranked.remove(bye)
+
+    n = len(ranked)
+    if max_steps is None:
+        max_steps = 20 * n + 100
+    head = n  # Wartownik listy wolnych uczestników
+    nxt = list(range(1, n + 1)) + [0]
+    prv = [n] + list(range(n))
+
+    def unlink(i):
+        nxt[prv[i]] = nxt[i]
+        prv[nxt[i]] = prv[i]
+
+    def relink(i):
+        nxt[prv[i]] = i
+        prv[nxt[i]] = i
+
+    def find_rival(a, start):
+        played = opponents[ranked[a]]
+        c = start
+        while c != head and ranked[c] in played:
+            c = nxt[c]
+        return c
+
+    stack = []  # Skojarzone pary (a, b) jako pozycje w ranked, w kolejności wyboru
+    steps = 0
+    a = None
+    candidate = None
+    while True:
+        if a is None:
+            if nxt[head] == head:
+                break
+            a = nxt[head]
+            unlink(a)
+            candidate = nxt[a]
+        steps += 1
+        if steps > max_steps:
+            # Awaryjnie: zostawiamy dotychczasowe pary, reszta po kolei (z możliwymi powtórkami)
+            relink(a)
+            rest = []
+            i = nxt[head]
+            while i != head:
+                rest.append(i)
+                i = nxt[i]
+            stack.extend(zip(rest[::2], rest[1::2]))
+            break
+        b = find_rival(a, candidate)
+        if b != head:
+            unlink(b)
+            stack.append((a, b))
+            a = None
+            continue
+        # Brak rywala dla a: cofamy ostatnią parę i szukamy dla jej lidera kolejnego kandydata
+        relink(a)
+        if not stack:
+            # Nie da się uniknąć powtórki: kojarzymy wszystkich po kolei
+            stack = [(i, i + 1) for i in range(0, n, 2)]
+            break
+        a, previous = stack.pop()
+        relink(previous)
+        candidate = nxt[previous]
+
+    return [(ranked[a], ranked[b]) for a, b in stack], bye
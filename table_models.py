@@ -0,0 +1,69 @@
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+
+class RowTableModel(QAbstractTableModel):
+    """Model tabeli tylko do odczytu, przechowujący wiersze jako krotki.
+
+    set_rows porównuje nowe wiersze z poprzednimi i zgłasza widokowi wyłącznie
+    zmienione wiersze (dataChanged) oraz wiersze dodane lub usunięte na końcu,
+    więc widok nie przebudowuje całej tabeli po każdej kolejce.
+    """
+
+    def __init__(self, headers, parent=None):
+        super().__init__(parent)
+        self._headers = list(headers)
+        self._rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and index.isValid():
+            return str(self._rows[index.row()][index.column()])
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self._headers[section]
+        return super().headerData(section, orientation, role)
+
+    def set_rows(self, rows):
+        """Podmienia zawartość tabeli, emitując sygnały tylko dla zmienionych wierszy."""
+        rows = [tuple(row) for row in rows]
+        old_count, new_count = len(self._rows), len(rows)
+
+        if new_count < old_count:
+            self.beginRemoveRows(QModelIndex(), new_count, old_count - 1)
+            del self._rows[new_count:]
+            self.endRemoveRows()
+
+        first_changed = None
+        for i in range(min(old_count, new_count)):
+            if self._rows[i] != rows[i]:
+                self._rows[i] = rows[i]
+                if first_changed is None:
+                    first_changed = i
+            elif first_changed is not None:
+                self._emit_changed(first_changed, i - 1)
+                first_changed = None
+        if first_changed is not None:
+            self._emit_changed(first_changed, min(old_count, new_count) - 1)
+
+        if new_count > old_count:
+            self.append_rows(rows[old_count:])
+
+    def append_rows(self, rows):
+        """Dopisuje wiersze na końcu tabeli."""
+        rows = [tuple(row) for row in rows]
+        if not rows:
+            return
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def _emit_changed(self, first_row, last_row):
+        self.dataChanged.emit(self.index(first_row, 0), self.index(last_row, len(self._headers) - 1))
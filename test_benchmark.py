@@ -0,0 +1,46 @@
+import unittest
+import json
+from benchmark import compare, percentile, run_suite, summarize, SCHEMA_VERSION
+
+
+def suite_result(medians):
+    """Minimalny wynik run_suite z podanymi medianami."""
+    return {"schema": SCHEMA_VERSION, "results": {key: {"median": value} for key, value in medians.items()}}
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_summary_statistics(self):
+        """Testuje percentyle z interpolacją i statystyki próbki."""
+        self.assertEqual(percentile([1.0, 2.0, 3.0, 4.0, 5.0], 50), 3.0)
+        self.assertAlmostEqual(percentile([1.0, 2.0, 3.0, 4.0, 5.0], 90), 4.6)
+        stats = summarize([0.3, 0.1, 0.2])
+        self.assertEqual((stats["min"], stats["median"], stats["max"]), (0.1, 0.2, 0.3))
+        self.assertAlmostEqual(stats["mean"], 0.2)
+        self.assertEqual(stats["samples"], [0.3, 0.1, 0.2])
+
+    def test_compare_flags_regressions(self):
+        """Testuje statusy porównania: regresja, poprawa, bez zmian, nowe i brakujące przypadki."""
+        baseline = suite_result({"a[16]": 1.0, "b[16]": 1.0, "c[16]": 1.0, "gone[16]": 1.0})
+        current = suite_result({"a[16]": 1.2, "b[16]": 0.5, "c[16]": 1.05, "new[16]": 1.0})
+        statuses = {row[0]: row[4] for row in compare(baseline, current, threshold=0.1)}
+        self.assertEqual(statuses, {"a[16]": "regression", "b[16]": "improvement", "c[16]": "ok",
+                                    "gone[16]": "missing", "new[16]": "new"})
+        with self.assertRaises(ValueError):
+            compare({"schema": 0, "results": {}}, current)
+
+    def test_run_suite_produces_json_results(self):
+        """Testuje krótki przebieg zestawu: wybrane przypadki, powtórzenia i zapis do JSON."""
+        result = run_suite(scales=(16,), warmup=0, repeats=2, name_filter="simulate_next_round",
+                           include_gui=False)
+        self.assertEqual(sorted(result["results"]), ["simulate_next_round.group[16]",
+                                                     "simulate_next_round.knockout[16]",
+                                                     "simulate_next_round.swiss[16]"])
+        for stats in result["results"].values():
+            self.assertEqual(stats["repeats"], 2)
+            self.assertLessEqual(stats["min"], stats["p95"])
+        self.assertEqual(json.loads(json.dumps(result))["results"].keys(), result["results"].keys())
+
+
+if __name__ == '__main__':
+    unittest.main()
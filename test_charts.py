@@ -0,0 +1,47 @@
+import unittest
+import random
+from models import Tournament
+from charts import ChartCache, figure_png, render_scorers_chart, scorer_chart_rows
+
+try:
+    import matplotlib  # noqa: F401
+except ImportError:
+    matplotlib = None
+
+
+class TestCharts(unittest.TestCase):
+
+    def test_scorer_chart_rows(self):
+        """Testuje, czy dane wykresu to najlepsi strzelcy z rankingu turnieju."""
+        random.seed(5)
+        tournament = Tournament(seed=5)
+        tournament.generate_random_tournament()
+        self.assertEqual(scorer_chart_rows(tournament.leaderboards), [])
+        tournament.simulate_next_round()
+        rows = scorer_chart_rows(tournament.leaderboards)
+        top = tournament.leaderboards.goals.top(10)
+        self.assertEqual(rows, [(p.name, p.goals) for p in top])
+
+    @unittest.skipIf(matplotlib is None, "Wykres wymaga matplotlib")
+    def test_render_to_png_in_memory(self):
+        """Testuje rysowanie wykresu do PNG w pamięci."""
+        figure = render_scorers_chart([("Jan Kowalski", 3), ("Adam Nowak", 1)])
+        png = figure_png(figure)
+        self.assertTrue(png.startswith(b"\x89PNG"))
+        self.assertEqual([label.get_text() for label in figure.axes[0].get_yticklabels()],
+                         ["Jan Kowalski", "Adam Nowak"])
+
+    def test_cache_keyed_by_version(self):
+        """Testuje, czy zapamiętany wykres jest zwracany tylko dla tego samego klucza."""
+        cache = ChartCache()
+        self.assertIsNone(cache.get(1))
+        figure = object()
+        cache.store(1, figure, b"png")
+        self.assertEqual(cache.get(1), (figure, b"png"))
+        self.assertIsNone(cache.get(2))
+        cache.clear()
+        self.assertIsNone(cache.get(1))
+
+
+if __name__ == '__main__':
+    unittest.main()
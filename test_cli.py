@@ -0,0 +1,36 @@
+import unittest
+import os
+import subprocess
+import sys
+import cli
+from models import Tournament
+
+
+class TestCli(unittest.TestCase):
+
+    def setUp(self):
+        """Ustala nazwę pliku stanu używanego przez testy."""
+        self.state_filename = "test_cli_state.trn"
+
+    def tearDown(self):
+        """Usuwa plik stanu po teście."""
+        if os.path.exists(self.state_filename):
+            os.remove(self.state_filename)
+
+    def test_generate_and_simulate_to_end(self):
+        """Testuje generowanie i symulację turnieju do końca z wiersza poleceń."""
+        self.assertEqual(cli.main(["generate", "--out", self.state_filename, "--seed", "1"]), 0)
+        self.assertEqual(cli.main(["simulate", "--state", self.state_filename, "--out", self.state_filename]), 0)
+        tournament = Tournament()
+        tournament.load_from_file(self.state_filename)
+        self.assertIsNotNone(tournament.winner)
+
+    def test_cli_does_not_import_gui_or_plotting(self):
+        """Testuje, czy CLI nie importuje PyQt6 ani bibliotek wykresów."""
+        code = "import sys, cli; print(any(m.split('.')[0] in ('PyQt6', 'matplotlib', 'seaborn') for m in sys.modules))"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.strip(), "False")
+
+
+if __name__ == '__main__':
+    unittest.main()
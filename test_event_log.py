@@ -0,0 +1,53 @@
+import unittest
+import os
+import random
+from models import Tournament
+from event_log import EventLogWriter, read_events
+
+
+class TestEventLog(unittest.TestCase):
+
+    def setUp(self):
+        """Tworzy losowy, rozpoczęty turniej."""
+        random.seed(9)
+        self.tournament = Tournament()
+        self.tournament.generate_random_tournament()
+        self.filenames = []
+
+    def tearDown(self):
+        """Usuwa pliki dziennika utworzone w teście."""
+        for filename in self.filenames:
+            if os.path.exists(filename):
+                os.remove(filename)
+
+    def _simulate_with_log(self, filename):
+        self.filenames.append(filename)
+        with EventLogWriter(filename, buffer_size=16) as sink:
+            self.tournament.attach_event_sink(sink)
+            while not self.tournament.winner:
+                self.tournament.simulate_next_round()
+            self.tournament.detach_event_sink()
+
+    def test_all_events_are_streamed(self):
+        """Testuje, czy każde zdarzenie trafia do dziennika w kolejności generowania."""
+        self._simulate_with_log("test_events.jsonl")
+        all_matches = self.tournament.matches + [m for r in self.tournament.knockout_matches.values() for m in r]
+        expected = sum(len(m.events) for m in all_matches)
+        records = list(read_events("test_events.jsonl"))
+        self.assertEqual(len(records), expected)
+        goals = list(read_events("test_events.jsonl", event_type="GOAL"))
+        self.assertEqual(len(goals), sum(p.goals for p in self.tournament.all_players))
+        self.assertTrue(all(isinstance(r["player"], str) for r in goals))
+
+    def test_gzip_log_and_filters(self):
+        """Testuje zapis z kompresją gzip i filtrowanie po drużynie."""
+        self._simulate_with_log("test_events.jsonl.gz")
+        team_name = self.tournament.winner.name
+        records = list(read_events("test_events.jsonl.gz", team=team_name, phase="KNOCKOUT"))
+        self.assertTrue(all(team_name in (r["team1"], r["team2"]) for r in records))
+        with open("test_events.jsonl.gz", "rb") as f:
+            self.assertEqual(f.read(2), b"\x1f\x8b")
+
+
+if __name__ == '__main__':
+    unittest.main()
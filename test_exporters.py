@@ -0,0 +1,106 @@
+import unittest
+import csv
+import gzip
+import json
+import os
+import random
+from models import Tournament
+from exporters import export_tournament, write_npz, write_table
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TestExporters(unittest.TestCase):
+
+    def setUp(self):
+        """Tworzy losowy, rozegrany do końca turniej."""
+        random.seed(21)
+        self.tournament = Tournament()
+        self.tournament.generate_random_tournament()
+        while not self.tournament.winner:
+            self.tournament.simulate_next_round()
+        self.filenames = []
+
+    def tearDown(self):
+        """Usuwa pliki utworzone w teście."""
+        for filename in self.filenames:
+            if os.path.exists(filename):
+                os.remove(filename)
+
+    def _file(self, filename):
+        self.filenames.append(filename)
+        return filename
+
+    def test_teams_json_matches_team_dicts(self):
+        """Testuje, czy zwarty eksport drużyn zawiera to samo co Team.to_dict()."""
+        filename = self._file("test_export_teams.json")
+        self.tournament.export_teams_to_json(filename)
+        with open(filename, encoding="utf-8") as f:
+            data = json.load(f)
+        self.assertEqual(data, [team.to_dict() for team in self.tournament.teams])
+
+    def test_players_csv_and_gzip_jsonl(self):
+        """Testuje eksport zawodników do CSV oraz do JSONL skompresowanego gzipem."""
+        players = [p for team in self.tournament.teams for p in team.players]
+        filename = self._file("test_export_players.csv")
+        self.assertEqual(write_table(self.tournament, "players", filename), len(players))
+        with open(filename, encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual([row["first_name"] for row in rows], [p.first_name for p in players])
+        self.assertEqual(sum(int(row["goals"]) for row in rows), sum(p.goals for p in players))
+
+        filename = self._file("test_export_players.jsonl.gz")
+        export_tournament(self.tournament, filename, "players")
+        with gzip.open(filename, "rt", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([r["player_id"] for r in records], [p.player_id for p in players])
+
+    def test_matches_and_events(self):
+        """Testuje eksport meczów (z rundami pucharowymi) i wszystkich zdarzeń."""
+        t = self.tournament
+        all_matches = t.matches + [m for r in t.knockout_matches.values() for m in r]
+        filename = self._file("test_export_matches.json")
+        export_tournament(t, filename, "matches")
+        with open(filename, encoding="utf-8") as f:
+            matches = json.load(f)
+        self.assertEqual(len(matches), len(all_matches))
+        self.assertEqual(matches[-1]["winner"], t.winner.name)
+
+        filename = self._file("test_export_events.jsonl")
+        message = export_tournament(t, filename, "events")
+        with open(filename, encoding="utf-8") as f:
+            events = [json.loads(line) for line in f]
+        self.assertIn(str(len(events)), message)
+        self.assertEqual(len(events), sum(len(m.events) for m in all_matches))
+        self.assertEqual(sum(e["type"] == "GOAL" for e in events), sum(p.goals for p in t.all_players))
+
+    def test_unknown_table_and_format(self):
+        """Testuje błędy dla nieznanej tabeli i formatu."""
+        with self.assertRaises(ValueError):
+            write_table(self.tournament, "referees", "x.csv")
+        with self.assertRaises(ValueError):
+            export_tournament(self.tournament, "x.xml", fmt="xml")
+
+    @unittest.skipIf(np is None, "Eksport .npz wymaga NumPy")
+    def test_npz_columns(self):
+        """Testuje kolumny .npz, także przy statystykach w magazynie kolumnowym."""
+        t = self.tournament
+        for store in (False, True):
+            if store:
+                t.enable_player_store()
+            players = [p for team in t.teams for p in team.players]
+            filename = self._file("test_export_stats.npz")
+            write_npz(t, filename)
+            with np.load(filename) as data:
+                self.assertEqual(data["players/goals"].tolist(), [p.goals for p in players])
+                self.assertEqual(data["players/player_id"].tolist(), [p.player_id for p in players])
+                self.assertEqual(data["teams/points"].tolist(), [team.points for team in t.teams])
+                self.assertEqual(int((data["matches/score1"] >= 0).sum()),
+                                 len(t.matches) + sum(len(r) for r in t.knockout_matches.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
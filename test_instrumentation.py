@@ -0,0 +1,74 @@
+import unittest
+from models import Tournament
+from instrumentation import ProfileCapture
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def play(self, instrumented, player_store=False):
+        tournament = Tournament(seed=6)
+        if instrumented:
+            tournament.enable_instrumentation()
+        tournament.generate_random_tournament()
+        if player_store:
+            tournament.enable_player_store()
+        while not tournament.winner:
+            tournament.simulate_next_round()
+        return tournament
+
+    def test_disabled_by_default_and_results_unchanged(self):
+        """Testuje, czy pomiar jest domyślnie wyłączony i nie zmienia przebiegu turnieju."""
+        plain = self.play(instrumented=False)
+        self.assertIsNone(plain.instrumentation)
+        measured = self.play(instrumented=True)
+        self.assertEqual(measured.to_dict(), plain.to_dict())
+        instrumentation = measured.disable_instrumentation()
+        self.assertIsNone(measured.instrumentation)
+        self.assertIsNotNone(instrumentation)
+
+    def test_timers_and_counters(self):
+        """Testuje stopery etapów oraz liczniki meczów, zdarzeń i losowań."""
+        tournament = self.play(instrumented=True)
+        stats = tournament.instrumentation.to_dict()
+        for name in ("setup.generate", "schedule.group_stage", "round.group", "round.knockout",
+                     "match.score_draw", "match.events", "match.standings", "bracket.create", "bracket.round"):
+            self.assertIn(name, stats["timers"])
+        self.assertEqual(stats["timers"]["round.group"]["calls"], tournament.num_group_rounds)
+        matches = tournament.matches + [m for r in tournament.knockout_matches.values() for m in r]
+        self.assertEqual(stats["counters"]["matches"], len(matches))
+        self.assertEqual(stats["timers"]["match.score_draw"]["calls"], len(matches))
+        events = sum(value for name, value in stats["counters"].items() if name.startswith("events."))
+        self.assertEqual(events, sum(len(m.events) for m in matches))
+        self.assertGreater(stats["counters"]["rng.draws"], 2 * len(matches))
+        self.assertIn("round.group", tournament.instrumentation.format_report())
+
+        tournament.instrumentation.reset()
+        self.assertEqual(tournament.instrumentation.to_dict(), {"timers": {}, "counters": {}})
+
+    def test_columnar_rounds_count_draws(self):
+        """Testuje liczniki przy wsadowej symulacji na magazynie kolumnowym."""
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            self.skipTest("NumPy nie jest zainstalowany")
+        counters = self.play(instrumented=True, player_store=True).instrumentation.counters
+        self.assertGreater(counters["rng.draws"], 0)
+        self.assertGreater(counters["events.GOAL"], 0)
+
+    def test_profile_capture(self):
+        """Testuje profilowanie wycinka kodu przez cProfile i tracemalloc."""
+        tournament = Tournament(seed=1)
+        tournament.generate_random_tournament()
+        with tournament.profile("cprofile") as capture:
+            tournament.simulate_next_round()
+        self.assertIn("simulate_next_round", capture.report())
+        with ProfileCapture("tracemalloc") as capture:
+            tournament.simulate_next_round()
+        self.assertIsNotNone(capture.snapshot)
+        self.assertTrue(capture.report(5))
+        with self.assertRaises(ValueError):
+            ProfileCapture("perf")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+import os
+import random
+from models import Player, Tournament
+from leaderboard import Leaderboard
+
+
+def sorted_ranking(players, key):
+    """Ranking liczony od zera, tak jak wcześniej w GUI i raportach (stabilne sortowanie)."""
+    return sorted([p for p in players if key(p) > 0], key=key, reverse=True)
+
+
+class TestLeaderboard(unittest.TestCase):
+
+    def assert_matches_sorting(self, tournament):
+        players = tournament.all_players
+        boards = tournament.leaderboards
+        self.assertEqual(boards.goals.top(), sorted_ranking(players, lambda p: p.goals))
+        self.assertEqual(boards.yellow_cards.top(), sorted_ranking(players, lambda p: p.yellow_cards))
+        self.assertEqual(boards.red_cards.top(), sorted_ranking(players, lambda p: p.red_cards))
+        self.assertEqual(boards.card_points.top(5),
+                         sorted_ranking(players, lambda p: p.red_cards * 3 + p.yellow_cards)[:5])
+        max_goals = max(p.goals for p in players)
+        self.assertEqual(tournament.top_scorer, [p for p in players if p.goals == max_goals])
+
+    def test_leaderboards_follow_match_events(self):
+        """Testuje, czy rankingi aktualizowane zdarzeniami zgadzają się z sortowaniem po każdej kolejce."""
+        random.seed(12)
+        tournament = Tournament()
+        tournament.generate_random_tournament()
+        self.assertEqual(tournament.top_scorer, [])
+        while not tournament.winner:
+            tournament.simulate_next_round()
+            self.assert_matches_sorting(tournament)
+
+        filename = "test_leaderboard_save.trn"
+        tournament.save_to_file(filename)
+        loaded = Tournament()
+        loaded.load_from_file(filename)
+        os.remove(filename)
+        self.assert_matches_sorting(loaded)
+
+    def test_leaderboards_with_player_store(self):
+        """Testuje rankingi przy wsadowej symulacji na magazynie kolumnowym."""
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            self.skipTest("NumPy nie jest zainstalowany")
+        random.seed(13)
+        tournament = Tournament()
+        tournament.generate_random_tournament()
+        tournament.enable_player_store()
+        while not tournament.winner:
+            tournament.simulate_next_round()
+        self.assert_matches_sorting(tournament)
+
+    def test_update_moves_player_between_buckets(self):
+        """Testuje przesunięcia w górę i w dół oraz remisy rozstrzygane kolejnością rejestracji."""
+        a, b, c = (Player(name, "Test", "T", 5, 5, 5) for name in ("A", "B", "C"))
+        board = Leaderboard(lambda p: p.goals, [a, b, c])
+        c.goals = 2
+        board.update(c)
+        a.goals = 2
+        board.update(a)
+        b.goals = 1
+        board.update(b)
+        self.assertEqual(board.top(), [a, c, b])
+        self.assertEqual(board.top(1), [a])
+        self.assertEqual(board.leaders(), [a, c])
+        c.goals = 0
+        board.update(c)
+        self.assertEqual(board.top(), [a, b])
+        self.assertEqual(board.max_value, 2)
+        self.assertEqual(len(board), 2)
+
+    def test_random_moves_keep_buckets_consistent(self):
+        """Testuje leniwe usuwanie z kubełków przy losowych zmianach wartości w obie strony."""
+        rng = random.Random(7)
+        players = [Player(str(i), "Test", "T", 5, 5, 5) for i in range(200)]
+        board = Leaderboard(lambda p: p.goals, players)
+        for step in range(5000):
+            player = rng.choice(players)
+            player.goals = rng.choice((0, 1, 1, 2, 3))
+            board.update(player)
+            if step % 250 == 0:
+                self.assertEqual(board.top(), sorted_ranking(players, lambda p: p.goals))
+        self.assertEqual(board.top(), sorted_ranking(players, lambda p: p.goals))
+        self.assertEqual(len(board), sum(p.goals > 0 for p in players))
+        self.assertTrue(all(len(bucket) <= 2 * board._sizes[value] + 8 for value, bucket in board._buckets.items()))
+
+    def test_version_changes_only_with_ranking(self):
+        """Testuje, czy wersja rankingu zmienia się tylko przy zmianie wartości zawodnika."""
+        a, b = (Player(name, "Test", "T", 5, 5, 5) for name in ("A", "B"))
+        board = Leaderboard(lambda p: p.goals, [a, b])
+        version = board.version
+        board.update(a)
+        self.assertEqual(board.version, version)
+        a.goals = 1
+        board.update(a)
+        self.assertNotEqual(board.version, version)
+        self.assertNotEqual(Leaderboard(lambda p: p.goals, [a, b]).version, board.version)
+
+
+if __name__ == '__main__':
+    unittest.main()
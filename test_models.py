@@ -1,7 +1,7 @@
 import unittest
 import os
 import random
-from models import Player, Team, Tournament
+from models import Player, Team, Tournament, TournamentFormat, bracket_order
 import time
 
 
@@ -56,6 +56,21 @@ class TestTournamentModels(unittest.TestCase):
         self.assertEqual(team.total_attack, 17)
         self.assertEqual(team.total_defense, 13)
 
+    def test_team_strength_cache_invalidation(self):
+        """Testuje, czy zapamiętana siła drużyny odświeża się po zmianie składu i czerwonej kartce."""
+        team = Team("Pamięć")
+        team.add_player("Gracz", "Jeden")
+        attack_before = team.total_attack
+        self.assertEqual(attack_before, team.players[0].attack)
+        team.add_player("Gracz", "Dwa")
+        self.assertEqual(team.total_attack, attack_before + team.players[1].attack)
+        team.register_red_card(team.players[1])
+        self.assertEqual(team.total_attack, attack_before)
+        self.assertEqual(team.active_players, [team.players[0]])
+        team.remove_player("Gracz Jeden")
+        self.assertEqual(team.total_attack, 0)
+        self.assertEqual(team.scorer_weights, [])
+
     def test_tournament_add_team(self):
         """Testuje dodawanie drużyny do turnieju za pomocą jej nazwy."""
         self.tournament.add_team("FC Python")
@@ -69,6 +84,83 @@ class TestTournamentModels(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.tournament.add_team("FC Unikat")
 
+    def test_team_index_is_case_insensitive_and_follows_changes(self):
+        """Testuje wyszukiwanie drużyn bez rozróżniania wielkości liter po dodaniu, usunięciu i resecie."""
+        self.tournament.add_team("FC Unikat")
+        with self.assertRaises(ValueError):
+            self.tournament.add_team("fc UNIKAT")
+        self.assertIs(self.tournament.find_team("fc unikat"), self.tournament.teams[0])
+        self.tournament.remove_team("FC UNIKAT")
+        self.assertIsNone(self.tournament.find_team("FC Unikat"))
+        self.tournament.add_team("FC Unikat")
+        self.tournament.reset_to_setup()
+        self.assertIsNone(self.tournament.find_team("FC Unikat"))
+        self.tournament.add_team("FC Unikat")
+
+    def test_player_ids_are_stable_and_unique(self):
+        """Testuje stałe numery zawodników: usuwanie po numerze przy tych samych nazwiskach i zapis/odczyt."""
+        team = self.tournament.add_team("FC Python")
+        first = team.add_player("Jan", "Kowalski")
+        second = team.add_player("Jan", "Kowalski")
+        other = self.tournament.add_team("FC Java").add_player("Anna", "Nowak")
+        self.assertEqual(len({first.player_id, second.player_id, other.player_id}), 3)
+        team.remove_player_by_id(second.player_id)
+        self.assertEqual(team.players, [first])
+        self.assertIsNone(self.tournament.find_player(second.player_id))
+        with self.assertRaises(ValueError):
+            self.tournament.find_team("FC Java").remove_player_by_id(first.player_id)
+        self.assertIs(team.find_player("jan kowalski"), first)
+
+        self.tournament.save_to_file(self.test_filename)
+        loaded = Tournament()
+        loaded.load_from_file(self.test_filename)
+        self.assertEqual(loaded.find_player(other.player_id).name, "Anna Nowak")
+        self.assertEqual(loaded.find_team("fc python").players[0].player_id, first.player_id)
+        new_player = loaded.find_team("FC Python").add_player("Ewa", "Nowa")
+        self.assertNotIn(new_player.player_id, (first.player_id, second.player_id, other.player_id))
+
+    def test_removed_highest_player_id_is_not_reused_after_load(self):
+        """Testuje, czy numer usuniętego zawodnika z końca numeracji nie wraca po zapisie i odczycie."""
+        team = self.tournament.add_team("FC Python")
+        team.add_player("Jan", "Kowalski")
+        last = team.add_player("Adam", "Nowak")
+        team.remove_player_by_id(last.player_id)
+
+        self.tournament.save_to_file(self.test_filename)
+        loaded = Tournament()
+        loaded.load_from_file(self.test_filename)
+        new_player = loaded.find_team("FC Python").add_player("Ewa", "Nowa")
+        self.assertGreater(new_player.player_id, last.player_id)
+        copy = Tournament.from_dict(self.tournament.to_dict())
+        self.assertEqual(copy.player_registry.next_id, self.tournament.player_registry.next_id)
+
+    def test_bulk_team_creation_uses_name_index(self):
+        """Testuje, czy dodawanie i wyszukiwanie drużyn korzysta z indeksu nazw, a nie przegląda listy drużyn."""
+
+        class CountingList(list):
+            scans = 0
+
+            def __iter__(self):
+                CountingList.scans += 1
+                return super().__iter__()
+
+            def __contains__(self, item):
+                CountingList.scans += 1
+                return super().__contains__(item)
+
+        self.tournament.teams = CountingList()
+        for i in range(2000):
+            self.tournament.add_team(f"Drużyna {i}")
+        self.assertIs(self.tournament.find_team("DRUŻYNA 1999"), self.tournament.teams[-1])
+        with self.assertRaisesRegex(ValueError, "już istnieje"):
+            self.tournament.add_team("drużyna 5")
+        self.assertEqual(CountingList.scans, 0)
+        self.assertEqual(len(self.tournament.teams), 2000)
+
+        self.tournament.remove_team("Drużyna 5")
+        self.assertIsNone(self.tournament.find_team("drużyna 5"))
+        self.assertEqual(self.tournament.add_team("DRUŻYNA 5").name, "DRUŻYNA 5")
+
     def test_start_tournament_validation_not_16_teams(self):
         """Testuje walidację liczby drużyn przed startem turnieju."""
         self.tournament.add_team("Jedyna Drużyna")
@@ -125,6 +217,108 @@ class TestTournamentModels(unittest.TestCase):
         self.assertIsNotNone(self.tournament.winner)
         self.assertIsInstance(self.tournament.winner, Team)
 
+    def test_save_and_load_round_trip_mid_tournament(self):
+        """Testuje, czy zapis i odczyt w trakcie turnieju odtwarza pełny stan (JSON i binarnie)."""
+        self.tournament.generate_random_tournament()
+        for _ in range(7):
+            self.tournament.simulate_next_round()
+        for filename in (self.test_filename, "test_tournament_save.trn"):
+            self.tournament.save_to_file(filename)
+            loaded = Tournament()
+            loaded.load_from_file(filename)
+            self.assertEqual(loaded.to_dict(), self.tournament.to_dict())
+            self.assertEqual(loaded.phase, "KNOCKOUT_STAGE")
+            self.assertEqual(len(loaded.knockout_matches["Semi-finals"]), 2)
+
+        roster_only = Tournament()
+        roster_only.load_from_file("test_tournament_save.trn", include_events=False)
+        os.remove("test_tournament_save.trn")
+        self.assertTrue(all(not m.events for m in roster_only.matches))
+        self.assertEqual([t.points for t in roster_only.teams], [t.points for t in self.tournament.teams])
+
+    def test_binary_state_rejects_damaged_files(self):
+        """Testuje odrzucenie zapisu binarnego z inną wersją, uciętego i z błędną tabelą sekcji."""
+        from state_io import FORMAT_VERSION, read_binary_state
+        filename = "test_tournament_damaged.trn"
+        self.tournament.generate_random_tournament()
+        self.tournament.save_to_file(filename)
+        try:
+            with open(filename, "rb") as f:
+                data = f.read()
+            damaged = [
+                data[:4] + (FORMAT_VERSION - 1).to_bytes(2, "little") + data[6:],  # Stara wersja (marshal)
+                data[:len(data) // 2],
+                data[:4],
+                data[:16] + b"\xff" * 8 + data[24:],  # Przesunięcie sekcji poza plikiem
+            ]
+            for content in damaged:
+                with open(filename, "wb") as f:
+                    f.write(content)
+                with self.assertRaises(ValueError):
+                    read_binary_state(filename)
+        finally:
+            os.remove(filename)
+
+    def test_loaded_tournament_continues_identically(self):
+        """Testuje, czy wczytany turniej (ze stanem random) kończy się tak samo jak oryginał."""
+        self.tournament.generate_random_tournament()
+        self.tournament.simulate_next_round()
+        self.tournament.save_to_file(self.test_filename)
+        while not self.tournament.winner:
+            self.tournament.simulate_next_round()
+        loaded = Tournament()
+        loaded.load_from_file(self.test_filename)
+        while not loaded.winner:
+            loaded.simulate_next_round()
+        self.assertEqual(loaded.winner.name, self.tournament.winner.name)
+        self.assertEqual(loaded.to_dict(), self.tournament.to_dict())
+
+    def test_generalized_format_with_byes(self):
+        """Testuje format 24 drużyn w 6 grupach: 12 awansujących, drabinka 16 z 4 wolnymi losami."""
+        tournament_format = TournamentFormat(num_teams=24, num_groups=6, advance_per_group=2)
+        self.assertEqual(tournament_format.bracket_size, 16)
+        self.assertEqual(tournament_format.knockout_round_names(),
+                         ["Round of 16", "Quarter-finals", "Semi-finals", "Final"])
+        self.assertEqual(bracket_order(8), [1, 8, 4, 5, 2, 7, 3, 6])
+
+        tournament = Tournament(tournament_format=tournament_format)
+        tournament.generate_random_tournament()
+        self.assertEqual(len(tournament.groups), 6)
+        self.assertEqual(tournament.remaining_rounds(), 6 + 4)
+        rounds = 0
+        while not tournament.winner:
+            tournament.simulate_next_round()
+            rounds += 1
+            if rounds == 6:
+                self.assertEqual(len(tournament.knockout_matches["Round of 16"]), 4)
+                self.assertEqual(tournament.knockout_entrants.count(None), 4)
+        self.assertEqual(rounds, 10)
+        self.assertEqual(len(tournament.knockout_matches["Quarter-finals"]), 4)
+        self.assertEqual(len(tournament.knockout_matches["Final"]), 1)
+
+    def test_generalized_format_save_load_mid_knockout(self):
+        """Testuje, czy wczytany w fazie pucharowej turniej z wolnymi losami kończy się tak samo."""
+        self.tournament.set_format(TournamentFormat(num_teams=30, num_groups=5, advance_per_group=3, legs=1))
+        self.tournament.generate_random_tournament()
+        while self.tournament.phase == "GROUP_STAGE":
+            self.tournament.simulate_next_round()
+        self.tournament.save_to_file(self.test_filename)
+        while not self.tournament.winner:
+            self.tournament.simulate_next_round()
+        loaded = Tournament()
+        loaded.load_from_file(self.test_filename)
+        self.assertEqual(loaded.format, self.tournament.format)
+        while not loaded.winner:
+            loaded.simulate_next_round()
+        self.assertEqual(loaded.to_dict(), self.tournament.to_dict())
+
+    def test_invalid_format_raises_error(self):
+        """Testuje walidację formatu: za mało drużyn na grupy i zbyt wielu awansujących."""
+        with self.assertRaises(ValueError):
+            TournamentFormat(num_teams=6, num_groups=4)
+        with self.assertRaises(ValueError):
+            TournamentFormat(num_teams=16, num_groups=4, advance_per_group=5)
+
     def test_performance_of_tournament_generation(self):
 
         start_time = time.time()
@@ -0,0 +1,78 @@
+import unittest
+import random
+from models import Tournament, TournamentFormat
+from monte_carlo import score_cdf
+
+
+class TestMonteCarlo(unittest.TestCase):
+
+    def setUp(self):
+        """Tworzy losowy, rozpoczęty turniej jako wspólny skład dla testów."""
+        random.seed(7)
+        self.tournament = Tournament()
+        self.tournament.generate_random_tournament()
+
+    def test_monte_carlo_does_not_modify_tournament(self):
+        """Testuje, czy przebiegi Monte Carlo nie zmieniają stanu żywego turnieju."""
+        rng_state = random.getstate()
+        self.tournament.run_monte_carlo(50, seed=1)
+        self.assertEqual(random.getstate(), rng_state)
+        self.assertTrue(all(p.goals == 0 and p.yellow_cards == 0 for p in self.tournament.all_players))
+        self.assertTrue(all(t.points == 0 for t in self.tournament.teams))
+        self.assertFalse(any(m.is_played for m in self.tournament.matches))
+
+    def test_monte_carlo_probabilities_are_consistent(self):
+        """Testuje, czy prawdopodobieństwa etapów sumują się do liczby miejsc w drabince."""
+        result = self.tournament.run_monte_carlo(200, seed=3)
+        stats = result.team_stats
+        self.assertEqual(result.n_runs, 200)
+        self.assertAlmostEqual(sum(s["title"] for s in stats.values()), 1.0)
+        self.assertAlmostEqual(sum(s["final"] for s in stats.values()), 2.0)
+        self.assertAlmostEqual(sum(s["semi_final"] for s in stats.values()), 4.0)
+        self.assertAlmostEqual(sum(s["quarter_final"] for s in stats.values()), 8.0)
+        for player in result.player_stats:
+            self.assertAlmostEqual(sum(player["goal_distribution"].values()), 1.0)
+
+    def test_monte_carlo_generalized_format(self):
+        """Testuje etapy Monte Carlo dla drabinki 16 z wolnymi losami (6 grup × 2 awansujących)."""
+        random.seed(8)
+        tournament = Tournament(tournament_format=TournamentFormat(num_teams=24, num_groups=6))
+        tournament.generate_random_tournament()
+        stats = tournament.run_monte_carlo(100, seed=2).team_stats
+        self.assertAlmostEqual(sum(s["round_of_16"] for s in stats.values()), 12.0)
+        self.assertAlmostEqual(sum(s["quarter_final"] for s in stats.values()), 8.0)
+        self.assertAlmostEqual(sum(s["title"] for s in stats.values()), 1.0)
+
+    def test_monte_carlo_swiss_format(self):
+        """Testuje Monte Carlo dla fazy szwajcarskiej z awansem 4 najlepszych drużyn."""
+        random.seed(8)
+        tournament = Tournament(tournament_format=TournamentFormat(20, 1, 4, swiss_rounds=4))
+        tournament.generate_random_tournament()
+        stats = tournament.run_monte_carlo(100, seed=2).team_stats
+        self.assertAlmostEqual(sum(s["semi_final"] for s in stats.values()), 4.0)
+        self.assertGreater(sum(s["avg_points"] for s in stats.values()), 0)
+
+    def test_monte_carlo_is_reproducible_for_seed(self):
+        """Testuje, czy ten sam seed daje identyczne wyniki."""
+        first = self.tournament.run_monte_carlo(100, seed=11).to_dict()
+        second = self.tournament.run_monte_carlo(100, seed=11).to_dict()
+        self.assertEqual(first, second)
+
+    def test_parallel_result_matches_sequential(self):
+        """Testuje, czy wynik dla danego seed nie zależy od liczby procesów."""
+        sequential = self.tournament.run_monte_carlo(1200, seed=21, workers=1).to_dict()
+        parallel = self.tournament.run_monte_carlo(1200, seed=21, workers=2).to_dict()
+        self.assertEqual(sequential, parallel)
+
+    def test_score_cdf_matches_sampling(self):
+        """Testuje, czy tablicowany rozkład goli zgadza się z losowaniem przez gauss."""
+        rng = random.Random(5)
+        samples = [max(0, int(rng.gauss(70 / 55, 1.5))) for _ in range(20000)]
+        cdf = score_cdf(70)
+        self.assertEqual(cdf[-1], 1.0)
+        self.assertAlmostEqual(samples.count(0) / len(samples), cdf[0], places=2)
+        self.assertAlmostEqual(samples.count(1) / len(samples), cdf[1] - cdf[0], places=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
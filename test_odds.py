@@ -0,0 +1,132 @@
+import unittest
+import random
+from models import Tournament, GOAL_SCALE, GOAL_SIGMA
+from odds import ODDS_CACHE_SIZE, match_odds, score_pmf
+
+
+class TestOdds(unittest.TestCase):
+
+    def test_matrix_matches_score_model(self):
+        """Testuje, czy macierz wyników zgadza się z losowaniem goli w silniku."""
+        odds = match_odds(700, 600)
+        self.assertAlmostEqual(sum(map(sum, odds.matrix)), 1.0)
+        self.assertAlmostEqual(odds.win + odds.draw + odds.loss, 1.0)
+        diagonal = range(min(len(odds.matrix), len(odds.matrix[0])))
+        self.assertAlmostEqual(odds.draw, sum(odds.matrix[i][i] for i in diagonal))
+        rng = random.Random(3)
+        n = 100000
+        wins = draws = 0
+        for _ in range(n):
+            score1 = max(0, int(rng.gauss(700 / GOAL_SCALE, GOAL_SIGMA)))
+            score2 = max(0, int(rng.gauss(600 / GOAL_SCALE, GOAL_SIGMA)))
+            wins += score1 > score2
+            draws += score1 == score2
+        self.assertAlmostEqual(wins / n, odds.win, delta=0.01)
+        self.assertAlmostEqual(draws / n, odds.draw, delta=0.01)
+
+    def test_symmetry_cache_and_sampling(self):
+        """Testuje symetrię szans, ograniczoną pamięć podręczną macierzy i losowanie wyników z macierzy."""
+        odds = match_odds(500, 800)
+        mirrored = match_odds(800, 500)
+        self.assertIs(match_odds(500, 800), odds)
+        self.assertAlmostEqual(odds.win, mirrored.loss)
+        self.assertAlmostEqual(odds.advance + mirrored.advance, 1.0)
+        self.assertAlmostEqual(sum(odds.expected_points) + odds.draw, 3.0)
+        self.assertAlmostEqual(odds.expected_goals[0], sum(k * p for k, p in enumerate(score_pmf(500))))
+        self.assertLessEqual(match_odds.cache_info().currsize, ODDS_CACHE_SIZE)
+        rng = random.Random(4)
+        n = 50000
+        wins = sum(s1 > s2 for s1, s2 in (odds.sample(rng) for _ in range(n)))
+        self.assertAlmostEqual(wins / n, odds.win, delta=0.01)
+
+    def test_expected_tables(self):
+        """Testuje, czy oczekiwane tabele rozdzielają punkty wszystkich meczów grupy."""
+        random.seed(9)
+        tournament = Tournament()
+        tournament.generate_random_tournament()
+        tournament.simulate_next_round()
+        for table_name in tournament.table_names():
+            rows = tournament.expected_table(table_name)
+            group = tournament.groups[table_name]
+            matches = [m for m in tournament.matches if m.team1 in group]
+            expected_total = sum(3 - tournament.match_odds(m).draw for m in matches if not m.is_played)
+            played_total = sum(team.points for team in group)
+            self.assertAlmostEqual(sum(r["expected_points"] for r in rows), played_total + expected_total)
+            self.assertEqual(rows, sorted(rows, key=lambda r: r["expected_points"], reverse=True))
+
+
+
+class TestKnockoutOdds(unittest.TestCase):
+
+    def brute_force(self, slots, advance):
+        """Szanse zwycięstwa przez przejrzenie wszystkich przebiegów drabinki."""
+        if len(slots) == 1:
+            return {slots[0]: 1.0} if slots[0] is not None else {}
+        outcomes = {}
+        pairs = [(slots[i], slots[i + 1]) for i in range(0, len(slots), 2)]
+
+        def walk(index, winners, p):
+            if index == len(pairs):
+                for team, q in self.brute_force(winners, advance).items():
+                    outcomes[team] = outcomes.get(team, 0.0) + p * q
+                return
+            a, b = pairs[index]
+            if a is None or b is None:
+                walk(index + 1, winners + [a if b is None else b], p)
+                return
+            walk(index + 1, winners + [a], p * advance(a, b))
+            walk(index + 1, winners + [b], p * advance(b, a))
+
+        walk(0, [], 1.0)
+        return outcomes
+
+    def test_bracket_dp_matches_enumeration(self):
+        """Testuje programowanie dynamiczne na drabince z wolnymi losami względem pełnego przeglądu."""
+        from odds import bracket_probabilities
+        strength = {"a": 900, "b": 700, "c": 650, "d": 600, "e": 500, "f": 800}
+
+        def advance(x, y):
+            return match_odds(strength[x], strength[y]).advance
+
+        slots = ["a", None, "b", "c", "d", "e", None, "f"]
+        rounds = bracket_probabilities(slots, advance)
+        self.assertEqual(len(rounds), 4)
+        self.assertEqual(rounds[1]["a"], 1.0)
+        for probabilities, places in zip(rounds, (6, 4, 2, 1)):
+            self.assertAlmostEqual(sum(probabilities.values()), places)
+        for team, p in self.brute_force(slots, advance).items():
+            self.assertAlmostEqual(rounds[-1][team], p)
+        with self.assertRaises(ValueError):
+            bracket_probabilities(["a", "b", "c"], advance)
+
+    def test_tournament_knockout_odds(self):
+        """Testuje szanse w drabince: brak drabinki w fazie grupowej, runda w toku i zakończony turniej."""
+        random.seed(12)
+        tournament = Tournament()
+        tournament.generate_random_tournament()
+        tournament.simulate_next_round()
+        with self.assertRaises(ValueError):
+            tournament.knockout_odds()
+
+        while tournament.phase != "KNOCKOUT_STAGE":
+            tournament.simulate_next_round()
+        odds = tournament.knockout_odds()
+        quarter_finalists = {t.name for t in tournament.knockout_entrants}
+        self.assertEqual({name for name, s in odds.items() if s["quarter_final"] == 1.0}, quarter_finalists)
+        self.assertAlmostEqual(sum(stats["title"] for stats in odds.values()), 1.0)
+
+        while tournament.current_round < 1 or tournament.phase != "KNOCKOUT_STAGE":
+            tournament.simulate_next_round()
+        odds = tournament.knockout_odds()
+        semi_finalists = {t.name for t in tournament.knockout_entrants}
+        self.assertEqual({name for name, s in odds.items() if s["semi_final"] == 1.0}, semi_finalists)
+        self.assertEqual(sum(s["quarter_final"] for s in odds.values()), 8)
+        self.assertAlmostEqual(sum(s["final"] for s in odds.values()), 2.0)
+
+        while not tournament.winner:
+            tournament.simulate_next_round()
+        self.assertEqual(tournament.knockout_odds()[tournament.winner.name]["title"], 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import random
+from models import Tournament, Player, Team
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, "Magazyn kolumnowy wymaga NumPy")
+class TestPlayerStore(unittest.TestCase):
+
+    def setUp(self):
+        """Tworzy losowy turniej z włączonym magazynem kolumnowym."""
+        random.seed(3)
+        self.tournament = Tournament()
+        self.tournament.generate_random_tournament()
+        self.stats_before = [(p.name, p.attack, p.defense, p.aggression) for p in self.tournament.all_players]
+        self.store = self.tournament.enable_player_store()
+
+    def test_players_become_views_over_store(self):
+        """Testuje, czy zawodnicy zachowują statystyki i zapisują je do tablic magazynu."""
+        players = self.tournament.all_players
+        self.assertEqual([(p.name, p.attack, p.defense, p.aggression) for p in players], self.stats_before)
+        self.assertIsInstance(players[0], Player)
+        players[0].goals += 2
+        self.assertEqual(self.store.columns["goals"][players[0].store_id], 2)
+        self.assertEqual(players[0].to_dict()["tournament_stats"]["goals"], 2)
+
+    def test_team_strength_matches_object_model(self):
+        """Testuje, czy siła drużyny z tablic zgadza się z sumą po obiektach."""
+        team = self.tournament.teams[0]
+        team.players[0].red_cards = 1
+        expected = sum(p.attack for p in team.players if p.red_cards == 0)
+        self.assertEqual(team.total_attack, expected)
+        self.assertEqual(int(self.store.team_totals("attack")[team.store_index]), expected)
+
+    def test_strength_cache_follows_store_views(self):
+        """Testuje, czy siła zapamiętana przed włączeniem magazynu nie wskazuje starych obiektów Player."""
+        random.seed(4)
+        tournament = Tournament()
+        tournament.generate_random_tournament()
+        team = tournament.teams[0]
+        old_players = list(team.active_players)
+        tournament.enable_player_store()
+        self.assertEqual(team.active_players, team.players)
+        self.assertTrue(all(new is not old for new, old in zip(team.active_players, old_players)))
+        self.assertEqual(team.scorer_weights[-1], team.total_attack)
+
+    def test_roster_is_frozen_and_simulation_runs(self):
+        """Testuje blokadę zmian składu i pełną symulację na magazynie."""
+        with self.assertRaises(ValueError):
+            self.tournament.teams[0].add_player("Nowy", "Zawodnik")
+        while not self.tournament.winner:
+            self.tournament.simulate_next_round()
+        total_goals = sum(m.score1 + m.score2 for m in self.tournament.matches)
+        total_goals += sum(m.score1 + m.score2 for r in self.tournament.knockout_matches.values() for m in r)
+        self.assertEqual(int(self.store.columns["goals"].sum()), total_goals)
+
+    def test_batched_round_keeps_match_semantics(self):
+        """Testuje, czy wsadowa kolejka zapisuje wyniki, zdarzenia i tabele jak wersja per mecz."""
+        self.tournament.simulate_next_round()
+        played = [m for m in self.tournament.matches if m.is_played]
+        self.assertEqual(len(played), 8)
+        for match in played:
+            goal_teams = [e["player"].team_name for e in match.events if e["type"] == "GOAL"]
+            self.assertEqual(goal_teams, [match.team1.name] * match.score1 + [match.team2.name] * match.score2)
+            self.assertTrue(all(1 <= e["minute"] <= 90 for e in match.events))
+        self.assertEqual(sum(t.matches_played for t in self.tournament.teams), 16)
+        self.assertEqual(sum(p.goals for p in self.tournament.all_players),
+                         sum(m.score1 + m.score2 for m in played))
+
+
+if __name__ == '__main__':
+    unittest.main()
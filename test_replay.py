@@ -0,0 +1,106 @@
+import unittest
+import os
+import random
+from models import Tournament, TournamentFormat
+from event_log import EventLogWriter, read_events
+from test_snapshots import plain
+
+
+class TestReplay(unittest.TestCase):
+
+    def setUp(self):
+        """Tworzy losowy turniej z powtórką i zapisuje stany po każdej kolejce."""
+        random.seed(31)
+        self.tournament = Tournament()
+        self.tournament.generate_random_tournament()
+        self.replay = self.tournament.start_replay(checkpoint_every=3)
+        self.states = [plain(self.tournament.to_dict())]
+        while not self.tournament.winner:
+            self.tournament.simulate_next_round()
+            self.states.append(plain(self.tournament.to_dict()))
+        self.filenames = []
+
+    def tearDown(self):
+        for filename in self.filenames:
+            if os.path.exists(filename):
+                os.remove(filename)
+
+    def test_seek_to_any_round(self):
+        """Testuje przewijanie do dowolnej kolejki w przód i w tył."""
+        self.assertEqual(self.replay.latest, len(self.states) - 1)
+        self.assertEqual(sorted(self.replay.checkpoints), list(range(0, len(self.states), 3)))
+        for index in (4, 0, 7, 2, 3, len(self.states) - 1, 1):
+            self.assertEqual(self.replay.seek(index), index)
+            self.assertEqual(plain(self.tournament.to_dict()), self.states[index], f"kolejka {index}")
+        self.assertEqual(self.replay.seek(1000), self.replay.latest)
+
+    def test_step_back_and_forward(self):
+        """Testuje kroki o jedną kolejkę oraz brak kroku za końcem zakończonego turnieju."""
+        self.replay.seek(5)
+        self.assertEqual(self.replay.step_back(), 4)
+        self.assertEqual(plain(self.tournament.to_dict()), self.states[4])
+        self.replay.step_forward()
+        self.assertEqual(self.replay.position, 5)
+        self.assertEqual(plain(self.tournament.to_dict()), self.states[5])
+        self.replay.seek(self.replay.latest)
+        self.assertIsNone(self.replay.step_forward())
+        self.replay.seek(0)
+        self.assertEqual(self.replay.step_back(), 0)
+
+    def test_seek_does_not_resimulate_from_start(self):
+        """Testuje, czy przewijanie rozgrywa ponownie najwyżej checkpoint_every - 1 kolejek."""
+        played = []
+        original = self.tournament._simulate_next_round
+        self.tournament._simulate_next_round = lambda: played.append(1) or original()
+        self.replay.seek(self.replay.latest - 1)
+        self.assertLess(len(played), self.replay.checkpoint_every)
+
+    def test_logs_are_not_duplicated(self):
+        """Testuje, czy odtwarzane kolejki nie trafiają drugi raz do dziennika zdarzeń."""
+        random.seed(32)
+        tournament = Tournament(tournament_format=TournamentFormat(8, 2, 2, 11, 2, 0))
+        tournament.generate_random_tournament()
+        filename = "test_replay_events.jsonl"
+        self.filenames.append(filename)
+        with EventLogWriter(filename) as sink:
+            tournament.attach_event_sink(sink)
+            replay = tournament.start_replay(checkpoint_every=2)
+            for _ in range(4):
+                tournament.simulate_next_round()
+            replay.seek(1)
+            while not tournament.winner:
+                replay.step_forward()
+            self.assertIs(tournament.event_sink, sink)
+        all_matches = tournament.matches + [m for r in tournament.knockout_matches.values() for m in r]
+        self.assertEqual(len(list(read_events(filename))), sum(len(m.events) for m in all_matches))
+
+    def test_reset_ends_replay(self):
+        """Testuje, czy reset turnieju kończy powtórkę."""
+        self.tournament.reset_to_setup()
+        self.assertIsNone(self.tournament.replay)
+
+    def test_ending_replay_restores_detached_logs(self):
+        """Testuje, czy zakończenie cofniętej powtórki przywraca dziennik zdarzeń i zamyka dziennik migawek."""
+        for end_replay in (Tournament.stop_replay, Tournament.reset_to_setup):
+            random.seed(33)
+            tournament = Tournament(tournament_format=TournamentFormat(8, 2, 2, 11, 2, 0))
+            tournament.generate_random_tournament()
+            events, snapshots = "test_replay_close.jsonl", "test_replay_close.snap"
+            self.filenames += [events, snapshots]
+            with EventLogWriter(events) as sink:
+                tournament.attach_event_sink(sink)
+                writer = tournament.start_snapshots(snapshots)
+                replay = tournament.start_replay()
+                for _ in range(3):
+                    tournament.simulate_next_round()
+                replay.seek(1)
+                self.assertIsNone(tournament.event_sink)
+                end_replay(tournament)
+                self.assertIsNone(tournament.replay)
+                self.assertIs(tournament.event_sink, sink)
+                self.assertIsNone(tournament.snapshot_writer)
+                self.assertIsNone(writer._file)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import os
+import random
+from models import Tournament
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, "NumPy nie jest zainstalowany")
+class TestResultsStore(unittest.TestCase):
+
+    def setUp(self):
+        """Tworzy losowy turniej i ścieżkę magazynu wyników."""
+        random.seed(5)
+        self.tournament = Tournament()
+        self.tournament.generate_random_tournament()
+        self.filename = "test_results_store.res"
+
+    def tearDown(self):
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+    def test_aggregate_matches_in_memory_result(self):
+        """Testuje, czy agregacja z magazynu daje ten sam wynik co Monte Carlo w pamięci."""
+        from results_store import ResultsStore
+        result = self.tournament.run_monte_carlo(1200, seed=4, store_path=self.filename)
+        with ResultsStore(self.filename) as store:
+            self.assertEqual(store.n_runs, 1200)
+            aggregated = store.aggregate(chunk_runs=256)
+        aggregated.seed = result.seed
+        self.assertEqual(aggregated.to_dict(), result.to_dict())
+
+    def test_columns_are_memory_mapped_views(self):
+        """Testuje, czy kolumny są widokami pliku, a dopisywanie kolejnych przebiegów je wydłuża."""
+        from results_store import ResultsStore
+        self.tournament.run_monte_carlo(300, seed=1, store_path=self.filename)
+        self.tournament.run_monte_carlo(200, seed=2, workers=2, store_path=self.filename)
+        with ResultsStore(self.filename) as store:
+            goals = store.column("goals")
+            self.assertEqual(goals.shape, (500, len(self.tournament.all_players)))
+            self.assertIsInstance(goals.base, np.memmap)
+            self.assertEqual(int((store.column("stage") == len(store.stage_keys)).sum()), 500)
+            points = store.column("points")[:, 0]
+            self.assertFalse(points.flags.owndata)
+            with self.assertRaises(KeyError):
+                store.column("assists")
+            with self.assertRaises(ValueError):
+                store.append(store.runs[:1])
+
+    def test_stale_store_is_rejected(self):
+        """Testuje odrzucenie magazynu innych składów oraz innej wersji schematu."""
+        import results_store
+        from monte_carlo import RosterSnapshot
+        self.tournament.run_monte_carlo(10, seed=1, store_path=self.filename)
+        self.tournament.teams[0].players[0].attack += 1
+        with self.assertRaises(ValueError):
+            self.tournament.run_monte_carlo(10, seed=1, store_path=self.filename)
+        with open(self.filename, "r+b") as f:
+            f.seek(4)
+            f.write((results_store.SCHEMA_VERSION + 1).to_bytes(2, "little"))
+        with self.assertRaises(ValueError):
+            results_store.ResultsStore(self.filename)
+        with self.assertRaises(ValueError):
+            results_store.ResultsStore(__file__)
+        store = results_store.ResultsStore.create(self.filename, RosterSnapshot(self.tournament))
+        store.close()
+        with results_store.ResultsStore(self.filename) as empty:
+            self.assertEqual(empty.runs.shape, (0,))
+
+    def test_large_formats_fit_in_records(self):
+        """Testuje, czy wartości jednej grupy 4096 drużyn mieszczą się w rekordzie, a zbyt duże są odrzucane."""
+        from types import SimpleNamespace
+        from models import TournamentFormat
+        from results_store import check_capacity, records_from_runs, value_limits
+        fmt = TournamentFormat(4096, 1, 2, 11, 2)
+        roster = SimpleNamespace(format=fmt, stage_keys=["final", "title"], player_attack=[99] * 11,
+                                 team_players=[range(11)])
+        limits = value_limits(roster)
+        self.assertGreater(limits["goals_for"], 2 ** 15)
+        self.assertGreater(limits["yellow_cards"], 2 ** 8)
+        check_capacity(roster)
+        records = records_from_runs([([2, 0], [limits["points"], 0], [limits["goals_for"], 0],
+                                      [limits["goals"]], [limits["yellow_cards"]], [limits["red_cards"]])], 2, 1)
+        self.assertEqual(int(records["points"][0, 0]), limits["points"])
+        self.assertEqual(int(records["yellow_cards"][0, 0]), limits["yellow_cards"])
+        roster.stage_keys = ["round"] * 300
+        with self.assertRaises(ValueError):
+            check_capacity(roster)
+
+
+if __name__ == '__main__':
+    unittest.main()
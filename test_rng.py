@@ -0,0 +1,96 @@
+import unittest
+import os
+import random
+from models import Tournament
+from rng import RNG_BACKENDS, make_rng
+
+try:
+    import numpy  # noqa: F401
+    AVAILABLE_BACKENDS = RNG_BACKENDS
+except ImportError:
+    AVAILABLE_BACKENDS = ("stdlib",)
+
+
+class TestRandomBackends(unittest.TestCase):
+
+    def setUp(self):
+        """Ustala nazwę pliku stanu używanego przez testy."""
+        self.test_filename = "test_rng_save.trn"
+
+    def tearDown(self):
+        """Usuwa plik stanu po teście."""
+        if os.path.exists(self.test_filename):
+            os.remove(self.test_filename)
+
+    def test_seeded_tournament_ignores_global_random(self):
+        """Testuje, czy turniej z ziarnem nie zależy od globalnego random (dla każdego generatora)."""
+        for backend in AVAILABLE_BACKENDS:
+            with self.subTest(backend=backend):
+                first = Tournament(rng_backend=backend, seed=21)
+                first.generate_random_tournament()
+                while not first.winner:
+                    first.simulate_next_round()
+                second = Tournament(rng_backend=backend, seed=21)
+                second.generate_random_tournament()
+                while not second.winner:
+                    random.random()
+                    second.simulate_next_round()
+                self.assertEqual(first.to_dict(), second.to_dict())
+
+    def test_match_streams_do_not_depend_on_play_order(self):
+        """Testuje, czy mecze kolejki rozegrane w odwrotnej kolejności mają te same wyniki."""
+        forward = Tournament(seed=4)
+        forward.generate_random_tournament()
+        backward = Tournament.from_dict(forward.to_dict())
+        forward._play_matches(forward.matches_by_round[1])
+        backward._play_matches(backward.matches_by_round[1][::-1])
+        self.assertEqual([(m.score1, m.score2, len(m.events)) for m in forward.matches_by_round[1]],
+                         [(m.score1, m.score2, len(m.events)) for m in backward.matches_by_round[1]])
+
+    def test_saved_tournament_continues_identically(self):
+        """Testuje, czy zapis w trakcie turnieju odtwarza generator i dalszy przebieg."""
+        for backend in AVAILABLE_BACKENDS:
+            with self.subTest(backend=backend):
+                tournament = Tournament(rng_backend=backend, seed=8)
+                tournament.generate_random_tournament()
+                tournament.simulate_next_round()
+                tournament.save_to_file(self.test_filename)
+                while not tournament.winner:
+                    tournament.simulate_next_round()
+                loaded = Tournament()
+                loaded.load_from_file(self.test_filename)
+                self.assertEqual(loaded.rng_backend, backend)
+                while not loaded.winner:
+                    loaded.simulate_next_round()
+                self.assertEqual(loaded.to_dict(), tournament.to_dict())
+
+    def test_old_save_with_global_random_state_loads(self):
+        """Testuje wczytanie zapisu sprzed generatorów turnieju (stan globalnego random)."""
+        tournament = Tournament(seed=2)
+        tournament.generate_random_tournament()
+        state = tournament.to_dict()
+        del state["rng"]
+        version, internal_state, gauss_next = random.getstate()
+        state["rng_state"] = [version, list(internal_state), gauss_next]
+        loaded = Tournament.from_dict(state)
+        again = Tournament.from_dict(state)
+        while not loaded.winner:
+            loaded.simulate_next_round()
+            again.simulate_next_round()
+        self.assertEqual(loaded.to_dict(), again.to_dict())
+
+    def test_spawned_streams_are_reproducible_and_distinct(self):
+        """Testuje, czy strumienie pochodne zależą tylko od ziarna i klucza."""
+        for backend in AVAILABLE_BACKENDS:
+            with self.subTest(backend=backend):
+                rng = make_rng(backend, 99)
+                draws = [rng.spawn(0, 1, i).random() for i in range(3)]
+                rng.random()
+                self.assertEqual(draws, [make_rng(backend, 99).spawn(0, 1, i).random() for i in range(3)])
+                self.assertEqual(len(set(draws)), 3)
+        with self.assertRaises(ValueError):
+            make_rng("mt19937", 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import json
+import os
+import random
+from models import Tournament, TournamentFormat
+from snapshots import is_snapshot_log, read_snapshot
+
+
+def plain(state):
+    """Stan w postaci po zapisie JSON (krotki jako listy), do porównań."""
+    return json.loads(json.dumps(state))
+
+
+class TestSnapshots(unittest.TestCase):
+
+    def setUp(self):
+        self.filenames = []
+
+    def tearDown(self):
+        """Usuwa dzienniki utworzone w teście."""
+        for filename in self.filenames:
+            if os.path.exists(filename):
+                os.remove(filename)
+
+    def _record(self, filename, tournament_format=None, checkpoint_every=3, player_store=False):
+        """Rozgrywa turniej z dziennikiem migawek; zwraca stany po każdej kolejce."""
+        self.filenames.append(filename)
+        random.seed(17)
+        tournament = Tournament()
+        if tournament_format is not None:
+            tournament.set_format(tournament_format)
+        tournament.generate_random_tournament()
+        if player_store:
+            tournament.enable_player_store()
+        tournament.start_snapshots(filename, checkpoint_every)
+        states = [plain(tournament.to_dict())]
+        while not tournament.winner:
+            tournament.simulate_next_round()
+            states.append(plain(tournament.to_dict()))
+        tournament.simulate_next_round()  # Po zakończeniu turnieju nic nie jest dopisywane
+        tournament.stop_snapshots()
+        return states
+
+    def assert_every_round_restored(self, filename, states):
+        for i, expected in enumerate(states):
+            loaded = Tournament()
+            self.assertEqual(loaded.load_snapshot(filename, i), i)
+            self.assertEqual(plain(loaded.to_dict()), expected, f"kolejka {i}")
+
+    def test_group_tournament_every_round(self):
+        """Testuje odtworzenie stanu po każdej kolejce fazy grupowej i pucharowej."""
+        filename = "test_snapshots.snap"
+        states = self._record(filename)
+        self.assert_every_round_restored(filename, states)
+        with open(filename, encoding="utf-8") as f:
+            kinds = [line.split("\t", 1)[0] for line in f]
+        self.assertEqual(len(kinds), len(states))
+        self.assertEqual(kinds[:4], ["base", "delta", "delta", "checkpoint"])
+
+    def test_swiss_with_player_store_gzip(self):
+        """Testuje dziennik gzip w systemie szwajcarskim (pauzy) z magazynem kolumnowym."""
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            self.skipTest("NumPy nie jest zainstalowany")
+        filename = "test_snapshots.snap.gz"
+        states = self._record(filename, TournamentFormat(15, 1, 8, 11, 1, 5), checkpoint_every=0,
+                              player_store=True)
+        self.assertTrue(is_snapshot_log(filename))
+        self.assert_every_round_restored(filename, states)
+
+    def test_restored_round_continues_identically(self):
+        """Testuje, czy turniej wczytany z połowy dziennika kończy się tak samo jak oryginał."""
+        filename = "test_snapshots_resume.snap"
+        states = self._record(filename)
+        loaded = Tournament()
+        loaded.load_snapshot(filename, 4)
+        while not loaded.winner:
+            loaded.simulate_next_round()
+        self.assertEqual(plain(loaded.to_dict()), states[-1])
+
+    def test_deltas_are_smaller_than_full_state(self):
+        """Testuje, czy delta kolejki jest mniejsza od pełnego stanu, a odczyt za końcem daje ostatnią kolejkę."""
+        filename = "test_snapshots_size.snap"
+        states = self._record(filename, checkpoint_every=0)
+        with open(filename, encoding="utf-8") as f:
+            sizes = [len(line) for line in f]
+        self.assertLess(max(sizes[1:]), sizes[0] / 4)
+        state, reached = read_snapshot(filename, 1000)
+        self.assertEqual(reached, len(states) - 1)
+        self.assertFalse(is_snapshot_log(__file__))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+import random
+from models import Team, Tournament
+from standings import Standings
+
+
+class TestStandings(unittest.TestCase):
+
+    def test_incremental_ranking_matches_full_sort(self):
+        """Testuje, czy tabela utrzymywana przyrostowo zgadza się z pełnym sortowaniem."""
+        random.seed(5)
+        tournament = Tournament()
+        tournament.generate_random_tournament()
+        for _ in range(6):
+            tournament.simulate_next_round()
+            for name, teams in tournament.groups.items():
+                expected = sorted(teams, key=lambda t: (t.points, t.goal_difference, t.goals_for), reverse=True)
+                self.assertEqual(tournament.standings.ranking(name), expected)
+
+    def test_head_to_head_tie_breaker(self):
+        """Testuje, czy przy równych punktach decyduje bezpośredni mecz."""
+        teams = [Team(name) for name in ("A", "B", "C")]
+        standings = Standings({"Grupa A": teams}, ("points", "head_to_head", "goal_difference"))
+        a, b, c = teams
+        # B wygrywa z A, ale A ma lepszy bilans bramek dzięki wygranej z C
+        a.add_match_result(0, 1, b)
+        b.add_match_result(1, 0, a)
+        a.add_match_result(5, 0, c)
+        c.add_match_result(0, 5, a)
+        self.assertEqual(a.points, b.points)
+        self.assertEqual(standings.ranking("Grupa A"), [b, a, c])
+        default = Standings({"Grupa B": [Team("X")]})
+        self.assertEqual(default.tie_breakers, ("points", "goal_difference", "goals_for"))
+
+    def test_unknown_tie_breaker_raises_error(self):
+        """Testuje walidację nazw kryteriów tabeli."""
+        with self.assertRaises(ValueError):
+            Standings({"Grupa A": [Team("A")]}, ("points", "fair_play"))
+
+
+if __name__ == '__main__':
+    unittest.main()
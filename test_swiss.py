@@ -0,0 +1,66 @@
+import unittest
+import os
+import random
+from models import Tournament, TournamentFormat, SWISS_TABLE_NAME
+from swiss import swiss_pairings
+
+
+class TestSwissSystem(unittest.TestCase):
+
+    def test_pairings_avoid_rematches_and_rotate_byes(self):
+        """Testuje, czy kolejne rundy dla nieparzystej liczby uczestników nie powtarzają par ani pauz."""
+        rng = random.Random(4)
+        teams = list(range(51))
+        points = {t: 0 for t in teams}
+        opponents = {t: set() for t in teams}
+        had_bye = set()
+        for _ in range(9):
+            ranked = sorted(teams, key=lambda t: points[t], reverse=True)
+            pairs, bye = swiss_pairings(ranked, opponents, had_bye)
+            self.assertNotIn(bye, had_bye)
+            had_bye.add(bye)
+            paired = [t for pair in pairs for t in pair]
+            self.assertEqual(sorted(paired + [bye]), teams)
+            for a, b in pairs:
+                self.assertNotIn(b, opponents[a])
+                opponents[a].add(b)
+                opponents[b].add(a)
+                points[rng.choice((a, b))] += 3
+
+    def test_pairings_backtrack_at_bottom_of_table(self):
+        """Testuje, czy przy zablokowanej ostatniej parze algorytm zmienia wcześniejsze skojarzenie."""
+        opponents = {"a": set(), "b": set(), "c": {"d"}, "d": {"c"}}
+        pairs, bye = swiss_pairings(["a", "b", "c", "d"], opponents)
+        self.assertIsNone(bye)
+        self.assertEqual(pairs, [("a", "c"), ("b", "d")])
+
+    def test_swiss_tournament_flow_and_save_load(self):
+        """Testuje fazę szwajcarską 37 drużyn: pary bez powtórek, awans 8 najlepszych i zapis w trakcie."""
+        random.seed(9)
+        tournament = Tournament(tournament_format=TournamentFormat(37, 1, 8, swiss_rounds=5))
+        tournament.generate_random_tournament()
+        self.assertEqual(tournament.phase, "SWISS_STAGE")
+        self.assertEqual(tournament.table_names(), [SWISS_TABLE_NAME])
+        self.assertEqual(tournament.remaining_rounds(), 5 + 3)
+        for _ in range(2):
+            tournament.simulate_next_round()
+
+        filename = "test_swiss_save.trn"
+        tournament.save_to_file(filename)
+        while tournament.phase == "SWISS_STAGE":
+            tournament.simulate_next_round()
+        loaded = Tournament()
+        loaded.load_from_file(filename)
+        os.remove(filename)
+        while loaded.phase == "SWISS_STAGE":
+            loaded.simulate_next_round()
+        self.assertEqual(loaded.to_dict(), tournament.to_dict())
+        self.assertEqual(len(tournament.swiss_byes), 5)
+        pairs = [frozenset((m.team1, m.team2)) for m in tournament.matches]
+        self.assertEqual(len(set(pairs)), len(pairs))
+        qualifiers = {t for m in tournament.knockout_matches["Quarter-finals"] for t in (m.team1, m.team2)}
+        self.assertEqual(qualifiers, set(tournament.swiss_ranking()[:8]))
+
+
+if __name__ == '__main__':
+    unittest.main()